@@ -0,0 +1,91 @@
+"""
+Benchmark: job page throughput of the Selenium backend vs the asyncio DevTools backend.
+
+Both backends load the fixture job page (whose images, fonts and analytics
+scripts come from a local server with a simulated network delay) and read
+its details with the same script. Selenium handles one page at a time; the
+DevTools backend spreads the pages over several tabs on one event loop.
+
+Usage:
+    python benchmarks/bench_backends.py [--pages 20] [--tabs 1 4] [--asset-delay 0.1]
+"""
+import argparse
+import asyncio
+import dataclasses
+import time
+
+from common import FixtureServer, disable_rate_limiter
+
+from selenium import webdriver
+from browser_profiles import build_chrome_options
+from job_details import extract_job_details, JOB_DETAILS_SCRIPT, JOB_DETAILS_ARGS
+from cdp_browser import AsyncHandshakeBrowser
+from settings import get_config
+
+FIXTURE_PAGE = "job_detail_assets.html"
+
+def benchmark_profile():
+    return dataclasses.replace(get_config().get_browser_profile("default"), headless=True, user_data_dir="")
+
+def time_selenium(server, pages):
+    """Load and read pages one after another over WebDriver, returning seconds for all of them."""
+    chrome_options = build_chrome_options(benchmark_profile())
+    chrome_options.add_argument(f"--host-resolver-rules={server.host_resolver_rules()}")
+    driver = webdriver.Chrome(options=chrome_options)
+    try:
+        start = time.perf_counter()
+        for page in range(pages):
+            driver.get(server.url(f"{FIXTURE_PAGE}?page={page}"))
+            extract_job_details(driver)
+        return time.perf_counter() - start
+    finally:
+        driver.quit()
+
+async def time_cdp(server, pages, tabs):
+    """Load and read pages spread over `tabs` tabs of one DevTools connection, returning seconds for all of them."""
+    browser = await AsyncHandshakeBrowser.start(
+        extra_args=[f"--host-resolver-rules={server.host_resolver_rules()}"],
+        profile=benchmark_profile(),
+    )
+    try:
+        workers = [browser] + [await browser.new_tab() for _ in range(tabs - 1)]
+        queue = asyncio.Queue()
+        for page in range(pages):
+            queue.put_nowait(server.url(f"{FIXTURE_PAGE}?page={page}"))
+
+        async def work(tab):
+            while not queue.empty():
+                await tab.open_url(queue.get_nowait())
+                await tab.tab.evaluate(JOB_DETAILS_SCRIPT, *JOB_DETAILS_ARGS)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(work(tab) for tab in workers))
+        elapsed = time.perf_counter() - start
+        for tab in workers[1:]:
+            await tab.close()
+        return elapsed
+    finally:
+        await browser.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Selenium and DevTools browser backends')
+    parser.add_argument('--pages', type=int, default=20, help='Job pages loaded per variant')
+    parser.add_argument('--tabs', type=int, nargs='+', default=[1, 4], help='Tab counts to run the DevTools backend with')
+    parser.add_argument('--asset-delay', type=float, default=0.1, help='Simulated network delay per asset (seconds)')
+    args = parser.parse_args()
+
+    # Selenium's raw driver.get skips the limiter, so the DevTools tabs must not be paced either
+    disable_rate_limiter()
+    rows = []
+    with FixtureServer(asset_delay=args.asset_delay) as server:
+        rows.append(("selenium", time_selenium(server, args.pages)))
+        for tabs in args.tabs:
+            rows.append((f"cdp, {tabs} tab{'s' if tabs > 1 else ''}", asyncio.run(time_cdp(server, args.pages, tabs))))
+
+    print(f"\nJob page throughput ({args.pages} pages, {args.asset_delay * 1000:.0f} ms per asset)")
+    print(f"{'backend':<28}{'pages / min':>18}{'ms / page':>12}")
+    for name, seconds in rows:
+        print(f"{name:<28}{args.pages / seconds * 60:>18.1f}{seconds / args.pages * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    main()
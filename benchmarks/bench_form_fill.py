@@ -0,0 +1,97 @@
+"""
+Benchmark: manifest-based form filling vs the old per-field WebDriver loop.
+
+The apply_form.html fixture renders ?fields=N required fields, a resume
+button, and no cover letter or transcript buttons (so the old code waits out
+both of their timeouts, as it does on most real postings).
+
+Usage:
+    python benchmarks/bench_form_fill.py [--sizes 3 10 30] [--repeat 3]
+"""
+import argparse
+import time
+
+from common import fixture_url, start_driver, CommandCounter
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from constants import (
+    DIV_REQUIRED_FIELD_CSS,
+    SELECT_DROPDOWN_CSS,
+    INPUT_TEXT_CSS,
+    INPUT_RADIO_CSS,
+    INPUT_CHECKBOX_CSS,
+    TAG_OPTION,
+    XPATH_RESUME_BUTTON,
+    XPATH_COVERLETTER_BUTTON,
+    XPATH_TRANSCRIPT_BUTTON,
+)
+from application_form import read_form_manifest, plan_form_fill, fill_form
+
+def legacy_fill_application_form(driver):
+    """The form filling loop _fill_application_form used before the field manifest."""
+    for xpath in (XPATH_RESUME_BUTTON, XPATH_COVERLETTER_BUTTON, XPATH_TRANSCRIPT_BUTTON):
+        try:
+            WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, xpath))).click()
+        except Exception:
+            pass
+
+    for field in driver.find_elements(By.CSS_SELECTOR, DIV_REQUIRED_FIELD_CSS):
+        for dropdown in field.find_elements(By.CSS_SELECTOR, SELECT_DROPDOWN_CSS):
+            options = dropdown.find_elements(By.TAG_NAME, TAG_OPTION)
+            if len(options) > 1:
+                options[1].click()
+        for text_input in field.find_elements(By.CSS_SELECTOR, INPUT_TEXT_CSS):
+            if text_input.get_attribute("value") == "":
+                text_input.send_keys("Yes")
+        radio_buttons = field.find_elements(By.CSS_SELECTOR, INPUT_RADIO_CSS)
+        if radio_buttons:
+            radio_buttons[0].click()
+        checkboxes = field.find_elements(By.CSS_SELECTOR, INPUT_CHECKBOX_CSS)
+        if checkboxes:
+            checkboxes[0].click()
+
+def manifest_fill_application_form(driver):
+    """The new path: one introspection call, one fill call."""
+    fill_form(driver, plan_form_fill(read_form_manifest(driver)))
+
+def time_fill(driver, fill, fields, repeat):
+    """Fill a freshly loaded form repeatedly, returning (calls per form, seconds per form)."""
+    total_calls = 0
+    total_seconds = 0.0
+    for _ in range(repeat):
+        driver.get(fixture_url("apply_form.html") + f"?fields={fields}")
+        counter = CommandCounter(driver)
+        try:
+            start = time.perf_counter()
+            fill(driver)
+            total_seconds += time.perf_counter() - start
+            total_calls += counter.total
+        finally:
+            counter.restore()
+    return total_calls / repeat, total_seconds / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark application form filling')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 10, 30], help='Number of required fields per form')
+    parser.add_argument('--repeat', type=int, default=3, help='Forms filled per size and variant')
+    args = parser.parse_args()
+
+    driver = start_driver()
+    rows = []
+    try:
+        for fields in args.sizes:
+            for name, fill in (("per-field loop", legacy_fill_application_form), ("field manifest", manifest_fill_application_form)):
+                calls, seconds = time_fill(driver, fill, fields, args.repeat)
+                rows.append((fields, name, calls, seconds))
+    finally:
+        driver.quit()
+
+    print(f"\nApplication form filling ({args.repeat} forms per row)")
+    print(f"{'fields':>6}  {'variant':<20}{'webdriver calls':>18}{'ms / form':>12}")
+    for fields, name, calls, seconds in rows:
+        print(f"{fields:>6}  {name:<20}{calls:>18.1f}{seconds * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    main()
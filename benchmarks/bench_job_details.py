@@ -0,0 +1,80 @@
+"""
+Benchmark: single-script job detail extraction vs the old per-div WebDriver loop.
+
+Usage:
+    python benchmarks/bench_job_details.py [--repeat 5] [--fixture job_detail.html]
+"""
+import argparse
+
+from common import fixture_url, start_driver, measure, print_table
+
+from selenium.webdriver.common.by import By
+from constants import (
+    JOB_TITLE_SELECTORS,
+    EMPLOYER_NAME_SELECTORS,
+    LOCATION_SVG_PATH_PREFIX,
+    EMPLOYMENT_TYPE_SVG_PATH_PREFIX,
+    LOCATION_KEYWORDS,
+    EMPLOYMENT_TYPE_KEYWORDS,
+)
+from job_details import extract_job_details
+
+def legacy_extract_job_details(driver):
+    """The extraction loop log_application used before the single-script extractor."""
+    details = {"url": driver.current_url}
+    for key, selectors in (("job_title", JOB_TITLE_SELECTORS), ("employer", EMPLOYER_NAME_SELECTORS)):
+        for selector in selectors:
+            try:
+                text = driver.find_element(By.CSS_SELECTOR, selector).text
+                if text:
+                    details[key] = text
+                    break
+            except Exception:
+                continue
+
+    for div in driver.find_elements(By.CSS_SELECTOR, "div"):
+        try:
+            svg_elements = div.find_elements(By.TAG_NAME, "svg")
+            if not svg_elements:
+                continue
+            path_elements = svg_elements[0].find_elements(By.TAG_NAME, "path")
+            if not path_elements:
+                continue
+            path_d = path_elements[0].get_attribute("d")
+            if path_d and path_d.startswith(LOCATION_SVG_PATH_PREFIX):
+                key, keywords = "location", LOCATION_KEYWORDS
+            elif path_d and path_d.startswith(EMPLOYMENT_TYPE_SVG_PATH_PREFIX):
+                key, keywords = "employment_type", EMPLOYMENT_TYPE_KEYWORDS
+            else:
+                continue
+            for inner_div in div.find_elements(By.TAG_NAME, "div"):
+                if any(keyword in inner_div.text.lower() for keyword in keywords):
+                    details[key] = inner_div.text
+                    break
+        except Exception:
+            continue
+    return details
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job detail extraction')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per variant')
+    parser.add_argument('--fixture', default='job_detail.html', help='Fixture page in benchmarks/fixtures')
+    args = parser.parse_args()
+
+    driver = start_driver()
+    try:
+        driver.get(fixture_url(args.fixture))
+        legacy, legacy_calls, legacy_time = measure(driver, legacy_extract_job_details, args.repeat)
+        details, script_calls, script_time = measure(driver, extract_job_details, args.repeat)
+    finally:
+        driver.quit()
+
+    print_table(f"Job detail extraction ({args.fixture})", [
+        ("per-div WebDriver loop", legacy_calls, legacy_time),
+        ("single execute_script", script_calls, script_time),
+    ])
+    print(f"\nlegacy: {legacy}")
+    print(f"script: {details}")
+
+if __name__ == "__main__":
+    main()
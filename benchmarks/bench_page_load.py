@@ -0,0 +1,63 @@
+"""
+Benchmark: page loads with the default browser profile vs the performance profile.
+
+The fixture job page pulls in images, web fonts and analytics scripts from a
+local server that adds a simulated network delay to each of them.
+
+Usage:
+    python benchmarks/bench_page_load.py [--loads 10] [--asset-delay 0.1] [--force-headless]
+"""
+import argparse
+import dataclasses
+import tempfile
+import time
+
+from common import FixtureServer
+
+from selenium import webdriver
+from browser_profiles import build_chrome_options, apply_request_blocking
+from settings import get_config
+
+def time_page_loads(profile, server, loads):
+    """Load the fixture page repeatedly, returning (requests per load, seconds per load)."""
+    chrome_options = build_chrome_options(profile)
+    chrome_options.add_argument(f"--host-resolver-rules={server.host_resolver_rules()}")
+    driver = webdriver.Chrome(options=chrome_options)
+    try:
+        apply_request_blocking(driver, profile)
+        server.requests.clear()
+        start = time.perf_counter()
+        for _ in range(loads):
+            driver.get(server.url("job_detail_assets.html"))
+        elapsed = time.perf_counter() - start
+    finally:
+        driver.quit()
+    return sum(server.requests.values()) / loads, elapsed / loads
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark browser profiles on a local job page')
+    parser.add_argument('--loads', type=int, default=10, help='Page loads per profile')
+    parser.add_argument('--asset-delay', type=float, default=0.1, help='Simulated network delay per asset (seconds)')
+    parser.add_argument('--force-headless', action='store_true', help='Run the default profile headless too (for machines without a display)')
+    args = parser.parse_args()
+
+    config = get_config()
+    rows = []
+    with FixtureServer(asset_delay=args.asset_delay) as server:
+        for name in ("default", "performance"):
+            profile = config.get_browser_profile(name)
+            # Use a throwaway user-data directory so the benchmark never touches the bot's own
+            overrides = {"user_data_dir": tempfile.mkdtemp(prefix=f"bench-{name}-") if profile.user_data_dir else ""}
+            if args.force_headless:
+                overrides["headless"] = True
+            profile = dataclasses.replace(profile, **overrides)
+            requests_per_load, seconds = time_page_loads(profile, server, args.loads)
+            rows.append((name, requests_per_load, seconds))
+
+    print(f"\nPage load per profile ({args.loads} loads, {args.asset_delay * 1000:.0f} ms per asset)")
+    print(f"{'profile':<28}{'http requests':>18}{'ms / load':>12}")
+    for name, requests_per_load, seconds in rows:
+        print(f"{name:<28}{requests_per_load:>18.1f}{seconds * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    main()
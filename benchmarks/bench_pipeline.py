@@ -0,0 +1,123 @@
+"""
+Benchmark: the full process_job_results pipeline against the local fixture site.
+
+Logs in through the fixture NetID form, then searches each title and runs
+process_job_results over its result pages, exactly as run_bot does with an
+existing driver. Reports jobs per minute, WebDriver calls per job and the time
+spent in each phase. Pacing and the rate limit come from config/config.json,
+as in a real run.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--jobs 30] [--per-page 10] [--titles 2] [--max-pages 3] [--page-delay 0.05] [--profile-driver]
+"""
+import argparse
+import logging
+import time
+from collections import defaultdict
+
+from common import CommandCounter
+from fixture_site import HandshakeFixtureSite, TITLES
+
+import browser as browser_module
+import main
+from driver_profiler import get_driver_profiler
+from rate_limit import get_rate_limiter
+
+class PhaseTimer:
+    """Time and count WebDriver commands for calls to wrapped functions, per phase."""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.seconds = defaultdict(float)
+        self.commands = defaultdict(int)
+        self.calls = defaultdict(int)
+        self._restore = []
+
+    def wrap(self, target, name, phase):
+        original = getattr(target, name)
+
+        def timed(*args, **kwargs):
+            start, commands = time.perf_counter(), self.counter.total
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.seconds[phase] += time.perf_counter() - start
+                self.commands[phase] += self.counter.total - commands
+                self.calls[phase] += 1
+
+        setattr(target, name, timed)
+        self._restore.append((target, name, original))
+
+    def restore(self):
+        for target, name, original in reversed(self._restore):
+            setattr(target, name, original)
+        self._restore.clear()
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description='Benchmark process_job_results against the local fixture site')
+    parser.add_argument('--jobs', type=int, default=30, help='Postings listed per search')
+    parser.add_argument('--per-page', type=int, default=10, help='Postings per results page')
+    parser.add_argument('--titles', type=int, default=2, help='Job titles to search')
+    parser.add_argument('--max-pages', type=int, default=3, help='Result pages per title')
+    parser.add_argument('--page-delay', type=float, default=0.05, help='Simulated server latency per request (seconds)')
+    parser.add_argument('--verbose', action='store_true', help='Show the bot log')
+    parser.add_argument('--profile-driver', action='store_true', help='Also print the WebDriver hotspot table')
+    args = parser.parse_args()
+    get_driver_profiler().enabled = args.profile_driver
+
+    if not args.verbose:
+        logging.getLogger('handshake_job_bot').setLevel(logging.WARNING)
+        main.setup_logging = lambda: logging.getLogger('handshake_job_bot')
+
+    with HandshakeFixtureSite(jobs=args.jobs, per_page=args.per_page, page_delay=args.page_delay) as site:
+        browser = site.browser()
+        counter = CommandCounter(browser.driver)
+        phases = PhaseTimer(counter)
+        for name, phase in (
+            ("login", "login"),
+            ("search_job", "search"),
+            ("get_job_cards", "read result cards"),
+            ("navigate_to_next_page", "next results page"),
+            ("open_url", "page loads"),
+            ("apply_to_job", "apply (incl. form + log)"),
+            ("_fill_application_form", "  form fill"),
+        ):
+            phases.wrap(browser, name, phase)
+        phases.wrap(browser_module, "log_application", "  log application")
+        phases.wrap(main, "wait_for_page_ready", "page ready waits")
+        phases.wrap(main, "random_wait", "pacing between jobs")
+        phases.wrap(get_rate_limiter(), "acquire", "rate limit waits")
+
+        try:
+            if not browser.login():
+                raise SystemExit("Login against the fixture site failed")
+
+            handled = 0
+            pipeline_seconds = 0.0
+            pipeline_commands = 0
+            for title in TITLES[:args.titles]:
+                browser.search_job(title)
+                start, commands = time.perf_counter(), counter.total
+                handled += main.process_job_results(browser, max_pages=args.max_pages)
+                pipeline_seconds += time.perf_counter() - start
+                pipeline_commands += counter.total - commands
+        finally:
+            phases.restore()
+            counter.restore()
+            browser.close()
+
+    opened = phases.calls["apply (incl. form + log)"]
+    print(f"\nprocess_job_results on the fixture site ({args.titles} titles, {args.jobs} postings each, {args.per_page} per page)")
+    print(f"  jobs handled: {handled} ({opened} opened, {len(site.applied)} applications submitted)")
+    print(f"  wall time: {pipeline_seconds:.1f}s, {handled / pipeline_seconds * 60:.1f} jobs handled / min, {opened / pipeline_seconds * 60:.1f} jobs opened / min")
+    print(f"  webdriver calls: {pipeline_commands} ({pipeline_commands / max(opened, 1):.1f} per opened job)")
+    print(f"\n{'phase':<30}{'calls':>8}{'webdriver calls':>18}{'total s':>10}{'ms / call':>12}")
+    for phase in phases.calls:
+        calls = phases.calls[phase]
+        print(f"{phase:<30}{calls:>8}{phases.commands[phase]:>18}{phases.seconds[phase]:>10.2f}{phases.seconds[phase] / calls * 1000:>12.1f}")
+    if args.profile_driver:
+        print()
+        print(get_driver_profiler().summary())
+
+if __name__ == "__main__":
+    main_benchmark()
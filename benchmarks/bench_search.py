@@ -0,0 +1,55 @@
+"""
+Benchmark: URL-driven search vs typing each title into the search box.
+
+Usage:
+    python benchmarks/bench_search.py [--titles 9]
+"""
+import argparse
+import time
+
+from common import fixture_url, fixture_config, fixture_browser, start_driver, disable_rate_limiter, CommandCounter, print_table
+
+from settings import get_config
+
+def time_search_mode(driver, search_mode, titles):
+    """Search every title in the given mode, returning (calls per title, seconds per title)."""
+    search_url = fixture_url("postings.html") + "?page=1&per_page=25&sort_direction=desc"
+    config = fixture_config(
+        handshake={"filtered_search_url": search_url},
+        settings={"search_mode": search_mode, "typed_search_fallback": False},
+    )
+    browser = fixture_browser(driver, config)
+    driver.get(search_url)
+
+    counter = CommandCounter(driver)
+    try:
+        start = time.perf_counter()
+        for title in titles:
+            if not browser.search_job(title):
+                raise RuntimeError(f"{search_mode} search failed for {title}")
+        elapsed = time.perf_counter() - start
+    finally:
+        counter.restore()
+    return counter.total / len(titles), elapsed / len(titles)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark URL vs typed job search')
+    parser.add_argument('--titles', type=int, default=9, help='Number of titles from config.json to search')
+    args = parser.parse_args()
+
+    titles = get_config().job_search.titles[:args.titles]
+    # Typed search never goes through the limiter; pacing only url mode would skew the comparison
+    disable_rate_limiter()
+    driver = start_driver()
+    try:
+        rows = []
+        for search_mode in ("typed", "url"):
+            calls, seconds = time_search_mode(driver, search_mode, titles)
+            rows.append((f"{search_mode} search", calls, seconds))
+    finally:
+        driver.quit()
+
+    print_table(f"Search time per title ({len(titles)} titles)", rows)
+
+if __name__ == "__main__":
+    main()
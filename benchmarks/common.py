@@ -0,0 +1,186 @@
+"""
+Shared helpers for the Handshake Job Bot benchmarks.
+
+Benchmarks run against the saved pages in benchmarks/fixtures, so they need
+Chrome but no network access or Handshake account.
+"""
+import base64
+import copy
+import dataclasses
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, "fixtures")
+
+# Make the bot modules importable the same way src/main.py does
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+
+def fixture_url(name):
+    """Return a file:// URL for a saved fixture page."""
+    return "file://" + os.path.join(FIXTURES_DIR, name)
+
+# A 1x1 transparent PNG, served for every generated image asset
+PNG_BYTES = base64.b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=")
+
+class FixtureServer:
+    """Serve benchmarks/fixtures over HTTP, generating /assets/* with a simulated network delay.
+
+    Generated assets stand in for images, web fonts and analytics scripts. Run
+    Chrome with host_resolver_rules() so third-party hosts in the fixtures
+    (analytics, tag managers) also resolve to this server.
+    """
+
+    def __init__(self, asset_delay=0.1):
+        self.asset_delay = asset_delay
+        self.requests = Counter()
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                host = self.headers.get("Host", "").split(":")[0]
+                server.requests[host] += 1
+                path = self.path.split("?")[0]
+                # Third-party hosts (mapped here by host_resolver_rules) and /assets/ are generated
+                if host != "127.0.0.1" or path.startswith("/assets/"):
+                    return self._send_asset(path)
+                return super().do_GET()
+
+            def _send_asset(self, path):
+                time.sleep(server.asset_delay)
+                if path.endswith(".png"):
+                    body, content_type = PNG_BYTES, "image/png"
+                elif path.endswith((".woff", ".woff2")):
+                    body, content_type = b"\0" * 20000, "font/woff2"
+                else:
+                    body, content_type = b"window.__fixtureAnalytics = (window.__fixtureAnalytics || 0) + 1;", "application/javascript"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}/{path.lstrip('/')}"
+
+    def host_resolver_rules(self):
+        """Chrome flag value that sends every hostname to this server."""
+        return f"MAP * 127.0.0.1:{self.port}"
+
+def fixture_config(handshake=None, settings=None, browser_profiles=None):
+    """Return the bot's config with sections overridden for running against fixtures."""
+    from settings import get_config, parse_config
+
+    raw = copy.deepcopy(get_config().raw)
+    raw.setdefault('handshake', {}).update(handshake or {})
+    raw.setdefault('settings', {}).update(settings or {})
+    raw.setdefault('browser_profiles', {}).update(browser_profiles or {})
+    return parse_config(raw)
+
+def disable_rate_limiter():
+    """Swap in a disabled rate limiter with its state in a temporary directory.
+
+    Every variant then loads pages unpaced, so timings stay comparable, and
+    benchmark runs never spend the live bot's budget in .cache/rate_limit.json.
+    """
+    import rate_limit
+    from settings import get_config
+
+    class BenchmarkRateLimiter(rate_limit.RateLimiter):
+        @property
+        def settings(self):
+            return dataclasses.replace(get_config().rate_limit, enabled=False)
+
+    state_path = os.path.join(tempfile.mkdtemp(prefix="hjb-benchmark-"), "rate_limit.json")
+    rate_limit._limiter = BenchmarkRateLimiter(state_path)
+    return rate_limit._limiter
+
+def fixture_browser(driver, config):
+    """Wrap driver in a HandshakeBrowser that uses config instead of config.json."""
+    from browser import HandshakeBrowser
+
+    class FixtureBrowser(HandshakeBrowser):
+        @property
+        def config(self):
+            return config
+
+    return FixtureBrowser(existing_driver=driver)
+
+def start_driver(headless=True):
+    """Start a local Chrome WebDriver for benchmarking."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--no-sandbox")
+    return webdriver.Chrome(options=chrome_options)
+
+class CommandCounter:
+    """Count WebDriver commands by wrapping driver.execute, which every element call goes through."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.commands = Counter()
+        self._execute = driver.execute
+        driver.execute = self._counting_execute
+
+    def _counting_execute(self, driver_command, params=None):
+        self.commands[driver_command] += 1
+        return self._execute(driver_command, params)
+
+    @property
+    def total(self):
+        return sum(self.commands.values())
+
+    def reset(self):
+        self.commands.clear()
+
+    def restore(self):
+        self.driver.execute = self._execute
+
+def measure(driver, func, repeat=5):
+    """Run func(driver) repeatedly, returning (result, WebDriver calls per run, seconds per run)."""
+    counter = CommandCounter(driver)
+    try:
+        result = None
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = func(driver)
+        elapsed = (time.perf_counter() - start) / repeat
+        return result, counter.total / repeat, elapsed
+    finally:
+        counter.restore()
+
+def print_table(title, rows):
+    """Print benchmark rows of (name, calls per run, seconds per run)."""
+    print(f"\n{title}")
+    print(f"{'variant':<28}{'webdriver calls':>18}{'ms / run':>12}")
+    for name, calls, seconds in rows:
+        print(f"{name:<28}{calls:>18.1f}{seconds * 1000:>12.1f}")
@@ -0,0 +1,238 @@
+"""
+A local stand-in for Handshake that the whole bot can run against.
+
+HandshakeFixtureSite serves the recorded page templates in
+benchmarks/fixtures/site: the login page, the NetID form, paginated search
+results, job postings and their apply modal, which only closes (and marks
+the job applied) once every required field is answered. Chrome is pointed
+at it with --host-resolver-rules, so the bot sees the usual
+*.joinhandshake.com URLs. site.browser() returns a HandshakeBrowser wired to
+the site with a throwaway application log, answer cache and session.
+"""
+import os
+import tempfile
+import threading
+import zlib
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from string import Template
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+from common import FIXTURES_DIR, fixture_config
+
+SITE_DIR = os.path.join(FIXTURES_DIR, "site")
+SITE_HOST = "fixture.joinhandshake.com"
+# The NetID login lives on the school's identity provider, like the real flow
+IDP_HOST = "login.fixture.edu"
+SESSION_COOKIE = "hss-global"
+
+TITLES = ["Software Engineer", "Data Scientist", "Backend Engineer", "Machine Learning Engineer", "Data Analyst"]
+EMPLOYERS = ["Acme Robotics", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Enterprises"]
+LOCATIONS = ["Hybrid in Madison, WI, United States", "Remote in United States", "Onsite in Chicago, IL, United States"]
+
+def _template(name):
+    with open(os.path.join(SITE_DIR, name), "r", encoding="utf-8") as f:
+        return Template(f.read())
+
+class HandshakeFixtureSite:
+    """Serve a fake Handshake with `jobs` postings per search, `per_page` to a results page.
+
+    Every 7th posting must be applied to externally, every 11th was already
+    applied to, and postings ask 2-5 required questions.
+    """
+
+    def __init__(self, jobs=30, per_page=10, page_delay=0.0):
+        self.jobs = jobs
+        self.per_page = per_page
+        self.page_delay = page_delay
+        self.applied = set()
+        self.requests = 0
+        self.templates = {name: _template(f"{name}.html") for name in ("login", "netid", "postings", "card", "job")}
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                site.requests += 1
+                site._handle(self, "GET")
+
+            def do_POST(self):
+                site.requests += 1
+                site._handle(self, "POST")
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._temp_dir = None
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def url(self, path):
+        return f"http://{SITE_HOST}/{path.lstrip('/')}"
+
+    def host_resolver_rules(self):
+        """Chrome flag value that sends the site's and the identity provider's hosts to this server."""
+        return f"MAP {SITE_HOST} 127.0.0.1:{self.port}, MAP {IDP_HOST} 127.0.0.1:{self.port}"
+
+    def search_url(self):
+        """The filtered search URL a user would copy from the address bar."""
+        return self.url("stu/postings?" + urlencode({"page": 1, "per_page": self.per_page, "sort_direction": "desc", "sort_column": "created_at"}))
+
+    # Postings
+
+    def job_ids(self, query):
+        """Job IDs listed for a search, newest first; different titles overlap partly."""
+        start = 9000001 + zlib.crc32(query.encode("utf-8")) % max(self.jobs // 2, 1)
+        return [start + offset for offset in range(self.jobs)]
+
+    def job(self, job_id):
+        return {
+            "job_id": job_id,
+            "title": TITLES[job_id % len(TITLES)],
+            "employer": EMPLOYERS[job_id % len(EMPLOYERS)],
+            "employer_id": 10000 + job_id % len(EMPLOYERS),
+            "location": LOCATIONS[job_id % len(LOCATIONS)],
+            "employment_type": "Full-Time",
+            "posted": f"{job_id % 14 + 1}d ago",
+            "external": job_id % 7 == 0,
+            "field_count": 2 + job_id % 4,
+        }
+
+    # Request handling
+
+    def _handle(self, handler, method):
+        if self.page_delay:
+            threading.Event().wait(self.page_delay)
+        parts = urlsplit(handler.path)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path = parts.path.rstrip("/")
+        cookies = SimpleCookie(handler.headers.get("Cookie", ""))
+        logged_in = SESSION_COOKIE in cookies
+
+        if path == "/login":
+            return self._send(handler, self.templates["login"].safe_substitute(idp_url=f"http://{IDP_HOST}/idp/profile/SAML2/Redirect/SSO"))
+        if path == "/idp/profile/SAML2/Redirect/SSO":
+            if method == "POST":
+                return self._redirect(handler, self.url("auth/callback"))
+            return self._send(handler, self.templates["netid"].safe_substitute())
+        if path == "/auth/callback":
+            return self._redirect(handler, self.search_url(), {SESSION_COOKIE: "fixture-session"})
+        if not path.startswith("/stu/"):
+            return self._send(handler, "Not found", status=404)
+        if not logged_in:
+            return self._redirect(handler, self.url("login"))
+
+        if path == "/stu/postings":
+            return self._send(handler, self._postings_page(params))
+        if path.startswith("/stu/jobs/"):
+            segments = path.split("/")
+            try:
+                job_id = int(segments[3])
+            except (IndexError, ValueError):
+                return self._send(handler, "Not found", status=404)
+            if method == "POST" and segments[-1] == "apply":
+                self.applied.add(job_id)
+                return self._send(handler, "{}", content_type="application/json")
+            return self._send(handler, self._job_page(job_id))
+        return self._send(handler, "Not found", status=404)
+
+    def _postings_page(self, params):
+        query = params.get("query", "")
+        per_page = int(params.get("per_page", self.per_page))
+        page = max(int(params.get("page", 1)), 1)
+        job_ids = self.job_ids(query)
+        cards = []
+        for job_id in job_ids[(page - 1) * per_page:page * per_page]:
+            job = self.job(job_id)
+            cards.append(self.templates["card"].safe_substitute(
+                job, external_badge=" · Apply externally" if job["external"] else ""))
+        return self.templates["postings"].safe_substitute(
+            query=query, per_page=per_page, total=f"{len(job_ids):,}", cards="".join(cards))
+
+    def _job_page(self, job_id):
+        job = self.job(job_id)
+        if job["external"]:
+            apply_button = '<button type="button"><span>Apply Externally</span></button>'
+        elif job_id in self.applied or job_id % 11 == 0:
+            apply_button = '<div class="applied">Applied</div>'
+        else:
+            apply_button = '<button type="button" id="apply"><span>Apply</span></button>'
+        return self.templates["job"].safe_substitute(job, apply_button=apply_button)
+
+    def _send(self, handler, body, status=200, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.send_header("Cache-Control", "no-store")
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _redirect(self, handler, location, cookies=None):
+        handler.send_response(302)
+        handler.send_header("Location", location)
+        for name, value in (cookies or {}).items():
+            handler.send_header("Set-Cookie", f"{name}={value}; Path=/; HttpOnly")
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+
+    # Bot wiring
+
+    def config(self, settings=None):
+        """The bot's config pointed at this site, headless, without saved sessions or pacing between runs."""
+        return fixture_config(
+            handshake={"login_url": self.url("login"), "filtered_search_url": self.search_url()},
+            settings={"reuse_session": False, "verbose_logging": False, "browser_profile": "default", **(settings or {})},
+            browser_profiles={"default": {"headless": True}},
+        )
+
+    def browser(self, settings=None):
+        """A HandshakeBrowser on a new headless Chrome that resolves the site's host to this server.
+
+        The application log, job statuses, answer cache and rate limiter state
+        go to a temporary directory, so benchmark runs never touch logs/ or .cache/.
+        """
+        import answers
+        import job_status
+        import log_store
+        import rate_limit
+        from browser import HandshakeBrowser
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from browser_profiles import build_chrome_options
+        from driver_provision import resolve_chromedriver
+
+        # The login form only needs something to type
+        os.environ.setdefault('HANDSHAKE_NETID', 'fixture-user')
+        os.environ.setdefault('HANDSHAKE_PASSWORD', 'fixture-password')
+        config = self.config(settings)
+        self._temp_dir = self._temp_dir or tempfile.mkdtemp(prefix="hjb-fixture-site-")
+        log_store._store = log_store.ApplicationLogStore(
+            os.path.join(self._temp_dir, "applications_log.jsonl"),
+            os.path.join(self._temp_dir, "applications_index.txt"),
+            os.path.join(self._temp_dir, "applications_log.json"),
+        )
+        job_status._store = job_status.JobStatusStore(os.path.join(self._temp_dir, "job_status.jsonl"))
+        answers._engine = answers.AnswerEngine(config.answers.rules, os.path.join(self._temp_dir, "answers_cache.jsonl"))
+        rate_limit._limiter = rate_limit.RateLimiter(os.path.join(self._temp_dir, "rate_limit.json"))
+        site = self
+
+        class FixtureSiteBrowser(HandshakeBrowser):
+            @property
+            def config(self):
+                return config
+
+            def _setup_driver(self):
+                chrome_options = build_chrome_options(self.profile)
+                chrome_options.add_argument(f"--host-resolver-rules={site.host_resolver_rules()}")
+                return webdriver.Chrome(service=Service(resolve_chromedriver()), options=chrome_options)
+
+        return FixtureSiteBrowser()
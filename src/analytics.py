@@ -0,0 +1,235 @@
+"""
+Application log analytics for the Handshake Job Bot.
+
+`python main.py analyze` streams logs/applications_log.jsonl into a small
+SQLite database (.cache/analytics.sqlite3) with one narrow row per log record
+and indexes on status, employer, title and timestamp. Only records appended
+since the last sync are read, so each query starts from an up-to-date index
+without loading the log into memory, and answers in milliseconds:
+
+- summary: outcomes, and the employers and titles with the most applications
+- funnel: how many jobs got from being logged to an actual application
+- timeseries: outcomes per hour, day or week
+
+Every query can be narrowed by time (--since 7d, --until 2025-05-01),
+employer, title (case-insensitive prefixes) and status.
+"""
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from constants import ANALYTICS_DB_PATH
+from settings import PROJECT_ROOT
+from log_store import extract_job_id, get_log_store
+
+QUERIES = ("summary", "funnel", "timeseries")
+# strftime formats for the timeseries buckets
+INTERVALS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "week": "%Y-W%W"}
+BATCH_SIZE = 5000
+TOP_N = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    job_id TEXT,
+    status TEXT NOT NULL,
+    title TEXT COLLATE NOCASE,
+    employer TEXT COLLATE NOCASE,
+    location TEXT,
+    employment_type TEXT
+);
+CREATE INDEX IF NOT EXISTS applications_ts ON applications (ts);
+CREATE INDEX IF NOT EXISTS applications_status ON applications (status, ts);
+CREATE INDEX IF NOT EXISTS applications_employer ON applications (employer, ts);
+CREATE INDEX IF NOT EXISTS applications_title ON applications (title, ts);
+CREATE TABLE IF NOT EXISTS sync (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# Funnel stages: each one narrows the previous
+FUNNEL = (
+    ("logged", "1"),
+    ("applied through Handshake", "status != 'external application'"),
+    ("reached the application form", "status IN ('applied', 'unanswered application questions')"),
+    ("applied", "status = 'applied'"),
+)
+
+def sql_timestamp(log_timestamp):
+    """Turn the log's "2025-05-01_14-30-00" into SQLite's "2025-05-01 14:30:00", or None."""
+    if not log_timestamp or len(log_timestamp) != 19:
+        return None
+    return f"{log_timestamp[:10]} {log_timestamp[11:].replace('-', ':')}"
+
+def parse_time(text, now=None):
+    """Parse "7d", "12h", "2w" (that long ago) or a date like "2025-05-01" into an SQLite timestamp."""
+    match = re.fullmatch(r"\s*(\d+)\s*([hdw])\s*", text or "")
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = timedelta(hours=amount) if unit == "h" else timedelta(days=amount * (7 if unit == "w" else 1))
+        return ((now or datetime.now()) - delta).strftime("%Y-%m-%d %H:%M:%S")
+    for date_format in ("%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d_%H-%M-%S"):
+        try:
+            return datetime.strptime(text.strip(), date_format).strftime("%Y-%m-%d %H:%M:%S")
+        except (AttributeError, ValueError):
+            continue
+    raise ValueError(f"Cannot read time '{text}', use e.g. 7d, 12h, 2w or 2025-05-01")
+
+def _prefix(value):
+    """A LIKE pattern matching value as a literal prefix."""
+    return re.sub(r"([\\%_])", r"\\\1", value) + "%"
+
+def _table(headers, rows):
+    """Format rows as a plain-text table, numbers right-aligned."""
+    cells = [[str(cell) if cell is not None else "-" for cell in row] for row in rows]
+    widths = [max([len(header)] + [len(row[index]) for row in cells]) for index, header in enumerate(headers)]
+    numeric = [bool(rows) and all(isinstance(row[index], (int, float)) for row in rows) for index in range(len(headers))]
+
+    def line(values):
+        return "  ".join(value.rjust(width) if is_number else value.ljust(width)
+                         for value, width, is_number in zip(values, widths, numeric)).rstrip()
+
+    return "\n".join([line(headers), line(["-" * width for width in widths])] + [line(row) for row in cells])
+
+class ApplicationAnalytics:
+    def __init__(self, db_path=None, log_store=None):
+        self.db_path = db_path or os.path.join(PROJECT_ROOT, ANALYTICS_DB_PATH)
+        self.log_store = log_store or get_log_store()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # Loading
+
+    def _synced_offset(self):
+        row = self.db.execute("SELECT value FROM sync WHERE key = 'log_offset'").fetchone()
+        return row[0] if row else 0
+
+    def sync(self, rebuild=False):
+        """Add log records appended since the last sync; returns how many were added."""
+        offset = self._synced_offset()
+        log_path = self.log_store.log_path
+        log_size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+        if rebuild or log_size < offset:
+            # The log was replaced or truncated, load it again from the start
+            with self.db:
+                self.db.execute("DELETE FROM applications")
+            offset = 0
+
+        added = 0
+        batch = []
+        for entry, end_offset in self.log_store.iter_records(offset):
+            offset = end_offset
+            ts = sql_timestamp(entry.get("timestamp")) if entry else None
+            if ts is None:
+                continue
+            batch.append((ts, extract_job_id(entry.get("url")), entry.get("status") or "unknown", entry.get("job_title"),
+                          entry.get("employer"), entry.get("location"), entry.get("employment_type")))
+            if len(batch) >= BATCH_SIZE:
+                added += self._insert(batch, offset)
+                batch = []
+        added += self._insert(batch, offset)
+        return added
+
+    def _insert(self, rows, offset):
+        # Rows and the offset they end at are committed together, so an interrupted sync resumes cleanly
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO applications (ts, job_id, status, title, employer, location, employment_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.execute("INSERT OR REPLACE INTO sync (key, value) VALUES ('log_offset', ?)", (offset,))
+        return len(rows)
+
+    # Queries
+
+    def _where(self, since=None, until=None, employer=None, title=None, status=None):
+        clauses, params = [], []
+        if since:
+            clauses.append("ts >= ?")
+            params.append(parse_time(since))
+        if until:
+            clauses.append("ts < ?")
+            params.append(parse_time(until))
+        if employer:
+            clauses.append("employer LIKE ? ESCAPE '\\'")
+            params.append(_prefix(employer))
+        if title:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            params.append(_prefix(title))
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        return " AND ".join(clauses) or "1", params
+
+    def summary(self, limit=TOP_N, **filters):
+        where, params = self._where(**filters)
+        total, jobs, first, last = self.db.execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT job_id), MIN(ts), MAX(ts) FROM applications WHERE {where}", params).fetchone()
+        lines = [f"{total} log records for {jobs} jobs" + (f", {first} to {last}" if total else "")]
+        if not total:
+            return "\n".join(lines)
+
+        rows = self.db.execute(
+            f"SELECT status, COUNT(*) FROM applications WHERE {where} GROUP BY status ORDER BY COUNT(*) DESC", params).fetchall()
+        lines += ["", _table(["status", "records", "share"], [(status, count, f"{count / total:.0%}") for status, count in rows])]
+        for column, heading in (("employer", "employer"), ("title", "job title")):
+            rows = self.db.execute(
+                f"SELECT {column}, SUM(status = 'applied') AS applied, COUNT(*) FROM applications "
+                f"WHERE {where} AND {column} IS NOT NULL GROUP BY {column} ORDER BY applied DESC, COUNT(*) DESC LIMIT ?",
+                params + [limit]).fetchall()
+            if rows:
+                lines += ["", f"Top {len(rows)} by {heading}:", _table([heading, "applied", "records"], rows)]
+        return "\n".join(lines)
+
+    def funnel(self, **filters):
+        where, params = self._where(**filters)
+        columns = ", ".join(f"COUNT(DISTINCT CASE WHEN {condition} THEN COALESCE(job_id, id) END)" for _, condition in FUNNEL)
+        counts = self.db.execute(f"SELECT {columns} FROM applications WHERE {where}", params).fetchone()
+        if not counts[0]:
+            return "No jobs logged"
+        rows = []
+        for index, ((stage, _), count) in enumerate(zip(FUNNEL, counts)):
+            previous = counts[index - 1] if index else count
+            rows.append((stage, count, f"{count / counts[0]:.0%}", f"{count / previous:.0%}" if previous else "-"))
+        already = self.db.execute(
+            f"SELECT COUNT(DISTINCT COALESCE(job_id, id)) FROM applications WHERE {where} AND status = 'already applied'",
+            params).fetchone()[0]
+        return (_table(["stage", "jobs", "of logged", "of previous"], rows)
+                + f"\n{already} jobs had already been applied to outside the bot")
+
+    def timeseries(self, interval="day", **filters):
+        where, params = self._where(**filters)
+        rows = self.db.execute(
+            f"SELECT strftime(?, ts) AS bucket, status, COUNT(*) FROM applications WHERE {where} "
+            "GROUP BY bucket, status ORDER BY bucket", [INTERVALS[interval]] + params).fetchall()
+        if not rows:
+            return "No log records in this range"
+        statuses = sorted({status for _, status, _ in rows}, key=lambda status: (status != "applied", status))
+        buckets = {}
+        for bucket, status, count in rows:
+            buckets.setdefault(bucket, dict.fromkeys(statuses, 0))[status] = count
+        table = [(bucket, sum(counts.values()), *counts.values()) for bucket, counts in buckets.items()]
+        return _table([interval, "total", *statuses], table)
+
+def analyze(query="summary", rebuild=False, interval="day", limit=TOP_N, **filters):
+    """Sync the analytics store with the application log and return the query's report as text."""
+    analytics = ApplicationAnalytics()
+    try:
+        start = time.perf_counter()
+        added = analytics.sync(rebuild)
+        synced = time.perf_counter()
+        if query == "funnel":
+            report = analytics.funnel(**filters)
+        elif query == "timeseries":
+            report = analytics.timeseries(interval, **filters)
+        else:
+            report = analytics.summary(limit, **filters)
+        done = time.perf_counter()
+    finally:
+        analytics.close()
+    return (f"{report}\n\n(synced {added} new log records in {(synced - start) * 1000:.0f}ms, "
+            f"query took {(done - synced) * 1000:.1f}ms)")
@@ -0,0 +1,176 @@
+"""
+Answer engine for application form questions.
+
+Questions are normalized (lowercase, punctuation and numbering stripped) and
+answered from, in order: the rules in config.json's "answers" section, the
+answers used in previously successful submissions, and finally the bot's
+old defaults. Rule answers and values the form already held (filled in by
+Handshake or the user) that led to a successful submission are appended to
+logs/answers_cache.jsonl and loaded into an in-memory index on startup; the
+fallback defaults are never cached, so they are not mistaken for learned
+answers later.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+
+from constants import ANSWERS_CACHE_PATH
+from settings import PROJECT_ROOT, get_config
+from application_form import default_answer
+
+logger = logging.getLogger('handshake_job_bot')
+
+# Answer sources worth remembering: "cache" answers are already stored, "default" ones are guesses
+CACHED_SOURCES = ("rule", "form")
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# "Question 3:", "3." and "*" prefixes differ between postings for the same question
+_NUMBERING = re.compile(r"^(question\s*)?\d+\s*[:.)-]?\s*")
+
+def normalize_question(text):
+    """Normalize question text so the same question matches across postings."""
+    text = _NUMBERING.sub("", (text or "").strip().lower().lstrip("* "))
+    return _NON_WORD.sub(" ", text).strip()
+
+def _match_option(options, answer):
+    """Return the option whose text or value matches the answer, or None."""
+    wanted = normalize_question(answer)
+    if not wanted:
+        return None
+    normalized = [(option, normalize_question(option["text"]), normalize_question(option["value"])) for option in options]
+    for option, text, value in normalized:
+        if wanted in (text, value):
+            return option
+    for option, text, value in normalized:
+        if text.startswith(wanted) or (value and value.startswith(wanted)):
+            return option
+    return None
+
+class AnswerEngine:
+    def __init__(self, rules=None, cache_path=None, use_cache=True):
+        self.rules = [(re.compile(rule["pattern"], re.IGNORECASE), rule["answer"]) for rule in rules or []]
+        self.cache_path = cache_path or os.path.join(PROJECT_ROOT, ANSWERS_CACHE_PATH)
+        self.use_cache = use_cache
+        self.cache = {}
+        self.sources = Counter()
+        # Rule lookups are memoized per normalized question, so repeated questions cost one dict lookup
+        self._rule_index = {}
+        self._lock = threading.Lock()
+        if use_cache:
+            self._load_cache()
+
+    @classmethod
+    def from_config(cls):
+        answers = get_config().answers
+        return cls(rules=answers.rules, use_cache=answers.cache_answers)
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        with open(self.cache_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.cache[(entry["question"], entry["kind"])] = entry["answer"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+
+    def _rule_answer(self, question):
+        if question not in self._rule_index:
+            self._rule_index[question] = next(
+                (answer for pattern, answer in self.rules if pattern.search(question)), None
+            )
+        return self._rule_index[question]
+
+    def lookup(self, question, kind):
+        """Return (answer, source) for a normalized question and control kind."""
+        with self._lock:
+            answer = self._rule_answer(question)
+            if answer is not None:
+                return answer, "rule"
+            answer = self.cache.get((question, kind))
+            if answer is not None:
+                return answer, "cache"
+        return None, "default"
+
+    def answerer(self, used_answers):
+        """Return an answer_for(field, control) function for plan_form_fill that records what it used."""
+        def answer_for(form_field, control):
+            question = normalize_question(form_field.question)
+            answer, source = self.lookup(question, control.kind)
+            value = None
+            if answer is not None:
+                if control.kind == "select":
+                    option = _match_option(control.options, answer)
+                    value = option["value"] if option else None
+                elif control.kind == "text":
+                    value = answer
+                else:
+                    # plan_form_fill clicks the radio or checkbox whose label equals the returned value
+                    choices = [{"text": choice.value, "value": choice.value} for choice in form_field.controls_of(control.kind)]
+                    option = _match_option(choices, answer)
+                    value = option["value"] if option else None
+            if value is None:
+                value = default_answer(form_field, control)
+                source = "default"
+            with self._lock:
+                self.sources[source] += 1
+            if question and value is not None:
+                if control.kind == "select":
+                    option = next((option for option in control.options if option["value"] == value), None)
+                    used_answers.append((question, control.kind, option["text"] if option else value, source))
+                else:
+                    used_answers.append((question, control.kind, value, source))
+            return value
+        return answer_for
+
+    def record_supplied(self, manifest, used_answers):
+        """Record the values the form already held, which plan_form_fill leaves as they are."""
+        for form_field in manifest.fields:
+            question = normalize_question(form_field.question)
+            if not question:
+                continue
+            for control in form_field.controls_of("select"):
+                if 0 < control.selected_index < len(control.options):
+                    used_answers.append((question, "select", control.options[control.selected_index]["text"], "form"))
+            for control in form_field.controls_of("text"):
+                if control.value:
+                    used_answers.append((question, "text", control.value, "form"))
+            for kind in ("radio", "checkbox"):
+                checked = next((control for control in form_field.controls_of(kind) if control.checked), None)
+                if checked is not None and checked.value:
+                    used_answers.append((question, kind, checked.value, "form"))
+
+    def remember(self, used_answers):
+        """Persist rule and form-supplied answers from a successful submission so later forms reuse them."""
+        if not self.use_cache or not used_answers:
+            return
+        new_lines = []
+        with self._lock:
+            for question, kind, answer, source in used_answers:
+                if source not in CACHED_SOURCES or self.cache.get((question, kind)) == answer:
+                    continue
+                self.cache[(question, kind)] = answer
+                new_lines.append(json.dumps({"question": question, "kind": kind, "answer": answer}, ensure_ascii=False) + "\n")
+            if new_lines:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                with open(self.cache_path, "a", encoding="utf-8") as f:
+                    f.writelines(new_lines)
+
+    def summary(self):
+        sources = ", ".join(f"{source}: {count}" for source, count in self.sources.most_common())
+        return f"Form answers by source: {sources or 'none'} ({len(self.cache)} cached answers)"
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_answer_engine():
+    """Return the shared answer engine, loading the answer cache on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AnswerEngine.from_config()
+    return _engine
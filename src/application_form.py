@@ -0,0 +1,238 @@
+"""
+Application form handling for the Handshake Job Bot.
+
+The apply modal is introspected with a single script call that returns a
+manifest of every required field (type, question, options, current value)
+and of the resume, cover letter and transcript buttons. The bot plans its
+answers from that manifest and applies all of them in one more script call,
+instead of waiting on each document button and querying every field several
+times over WebDriver.
+"""
+from dataclasses import dataclass, field
+
+from constants import (
+    DIV_REQUIRED_FIELD_CSS,
+    SELECT_DROPDOWN_CSS,
+    INPUT_TEXT_CSS,
+    TEXTAREA_CSS,
+    INPUT_RADIO_CSS,
+    INPUT_CHECKBOX_CSS,
+    XPATH_RESUME_BUTTON,
+    XPATH_COVERLETTER_BUTTON,
+    XPATH_TRANSCRIPT_BUTTON,
+)
+
+# Attribute the manifest script tags each control with, so the fill script can find it again
+FIELD_HANDLE_ATTRIBUTE = "data-hjb-field"
+
+DOCUMENT_BUTTONS = {
+    "resume": XPATH_RESUME_BUTTON,
+    "cover letter": XPATH_COVERLETTER_BUTTON,
+    "transcript": XPATH_TRANSCRIPT_BUTTON,
+}
+
+FORM_MANIFEST_SCRIPT = """
+const [handleAttribute, requiredSelector, selectors, documentButtons] = arguments;
+
+function questionText(field) {
+    const label = field.querySelector('label, legend');
+    const text = (label ? label.innerText : field.innerText) || '';
+    return text.split('\\n').map(line => line.trim()).find(line => line) || '';
+}
+
+function optionLabel(input) {
+    if (input.labels && input.labels.length) { return input.labels[0].innerText.trim(); }
+    const parent = input.closest('label');
+    return parent ? parent.innerText.trim() : (input.value || '');
+}
+
+const documents = [];
+for (const [name, xpath] of Object.entries(documentButtons)) {
+    const button = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!button) { continue; }
+    const handle = 'doc-' + documents.length;
+    button.setAttribute(handleAttribute, handle);
+    documents.push({handle: handle, name: name, disabled: !!button.disabled, pressed: button.getAttribute('aria-pressed') === 'true'});
+}
+
+const fields = [];
+document.querySelectorAll(requiredSelector).forEach((container, fieldIndex) => {
+    const question = questionText(container);
+    const controls = [];
+    let controlIndex = 0;
+    function tag(element) {
+        const handle = fieldIndex + '-' + (controlIndex++);
+        element.setAttribute(handleAttribute, handle);
+        return handle;
+    }
+    container.querySelectorAll(selectors.select).forEach(select => {
+        controls.push({
+            handle: tag(select), kind: 'select', value: select.value, selected_index: select.selectedIndex,
+            options: Array.from(select.options).map(option => ({value: option.value, text: option.text.trim()}))
+        });
+    });
+    container.querySelectorAll(selectors.text + ', ' + selectors.textarea).forEach(input => {
+        controls.push({handle: tag(input), kind: 'text', value: input.value});
+    });
+    container.querySelectorAll(selectors.radio).forEach(input => {
+        controls.push({handle: tag(input), kind: 'radio', value: optionLabel(input), checked: input.checked});
+    });
+    container.querySelectorAll(selectors.checkbox).forEach(input => {
+        controls.push({handle: tag(input), kind: 'checkbox', value: optionLabel(input), checked: input.checked});
+    });
+    fields.push({index: fieldIndex, question: question, required: true, controls: controls});
+});
+
+return {documents: documents, fields: fields};
+"""
+
+# Values are set through the native setters and announced with input/change
+# events so React-controlled inputs pick them up
+FORM_FILL_SCRIPT = """
+const [handleAttribute, actions] = arguments;
+
+function setNativeValue(element, value) {
+    const prototype = Object.getPrototypeOf(element);
+    const setter = Object.getOwnPropertyDescriptor(prototype, 'value').set;
+    setter.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+
+return actions.map(action => {
+    const element = document.querySelector('[' + handleAttribute + '="' + action.handle + '"]');
+    if (!element) { return false; }
+    if (action.type === 'click') {
+        element.click();
+    } else {
+        setNativeValue(element, action.value);
+    }
+    return true;
+});
+"""
+
+@dataclass
+class FormControl:
+    handle: str
+    kind: str
+    value: str = ""
+    checked: bool = False
+    selected_index: int = -1
+    options: list = field(default_factory=list)
+
+@dataclass
+class FormField:
+    index: int
+    question: str
+    required: bool = True
+    controls: list = field(default_factory=list)
+
+    def controls_of(self, kind):
+        return [control for control in self.controls if control.kind == kind]
+
+@dataclass
+class DocumentButton:
+    handle: str
+    name: str
+    disabled: bool = False
+    pressed: bool = False
+
+@dataclass
+class FormManifest:
+    documents: list = field(default_factory=list)
+    fields: list = field(default_factory=list)
+
+@dataclass
+class FormAction:
+    handle: str
+    type: str
+    value: str = None
+    description: str = ""
+
+# Arguments for FORM_MANIFEST_SCRIPT, shared by every browser backend
+FORM_MANIFEST_ARGS = (
+    FIELD_HANDLE_ATTRIBUTE,
+    DIV_REQUIRED_FIELD_CSS,
+    {
+        "select": SELECT_DROPDOWN_CSS,
+        "text": INPUT_TEXT_CSS,
+        "textarea": TEXTAREA_CSS,
+        "radio": INPUT_RADIO_CSS,
+        "checkbox": INPUT_CHECKBOX_CSS,
+    },
+    DOCUMENT_BUTTONS,
+)
+
+def parse_form_manifest(result):
+    """Build a FormManifest from FORM_MANIFEST_SCRIPT's result."""
+    result = result or {}
+    return FormManifest(
+        documents=[DocumentButton(**document) for document in result.get("documents", [])],
+        fields=[
+            FormField(
+                index=form_field["index"],
+                question=form_field.get("question", ""),
+                required=form_field.get("required", True),
+                controls=[FormControl(**control) for control in form_field.get("controls", [])],
+            )
+            for form_field in result.get("fields", [])
+        ],
+    )
+
+def read_form_manifest(driver):
+    """Introspect the open application form in a single script call."""
+    return parse_form_manifest(driver.execute_script(FORM_MANIFEST_SCRIPT, *FORM_MANIFEST_ARGS))
+
+def default_answer(form_field, control):
+    """The answers the bot has always used: "Yes", the first real option, the first choice."""
+    if control.kind == "text":
+        return "Yes"
+    if control.kind == "select":
+        return control.options[1]["value"] if len(control.options) > 1 else None
+    return control.value
+
+def plan_form_fill(manifest, answer_for=default_answer):
+    """Turn a manifest into the minimal list of actions that completes the form."""
+    actions = []
+    for document in manifest.documents:
+        if not document.disabled and not document.pressed:
+            actions.append(FormAction(document.handle, "click", description=f"Selected {document.name}"))
+
+    for form_field in manifest.fields:
+        for control in form_field.controls_of("select"):
+            if control.selected_index > 0:
+                continue
+            value = answer_for(form_field, control)
+            if value is not None:
+                actions.append(FormAction(control.handle, "set", value, "Selected dropdown option"))
+
+        for control in form_field.controls_of("text"):
+            if control.value:
+                continue
+            value = answer_for(form_field, control)
+            if value is not None:
+                actions.append(FormAction(control.handle, "set", value, "Filled text input"))
+
+        radios = form_field.controls_of("radio")
+        if radios and not any(radio.checked for radio in radios):
+            choice = answer_for(form_field, radios[0])
+            radio = next((radio for radio in radios if radio.value == choice), radios[0])
+            actions.append(FormAction(radio.handle, "click", description="Selected radio button"))
+
+        checkboxes = form_field.controls_of("checkbox")
+        if checkboxes and not any(checkbox.checked for checkbox in checkboxes):
+            choice = answer_for(form_field, checkboxes[0])
+            checkbox = next((checkbox for checkbox in checkboxes if checkbox.value == choice), checkboxes[0])
+            actions.append(FormAction(checkbox.handle, "click", description="Selected checkbox"))
+    return actions
+
+def form_fill_args(actions):
+    """Arguments for FORM_FILL_SCRIPT that apply actions."""
+    return (FIELD_HANDLE_ATTRIBUTE, [{"handle": action.handle, "type": action.type, "value": action.value} for action in actions])
+
+def fill_form(driver, actions):
+    """Apply every planned action in one script call, returning the actions that succeeded."""
+    if not actions:
+        return []
+    results = driver.execute_script(FORM_FILL_SCRIPT, *form_fill_args(actions)) or []
+    return [action for action, done in zip(actions, results) if done]
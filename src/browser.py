@@ -2,26 +2,46 @@ import os
 import logging
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.keys import Keys
 import pickle
+import time
 from datetime import datetime
 import json 
 
-from utils import load_config, random_wait, log_application
+from utils import log_application, build_search_url, next_page_url
+from job_details import extract_job_cards
+from settings import get_config
+from browser_profiles import build_chrome_options, apply_request_blocking
+from driver_provision import resolve_chromedriver, get_startup_timer
+from session_store import get_session_store, cookie_params
+from application_form import read_form_manifest, plan_form_fill, fill_form
+from answers import get_answer_engine
+from prefetch import TabPrefetcher
+from pagination import RESULT_COUNT_SCRIPT, parse_result_count
+from checkpoint import get_checkpoint
+from rate_limit import get_rate_limiter, RESPONSE_STATUS_SCRIPT, is_error_status
+from instrumentation import instrument_methods, instrument_driver
+from driver_profiler import get_driver_profiler
+from waits import pace, wait_for_element, wait_for_element_gone, wait_for_url_contains, wait_for_page_ready
 from constants import *
 
 logger = logging.getLogger('handshake_job_bot')
 
+@instrument_methods
 class HandshakeBrowser:
-    def __init__(self, existing_driver=None):
-        self.config = load_config()
-        self.driver = existing_driver if existing_driver else self._setup_driver()
-        self.verbose_logging = self.config.get('settings', {}).get('verbose_logging', True)
+    def __init__(self, existing_driver=None, profile_name=None, instance_name=None):
+        self.profile_name = profile_name or self.config.settings.browser_profile
+        self.profile = self.config.get_browser_profile(self.profile_name)
+        self.instance_name = instance_name
+        self.driver = instrument_driver(existing_driver if existing_driver else self._setup_driver())
+        get_driver_profiler().attach(self.driver)
+        self.verbose_logging = self.config.settings.verbose_logging
+        # Answers used on the form currently being filled, remembered once it submits successfully
+        self.form_answers = []
+        self.prefetcher = TabPrefetcher(self, self.config.settings.prefetch_depth)
         
         # If using existing driver, check if already logged in
         if existing_driver:
@@ -31,56 +51,114 @@ class HandshakeBrowser:
                 logger.warning("Existing session not on Handshake. User should navigate to Handshake first.")
                 logger.warning("Current URL: " + self.driver.current_url)
         
+    @property
+    def config(self):
+        """The current configuration, re-read only when config.json changes."""
+        return get_config()
+    
     def _setup_driver(self):
-        """Set up and configure Chrome WebDriver."""
-        chrome_options = Options()
-        # Uncomment these lines if you want to run headless
-        # chrome_options.add_argument("--headless")
-        # chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--no-sandbox")
+        """Set up and configure Chrome WebDriver using the selected browser profile."""
+        chrome_options = build_chrome_options(self.profile, self.instance_name)
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(resolve_chromedriver())
+        launch_start = time.monotonic()
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        get_startup_timer().record("chrome_launch", time.monotonic() - launch_start)
+        apply_request_blocking(driver, self.profile)
         return driver
     
+    def open_url(self, url):
+        """Load url within the shared rate limit, switching to its tab instead if it was prefetched in the background."""
+        if not self.prefetcher.activate(url):
+            limiter = get_rate_limiter()
+            limiter.acquire()
+            start = time.monotonic()
+            try:
+                self.driver.get(url)
+            except Exception:
+                limiter.record(time.monotonic() - start, error=True)
+                raise
+            if limiter.enabled:
+                limiter.record(time.monotonic() - start, error=is_error_status(self._response_status()))
+        get_startup_timer().mark_first_page()
+    
+    def _response_status(self):
+        """HTTP status of the current page, or 0 if Chrome doesn't report it."""
+        try:
+            return self.driver.execute_script(RESPONSE_STATUS_SCRIPT)
+        except Exception:
+            return 0
+    
+    def prefetch(self, urls):
+        """Start loading the next urls in background tabs, up to the configured pipeline depth."""
+        self.prefetcher.prefetch_all(urls)
+    
+    def save_session(self):
+        """Store the browser's cookies so later runs and workers can skip the NetID login."""
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+            if get_session_store().save(cookies) and self.verbose_logging:
+                logger.info(f"Saved session with {len(cookies)} cookies")
+        except Exception as e:
+            logger.warning(f"Could not save session: {str(e)}")
+    
+    def restore_session(self):
+        """Load saved cookies and check them with a single page load, returning True if still logged in."""
+        cookies = get_session_store().load()
+        if not cookies:
+            return False
+        
+        try:
+            # Set the cookies directly through CDP so no page has to be opened first
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookie_params(cookies)})
+            
+            # One request to a page that requires login tells us if the session is still valid
+            self.open_url(self.config.handshake.filtered_search_url)
+            current_url = self.driver.current_url.lower()
+            if "login" in current_url or "postings" not in current_url:
+                logger.info("Saved session has expired")
+                self.driver.delete_all_cookies()
+                return False
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Could not restore session: {str(e)}")
+            return False
+    
     def login(self):
-        """Login to Handshake using UW NetID."""
+        """Login to Handshake, reusing a saved session when it is still valid, otherwise with UW NetID."""
+        if self.config.settings.reuse_session and self.restore_session():
+            logger.info("Restored saved Handshake session, skipping login")
+            return True
+        
         logger.info("Logging into Handshake...")
         
         try:
             # Navigate to login page
-            self.driver.get(self.config['handshake']['login_url'])
-            random_wait()
+            self.open_url(self.config.handshake.login_url)
             
-            # Click "Sign in with NetID" button
-            netid_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, XPATH_NETID_LOGIN))
-            )
+            # Click "Sign in with NetID" button as soon as it is clickable
+            netid_button = wait_for_element(self.driver, (By.XPATH, XPATH_NETID_LOGIN), timeout=10, clickable=True)
+            pace()
             netid_button.click()
             
-            # Random wait for NetID login page
-            random_wait()
-            
-            # Enter NetID credentials
-            netid_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, ID_USERNAME))
-            )
+            # Wait for the NetID login page
+            netid_input = wait_for_element(self.driver, (By.ID, ID_USERNAME), timeout=10)
             netid_input.send_keys(os.environ.get('HANDSHAKE_NETID'))
             
             password_input = self.driver.find_element(By.ID, ID_PASSWORD)
             password_input.send_keys(os.environ.get('HANDSHAKE_PASSWORD'))
             
-            # Random wait between actions
-            random_wait()
+            # Short jitter between actions
+            pace()
             
             # Click login button
             login_button = self.driver.find_element(By.NAME, NAME_LOGIN_BUTTON)
             login_button.click()
             
             # Wait for redirection to Handshake
-            random_wait(3, 5)  # Give some time for redirection
+            wait_for_url_contains(self.driver, "joinhandshake.com", timeout=15, baseline=(3, 5))
+            wait_for_page_ready(self.driver, timeout=10, baseline=(0, 0))
             
             # Check for and close modal that might appear after login
             try:
@@ -95,6 +173,8 @@ class HandshakeBrowser:
             logger.error(f"Failed to login: {str(e)}")
             return False
 
+        if self.config.settings.reuse_session:
+            self.save_session()
         return True
     
     def close(self):
@@ -106,17 +186,12 @@ class HandshakeBrowser:
         """Navigate to the jobs page by directly accessing the URL."""
         try:
             # Navigate to filtered search for full-time jobs
-            target_url = self.config['handshake']['filtered_search_url']
+            target_url = self.config.handshake.filtered_search_url
             logger.info(f"Navigating to {target_url}")
-            self.driver.get(target_url)
-            
-            # Wait to see if we can access the page
-            random_wait(1, 2)
+            self.open_url(target_url)
             
             # Wait for the jobs page to load
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, BUTTON_FILTER_CSS))
-            )
+            wait_for_element(self.driver, (By.CSS_SELECTOR, BUTTON_FILTER_CSS), timeout=7, baseline=(1, 2))
             
             # Log the current URL
             current_url = self.driver.current_url
@@ -133,26 +208,53 @@ class HandshakeBrowser:
             return False
     
     def search_job(self, job_title):
-        """Search for a job title in the search bar."""
+        """Search for a job title, loading the results URL directly unless typed search is configured."""
         if self.verbose_logging:
             logger.info(f"Searching for job: {job_title}")
+        settings = self.config.settings
+        if settings.search_mode == "url":
+            if self._search_job_by_url(job_title):
+                return True
+            if not settings.typed_search_fallback:
+                return False
+            logger.info("URL search failed, falling back to typing the job title")
+        return self._search_job_by_typing(job_title)
+    
+    def _search_job_by_url(self, job_title):
+        """Load the search results for job_title with a single driver.get."""
+        try:
+            search_url = build_search_url(self.config.handshake.filtered_search_url, job_title)
+            self.open_url(search_url)
+            
+            # Wait for search results to load
+            wait_for_element(self.driver, (By.CSS_SELECTOR, DIV_JOB_CARDS_CONTAINER_CSS), timeout=10, baseline=(2, 3))
+            
+            if self.verbose_logging:
+                logger.info(f"Successfully searched for job: {job_title}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to load search results: {str(e)}")
+            return False
+    
+    def _search_job_by_typing(self, job_title):
+        """Search for a job title by typing it into the search bar."""
         try:
             # Find the search input field
-            search_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, INPUT_JOBS_SEARCH_CSS))
-            )
+            search_input = wait_for_element(self.driver, (By.CSS_SELECTOR, INPUT_JOBS_SEARCH_CSS), timeout=10, baseline=(0, 0))
             
             # Clear any existing text using a more robust approach
             search_input.clear()
             # Select all text (Ctrl+A) and delete it
             search_input.send_keys(Keys.CONTROL + "a")
             search_input.send_keys(Keys.DELETE)
-            random_wait(1, 2)
+            pace(baseline=(1, 2))
             
-            # Type the job title character by character with random delays
+            # Type the job title character by character with a small jitter
+            typing_jitter = self.config.settings.typing_jitter
             for char in job_title:
                 search_input.send_keys(char)
-                random_wait(0.05, 0.15)
+                pace(typing_jitter, baseline=(0.05, 0.15))
             
             # Press Enter to submit the search
             search_input.send_keys(Keys.ENTER)
@@ -160,7 +262,7 @@ class HandshakeBrowser:
                 logger.info("Pressed Enter to submit the search")
             
             # Wait for search results to load
-            random_wait(2, 3)
+            wait_for_page_ready(self.driver, timeout=10, baseline=(2, 3))
             
             if self.verbose_logging:
                 logger.info(f"Successfully searched for job: {job_title}")
@@ -170,59 +272,57 @@ class HandshakeBrowser:
             logger.error(f"Failed to search for job: {str(e)}")
             return False
     
-    def get_job_urls(self):
-        """Get URLs of all job cards in the search results."""
+    def get_job_cards(self):
+        """Get the URL and card metadata of all job cards in the search results."""
         if self.verbose_logging:
-            logger.info("Retrieving URLs for all job cards on the current page")
+            logger.info("Retrieving all job cards on the current page")
         try:
             # Wait for job cards to be present
-            random_wait(2, 3)
+            wait_for_element(self.driver, (By.CSS_SELECTOR, DIV_JOB_CARDS_CONTAINER_CSS), timeout=10, baseline=(2, 3))
             
-            # Find all job cards - using constants
-            job_cards_container = self.driver.find_element(By.CSS_SELECTOR, DIV_JOB_CARDS_CONTAINER_CSS)
-            job_links = job_cards_container.find_elements(By.CSS_SELECTOR, JOB_CARD_LINK_CSS)
+            # Read every card in a single script call
+            job_cards = extract_job_cards(self.driver)
             
-            if not job_links:
+            if not job_cards:
                 logger.warning("No job cards found")
                 return []
             
-            # Extract URLs from all job cards
-            job_urls = []
-            for link in job_links:
-                url = link.get_attribute('href')
-                if url:
-                    job_urls.append(url)
-            
             if self.verbose_logging:
-                logger.info(f"Successfully retrieved {len(job_urls)} job URLs")
-            return job_urls
+                logger.info(f"Successfully retrieved {len(job_cards)} job cards")
+            return job_cards
             
         except Exception as e:
-            logger.error(f"Failed to retrieve job URLs: {str(e)}")
+            logger.error(f"Failed to retrieve job cards: {str(e)}")
             return []
     
+    def get_job_urls(self):
+        """Get URLs of all job cards in the search results."""
+        return [job_card.url for job_card in self.get_job_cards()]
+    
     def apply_to_job(self):
         """Apply to the job."""
         try:
-            # Check for "Apply Externally" button
+            # Wait for whichever of the "Apply Externally" or the regular Apply button renders first;
+            # internal postings used to sit out a fixed 5s timeout on the external button here
+            external, apply_button = False, None
             try:
-                external_button = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, XPATH_APPLY_EXTERNALLY_BUTTON))
-                )
+                wait_for_element(self.driver, (By.XPATH, f"{XPATH_APPLY_EXTERNALLY_BUTTON} | {XPATH_APPLY_BUTTON}"), timeout=5, baseline=(5, 5))
+                external = bool(self.driver.find_elements(By.XPATH, XPATH_APPLY_EXTERNALLY_BUTTON))
+                if not external:
+                    # The Apply button has rendered; give it a moment to become clickable
+                    apply_button = wait_for_element(self.driver, (By.XPATH, XPATH_APPLY_BUTTON), timeout=3, clickable=True, baseline=(0, 0))
+            except:
+                pass
+            
+            # Check for "Apply Externally" button
+            if external:
                 if self.verbose_logging:
                     logger.info("External application required - skipping 🔗")
                 log_application(self.driver, self.verbose_logging, status="external application")
                 return False, "🔗 external application"
-            except:
-                pass
                 
             # Check if there's no Apply button which indicates we've already applied
-            try:
-                # Try to find the Apply button with a short timeout
-                apply_button = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, XPATH_APPLY_BUTTON))
-                )
-            except:
+            if apply_button is None:
                 # If no Apply button is found, we've likely already applied
                 log_application(self.driver, self.verbose_logging, status="already applied")
                 if self.verbose_logging:
@@ -231,13 +331,18 @@ class HandshakeBrowser:
             
             # If we get here, the Apply button exists
             
-            random_wait(0,1)
+            pace(baseline=(0, 1))
             
             apply_button.click()
             if self.verbose_logging:
                 logger.info("Clicked Apply button")
             
-            random_wait(1, 2)
+            # Wait for the apply modal to open
+            try:
+                wait_for_element(self.driver, (By.CSS_SELECTOR, APPLY_MODAL_CONTENT_CSS), timeout=5, baseline=(1, 2))
+            except:
+                if self.verbose_logging:
+                    logger.info("Apply modal not detected, filling the form anyway")
             
             # Fill out the application form
             self._fill_application_form()
@@ -247,26 +352,32 @@ class HandshakeBrowser:
                 EC.element_to_be_clickable((By.XPATH, XPATH_SUBMIT_APPLICATION_BUTTON))
             )
             
-            # Random wait before clicking
-            random_wait()
+            # Short jitter before clicking
+            pace()
             
+            # From here a crash leaves the application's outcome unknown until it is logged
+            checkpoint = get_checkpoint()
+            if checkpoint:
+                checkpoint.job_submitting()
+            limiter = get_rate_limiter()
+            limiter.acquire()
+            submitted_at = time.monotonic()
             submit_button.click()
             if self.verbose_logging:
                 logger.info("Clicked Submit Application button")
-            
-            random_wait(1, 2)
 
             try:
                 # Check if the apply modal is no longer present, which indicates success
-                try:
-                    WebDriverWait(self.driver, 5).until_not(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, APPLY_MODAL_CONTENT_CSS))
-                    )
+                modal_closed = wait_for_element_gone(self.driver, (By.CSS_SELECTOR, APPLY_MODAL_CONTENT_CSS), timeout=7, baseline=(1, 2))
+                if modal_closed:
+                    # A modal left open is a form-validation result, not server latency, so only closes are timed
+                    limiter.record(time.monotonic() - submitted_at)
                     if self.verbose_logging:
                         logger.info("Application successful - apply modal closed")
+                    get_answer_engine().remember(self.form_answers)
                     log_application(self.driver, self.verbose_logging, status="applied")
                     return True, "✅ applied"
-                except:
+                else:
                     if self.verbose_logging:
                         logger.info("Apply modal still present - application may not have completed")
                     log_application(self.driver, self.verbose_logging, status="unanswered application questions")
@@ -283,87 +394,27 @@ class HandshakeBrowser:
             return False, "❌ error"
     
     def _fill_application_form(self):
-        """Fill out the application form."""
+        """Fill out the application form from a single introspection of its fields."""
         if self.verbose_logging:
             logger.info("Filling out application form")
         try:
-            # Upload resume if needed
-            try:
-                resume_button = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.XPATH, XPATH_RESUME_BUTTON))
-                )
-                resume_button.click()
-                if self.verbose_logging:
-                    logger.info("Selected resume")
-            except:
-                if self.verbose_logging:
-                    logger.info("No resume selection needed or already selected")
-            
-            # Upload cover letter if needed
-            try:
-                coverletter_button = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.XPATH, XPATH_COVERLETTER_BUTTON))
-                )
-                coverletter_button.click()
-                if self.verbose_logging:
-                    logger.info("Selected cover letter")
-            except:
-                if self.verbose_logging:
-                    logger.info("No cover letter selection needed or already selected")
+            # Let the modal finish rendering, then read every required field and document button in one script call
+            wait_for_page_ready(self.driver, timeout=5, baseline=(0, 0))
+            manifest = read_form_manifest(self.driver)
+            if self.verbose_logging:
+                logger.info(f"Found {len(manifest.fields)} required fields and {len(manifest.documents)} document buttons")
             
-            # Upload transcript if needed
-            try:
-                transcript_button = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.XPATH, XPATH_TRANSCRIPT_BUTTON))
-                )
-                transcript_button.click()
-                if self.verbose_logging:
-                    logger.info("Selected transcript")
-            except:
-                if self.verbose_logging:
-                    logger.info("No transcript selection needed or already selected")
-            
-            # Find and fill required fields
-            required_fields = self.driver.find_elements(By.CSS_SELECTOR, DIV_REQUIRED_FIELD_CSS)
-            
-            for field in required_fields:
-                # Check for dropdowns
-                dropdowns = field.find_elements(By.CSS_SELECTOR, SELECT_DROPDOWN_CSS)
-                if dropdowns:
-                    for dropdown in dropdowns:
-                        # Select the second option (index 1) to avoid the default "Select an option"
-                        options = dropdown.find_elements(By.TAG_NAME, TAG_OPTION)
-                        if len(options) > 1:
-                            options[1].click()
-                            if self.verbose_logging:
-                                logger.info("Selected dropdown option")
-                
-                # Check for text inputs
-                text_inputs = field.find_elements(By.CSS_SELECTOR, INPUT_TEXT_CSS)
-                if text_inputs:
-                    for text_input in text_inputs:
-                        if text_input.get_attribute("value") == "":
-                            text_input.send_keys("Yes")
-                            if self.verbose_logging:
-                                logger.info("Filled text input")
-                
-                # Check for radio buttons
-                radio_buttons = field.find_elements(By.CSS_SELECTOR, INPUT_RADIO_CSS)
-                if radio_buttons:
-                    # Click the first radio button
-                    radio_buttons[0].click()
-                    if self.verbose_logging:
-                        logger.info("Selected radio button")
-                
-                # Check for checkboxes
-                checkboxes = field.find_elements(By.CSS_SELECTOR, INPUT_CHECKBOX_CSS)
-                if checkboxes:
-                    # Click the checkbox
-                    checkboxes[0].click()
-                    if self.verbose_logging:
-                        logger.info("Selected checkbox")
+            # Plan the answers from configured rules and past submissions, then apply all of them in one more script call
+            self.form_answers = []
+            get_answer_engine().record_supplied(manifest, self.form_answers)
+            actions = plan_form_fill(manifest, answer_for=get_answer_engine().answerer(self.form_answers))
+            completed = fill_form(self.driver, actions)
             
             if self.verbose_logging:
+                for action in completed:
+                    logger.info(action.description)
+                if len(completed) < len(actions):
+                    logger.info(f"{len(actions) - len(completed)} form actions could not be applied")
                 logger.info("Completed filling out application form")
             return True
             
@@ -371,49 +422,25 @@ class HandshakeBrowser:
             logger.error(f"Failed to fill application form: {str(e)}")
             return False
 
-    def navigate_to_next_page(self, current_url):
-        """Navigate to the next page of job results."""
+    def get_result_count(self):
+        """Read how many postings the current search matched from the results header, or None."""
+        try:
+            return parse_result_count(self.driver.execute_script(RESULT_COUNT_SCRIPT, RESULTS_COUNT_CSS))
+        except Exception as e:
+            logger.warning(f"Could not read the result count: {str(e)}")
+            return None
+
+    def open_results_page(self, page_url):
+        """Load a results page that is known to exist and return its job cards."""
         if self.verbose_logging:
-            logger.info("Navigating to the next page of job results")
+            logger.info(f"Navigating to results page: {page_url}")
         try:
-            # Check if there's a page parameter
-            if "page=" in current_url:
-                # Extract current page number
-                current_page = int(current_url.split("page=")[1].split("&")[0])
-                # Create URL for next page
-                next_page = current_page + 1
-                next_url = current_url.replace(f"page={current_page}", f"page={next_page}")
-            else:
-                # If no page parameter exists, add it
-                if "?" in current_url:
-                    next_url = current_url + "&page=2"
-                else:
-                    next_url = current_url + "?page=2"
-            
-            # Navigate to next page
-            logger.info(f"Navigating to next page: {next_url}")
-            self.driver.get(next_url)
-            
-            # Wait for page to load
-            random_wait(2, 3)
-            
-            # Check if there are job cards on this page
-            try:
-                job_cards_container = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, DIV_JOB_CARDS_CONTAINER_CSS))
-                )
-                job_links = job_cards_container.find_elements(By.CSS_SELECTOR, JOB_CARD_LINK_CSS)
-                
-                if job_links:
-                    logger.info(f"Successfully navigated to next page with {len(job_links)} job cards")
-                    return True
-                else:
-                    logger.info("No job cards found on next page")
-                    return False
-            except:
-                logger.info("No job cards found on next page")
-                return False
-            
+            self.open_url(page_url)
+            return self.get_job_cards()
         except Exception as e:
-            logger.error(f"Failed to navigate to next page: {str(e)}")
-            return False
+            logger.error(f"Failed to navigate to results page: {str(e)}")
+            return []
+
+    def navigate_to_next_page(self, current_url):
+        """Navigate to the next page of job results, returning False when it has no job cards."""
+        return bool(self.open_results_page(next_page_url(current_url)))
@@ -0,0 +1,54 @@
+"""
+Chrome launch profiles for the Handshake Job Bot.
+
+A profile from config.json's "browser_profiles" decides whether Chrome runs
+headless, whether images load, which analytics and third-party URLs are
+blocked through the DevTools protocol, the page-load strategy, and whether a
+persistent user-data directory is reused between runs.
+"""
+import os
+
+from selenium.webdriver.chrome.options import Options
+
+from settings import PROJECT_ROOT
+
+def resolve_user_data_dir(profile, instance_name=None):
+    """Absolute user-data directory for the profile, one per browser instance, or None."""
+    if not profile.user_data_dir:
+        return None
+    user_data_dir = profile.user_data_dir
+    if not os.path.isabs(user_data_dir):
+        user_data_dir = os.path.join(PROJECT_ROOT, user_data_dir)
+    if instance_name:
+        # Chrome locks a user-data directory, so parallel browsers each need their own
+        user_data_dir = os.path.join(user_data_dir, instance_name)
+    return user_data_dir
+
+def build_chrome_options(profile, instance_name=None):
+    """Build Chrome options for the given browser profile."""
+    chrome_options = Options()
+    if profile.headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--no-sandbox")
+
+    if profile.block_images:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    chrome_options.page_load_strategy = profile.page_load_strategy
+
+    user_data_dir = resolve_user_data_dir(profile, instance_name)
+    if user_data_dir:
+        os.makedirs(user_data_dir, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    return chrome_options
+
+def apply_request_blocking(driver, profile):
+    """Block the profile's URL patterns in the current tab through CDP."""
+    if not profile.blocked_url_patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(profile.blocked_url_patterns)})
@@ -0,0 +1,236 @@
+"""
+Asyncio Chrome DevTools Protocol client for the Handshake Job Bot.
+
+One websocket connection to the browser carries every tab: each tab is a
+target attached in flattened mode, so commands and events are routed by
+session id and many tabs (and isolated browser contexts) can be driven
+concurrently from a single event loop. Scripts are the same ones the
+Selenium backend passes to execute_script; they are wrapped in a function
+so that `arguments` and `return` behave the same way.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from urllib.request import urlopen
+
+from websockets.asyncio.client import connect
+
+from browser_profiles import resolve_user_data_dir
+from instrumentation import get_telemetry
+
+logger = logging.getLogger('handshake_job_bot')
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+POLL_INTERVAL = 0.1
+
+class CDPError(RuntimeError):
+    """Raised when a DevTools command fails or a script throws."""
+
+class CDPConnection:
+    """A browser-level DevTools websocket with command/response and event routing."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self._ids = itertools.count(1)
+        self._pending = {}
+        # (session_id, method) -> list of (predicate, future) waiting for that event
+        self._waiters = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def open(cls, ws_url):
+        return cls(await connect(ws_url, max_size=None, ping_interval=None))
+
+    async def _read(self):
+        try:
+            async for message in self.websocket:
+                data = json.loads(message)
+                if "id" in data:
+                    future = self._pending.pop(data["id"], None)
+                    if future and not future.done():
+                        if "error" in data:
+                            future.set_exception(CDPError(data["error"].get("message", str(data["error"]))))
+                        else:
+                            future.set_result(data.get("result", {}))
+                    continue
+                waiters = self._waiters.get((data.get("sessionId"), data.get("method")))
+                if not waiters:
+                    continue
+                for waiter in list(waiters):
+                    predicate, future = waiter
+                    if future.done():
+                        waiters.remove(waiter)
+                    elif predicate is None or predicate(data.get("params", {})):
+                        future.set_result(data.get("params", {}))
+                        waiters.remove(waiter)
+        except Exception as e:
+            logger.warning(f"DevTools connection closed: {str(e)}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("DevTools connection closed"))
+            self._pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        """Send a command and return its result."""
+        command_id = next(self._ids)
+        message = {"id": command_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        get_telemetry().add_commands()
+        await self.websocket.send(json.dumps(message))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(command_id, None)
+
+    def expect_event(self, method, session_id=None, predicate=None):
+        """Return a future for the next matching event; create it before sending the command that triggers it."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault((session_id, method), []).append((predicate, future))
+        return future
+
+    async def close(self):
+        await self.websocket.close()
+        self._reader.cancel()
+
+class CDPTab:
+    """One page target, attached to the shared connection through its own session."""
+
+    def __init__(self, connection, target_id, session_id, page_load_strategy="normal"):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.page_load_strategy = page_load_strategy
+
+    @classmethod
+    async def open(cls, connection, profile, browser_context_id=None):
+        params = {"url": "about:blank"}
+        if browser_context_id:
+            params["browserContextId"] = browser_context_id
+        target_id = (await connection.send("Target.createTarget", params))["targetId"]
+        session_id = (await connection.send("Target.attachToTarget", {"targetId": target_id, "flatten": True}))["sessionId"]
+        tab = cls(connection, target_id, session_id, profile.page_load_strategy)
+        await tab.send("Page.enable")
+        await tab.send("Runtime.enable")
+        if profile.blocked_url_patterns:
+            await tab.send("Network.enable")
+            await tab.send("Network.setBlockedURLs", {"urls": list(profile.blocked_url_patterns)})
+        return tab
+
+    async def send(self, method, params=None, timeout=30):
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    async def navigate(self, url, timeout=30):
+        """Load url and wait for the event matching the profile's page-load strategy."""
+        if self.page_load_strategy == "none":
+            await self.send("Page.navigate", {"url": url})
+            return
+        event = "Page.loadEventFired" if self.page_load_strategy == "normal" else "Page.domContentEventFired"
+        loaded = self.connection.expect_event(event, self.session_id)
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            loaded.cancel()
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        await asyncio.wait_for(loaded, timeout)
+
+    async def evaluate(self, script, *args, timeout=30):
+        """Run an execute_script-style script with arguments and return its JSON result."""
+        expression = f"(async function() {{\n{script}\n}}).apply(null, {json.dumps(list(args))})"
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": True,
+            "returnByValue": True,
+        }, timeout)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            description = details.get("exception", {}).get("description") or details.get("text")
+            raise CDPError(f"Script failed: {description}")
+        return result.get("result", {}).get("value")
+
+    async def wait_for(self, script, *args, timeout=10):
+        """Poll a script until it returns something truthy, returning that value or None on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                value = await self.evaluate(script, *args)
+            except CDPError:
+                # The page navigated away mid-evaluation; try again in the new document
+                value = None
+            if value or time.monotonic() >= deadline:
+                return value or None
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def current_url(self):
+        return await self.evaluate("return location.href;")
+
+    async def close(self):
+        try:
+            await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+        except CDPError:
+            pass
+
+def find_chrome_binary():
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise RuntimeError("No Chrome binary found on PATH for the CDP backend")
+
+async def launch_chrome(profile, instance_name=None, extra_args=(), timeout=20):
+    """Start Chrome with remote debugging on a free port, returning (process, websocket URL, temp dir or None)."""
+    user_data_dir = resolve_user_data_dir(profile, instance_name)
+    temp_dir = None
+    if not user_data_dir:
+        temp_dir = user_data_dir = tempfile.mkdtemp(prefix="hjb-cdp-")
+    os.makedirs(user_data_dir, exist_ok=True)
+    port_file = os.path.join(user_data_dir, "DevToolsActivePort")
+    if os.path.exists(port_file):
+        os.remove(port_file)
+
+    args = [
+        find_chrome_binary(),
+        "--remote-debugging-port=0",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-notifications",
+        "--no-sandbox",
+        "--window-size=1920,1080",
+    ]
+    if profile.headless:
+        args += ["--headless=new", "--disable-gpu"]
+    if profile.block_images:
+        args.append("--blink-settings=imagesEnabled=false")
+    args += list(extra_args)
+    args.append("about:blank")
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Chrome writes the chosen port and the browser's websocket path once it is listening
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(port_file):
+            with open(port_file, "r", encoding="utf-8") as f:
+                lines = f.read().split()
+            if len(lines) >= 2:
+                return process, f"ws://127.0.0.1:{lines[0]}{lines[1]}", temp_dir
+        if process.poll() is not None:
+            break
+        await asyncio.sleep(POLL_INTERVAL)
+    process.kill()
+    raise RuntimeError("Chrome did not start its DevTools endpoint")
+
+async def browser_websocket_url(debug_port):
+    """Return the browser websocket URL of a Chrome already running with --remote-debugging-port."""
+    def fetch():
+        with urlopen(f"http://127.0.0.1:{debug_port}/json/version", timeout=5) as response:
+            return json.load(response)["webSocketDebuggerUrl"]
+    return await asyncio.get_running_loop().run_in_executor(None, fetch)
@@ -0,0 +1,476 @@
+"""
+Asyncio DevTools backend for the Handshake Job Bot.
+
+AsyncHandshakeBrowser has the same methods as HandshakeBrowser (login,
+search_job, get_job_urls, apply_to_job, navigate_to_next_page, ...) as
+coroutines, and runs the same page scripts over the DevTools protocol
+instead of WebDriver. Every tab is an AsyncHandshakeBrowser on the shared
+connection, so run_cdp_bot can search in one tab while several others apply,
+all on one event loop. Select it with settings.browser_backend = "cdp".
+"""
+import asyncio
+import logging
+import os
+import random
+import shutil
+import time
+
+from cdp import CDPConnection, CDPTab, launch_chrome, browser_websocket_url
+from constants import *
+from settings import get_config
+from utils import build_search_url, next_page_url, log_job_details, log_job_lead
+from job_details import JOB_CARDS_SCRIPT, JOB_CARDS_ARGS, parse_job_cards, JOB_DETAILS_SCRIPT, JOB_DETAILS_ARGS, parse_job_details
+from application_form import FORM_MANIFEST_SCRIPT, FORM_MANIFEST_ARGS, parse_form_manifest, plan_form_fill, FORM_FILL_SCRIPT, form_fill_args
+from answers import get_answer_engine
+from session_store import get_session_store, cookie_params
+from discovery import WorkList, CardRules
+from workers import AppliedJobSet, WorkerStats
+from driver_provision import get_startup_timer
+from waits import NETWORK_IDLE_SCRIPT
+from instrumentation import instrument_methods, get_telemetry
+from pagination import Paginator, RESULT_COUNT_SCRIPT, parse_result_count
+from crawl_state import get_crawl_state
+from rate_limit import get_rate_limiter, RESPONSE_STATUS_SCRIPT, is_error_status
+from job_status import get_job_status_store
+from scoring import AsyncLeadQueue, get_application_cap
+
+logger = logging.getLogger('handshake_job_bot')
+
+# Finds an element by CSS selector or XPath; with clickable set it must also be visible and enabled
+FIND_ELEMENT_SCRIPT = """
+const [kind, selector, clickable] = arguments;
+const element = kind === 'xpath'
+    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(selector);
+if (!element) { return false; }
+if (!clickable) { return true; }
+const rect = element.getBoundingClientRect();
+return rect.width > 0 && rect.height > 0 && !element.disabled && !element.closest('button:disabled');
+"""
+
+CLICK_ELEMENT_SCRIPT = """
+const [kind, selector] = arguments;
+const element = kind === 'xpath'
+    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(selector);
+if (!element) { return false; }
+element.click();
+return true;
+"""
+
+# Sets an input's value through the native setter so the login form's scripts see it
+SET_VALUE_SCRIPT = """
+const [selector, value] = arguments;
+const element = document.querySelector(selector);
+if (!element) { return false; }
+Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value').set.call(element, value);
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+return true;
+"""
+
+# On a job page: "external", "apply" or null while neither button has rendered
+APPLY_STATE_SCRIPT = """
+const [externalXpath, applyXpath] = arguments;
+const find = xpath => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (find(externalXpath)) { return 'external'; }
+const apply = find(applyXpath);
+if (apply && apply.getBoundingClientRect().width > 0) { return 'apply'; }
+return null;
+"""
+
+@instrument_methods
+class AsyncHandshakeBrowser:
+    def __init__(self, connection, tab, profile_name, profile, owner=None, browser_context_id=None):
+        self.connection = connection
+        self.tab = tab
+        self.profile_name = profile_name
+        self.profile = profile
+        self.owner = owner
+        self.browser_context_id = browser_context_id
+        self.verbose_logging = self.config.settings.verbose_logging
+        self.form_answers = []
+        self.process = None
+        self.temp_dir = None
+
+    @classmethod
+    async def start(cls, profile_name=None, debug_port=None, extra_args=(), profile=None):
+        """Launch Chrome (or attach to one on debug_port) and open a first tab."""
+        config = get_config()
+        profile_name = profile_name or config.settings.browser_profile
+        profile = profile or config.get_browser_profile(profile_name)
+        process = temp_dir = None
+        if debug_port:
+            ws_url = await browser_websocket_url(debug_port)
+        else:
+            process, ws_url, temp_dir = await launch_chrome(profile, extra_args=extra_args)
+        connection = await CDPConnection.open(ws_url)
+        browser = cls(connection, await CDPTab.open(connection, profile), profile_name, profile)
+        browser.process = process
+        browser.temp_dir = temp_dir
+        return browser
+
+    async def new_tab(self, isolated=False):
+        """Open another tab on the same connection; isolated tabs get their own cookies (a separate session)."""
+        browser_context_id = None
+        if isolated:
+            browser_context_id = (await self.connection.send("Target.createBrowserContext"))["browserContextId"]
+        tab = await CDPTab.open(self.connection, self.profile, browser_context_id)
+        return AsyncHandshakeBrowser(self.connection, tab, self.profile_name, self.profile, owner=self, browser_context_id=browser_context_id)
+
+    @property
+    def config(self):
+        """The current configuration, re-read only when config.json changes."""
+        return get_config()
+
+    async def close(self):
+        """Close this tab, or the whole browser for the browser that started it."""
+        await self.tab.close()
+        if self.browser_context_id:
+            await self.connection.send("Target.disposeBrowserContext", {"browserContextId": self.browser_context_id})
+        if self.owner is not None:
+            return
+        await self.connection.close()
+        if self.process:
+            self.process.terminate()
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.process.wait, 10)
+            except Exception:
+                self.process.kill()
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def pace(self, max_jitter=None):
+        """Short random pause before clicks, like waits.pace."""
+        jitter = self.config.settings.pacing_jitter if max_jitter is None else max_jitter
+        if jitter > 0:
+            delay = random.uniform(0, jitter)
+            await asyncio.sleep(delay)
+            get_telemetry().add_wait(delay)
+
+    async def wait_for_element(self, kind, selector, timeout=10, clickable=False):
+        return bool(await self.tab.wait_for(FIND_ELEMENT_SCRIPT, kind, selector, clickable, timeout=timeout))
+
+    async def click(self, kind, selector):
+        return bool(await self.tab.evaluate(CLICK_ELEMENT_SCRIPT, kind, selector))
+
+    async def wait_for_page_ready(self, timeout=10):
+        return bool(await self.tab.wait_for(NETWORK_IDLE_SCRIPT, self.config.settings.network_idle_ms, timeout=timeout))
+
+    async def open_url(self, url):
+        """Load url in this tab within the shared rate limit."""
+        limiter = get_rate_limiter()
+        await limiter.acquire_async()
+        start = time.monotonic()
+        try:
+            await self.tab.navigate(url)
+        except Exception:
+            await limiter.record_async(time.monotonic() - start, error=True)
+            raise
+        if limiter.enabled:
+            try:
+                status = await self.tab.evaluate(RESPONSE_STATUS_SCRIPT)
+            except Exception:
+                status = 0
+            await limiter.record_async(time.monotonic() - start, error=is_error_status(status))
+        get_startup_timer().mark_first_page()
+
+    async def current_url(self):
+        return await self.tab.current_url()
+
+    async def save_session(self):
+        """Store the browser's cookies so later runs can skip the NetID login."""
+        try:
+            cookies = (await self.tab.send("Network.getAllCookies")).get("cookies", [])
+            if get_session_store().save(cookies) and self.verbose_logging:
+                logger.info(f"Saved session with {len(cookies)} cookies")
+        except Exception as e:
+            logger.warning(f"Could not save session: {str(e)}")
+
+    async def restore_session(self):
+        """Load saved cookies and check them with a single page load, returning True if still logged in."""
+        cookies = get_session_store().load()
+        if not cookies:
+            return False
+        try:
+            await self.tab.send("Network.setCookies", {"cookies": cookie_params(cookies)})
+            await self.open_url(self.config.handshake.filtered_search_url)
+            current_url = (await self.current_url()).lower()
+            if "login" in current_url or "postings" not in current_url:
+                logger.info("Saved session has expired")
+                await self.tab.send("Network.clearBrowserCookies")
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Could not restore session: {str(e)}")
+            return False
+
+    async def login(self):
+        """Login to Handshake, reusing a saved session when it is still valid, otherwise with UW NetID."""
+        if self.config.settings.reuse_session and await self.restore_session():
+            logger.info("Restored saved Handshake session, skipping login")
+            return True
+
+        logger.info("Logging into Handshake...")
+        try:
+            await self.open_url(self.config.handshake.login_url)
+            if not await self.wait_for_element("xpath", XPATH_NETID_LOGIN, timeout=10, clickable=True):
+                raise RuntimeError("NetID login button not found")
+            await self.pace()
+            await self.click("xpath", XPATH_NETID_LOGIN)
+
+            if not await self.wait_for_element("css", f"#{ID_USERNAME}", timeout=10):
+                raise RuntimeError("NetID login page did not load")
+            await self.tab.evaluate(SET_VALUE_SCRIPT, f"#{ID_USERNAME}", os.environ.get('HANDSHAKE_NETID') or "")
+            await self.tab.evaluate(SET_VALUE_SCRIPT, f"#{ID_PASSWORD}", os.environ.get('HANDSHAKE_PASSWORD') or "")
+            await self.pace()
+            await self.click("css", f"[name='{NAME_LOGIN_BUTTON}']")
+
+            url_script = "return location.href.includes(arguments[0]);"
+            if not await self.tab.wait_for(url_script, "joinhandshake.com", timeout=15):
+                raise RuntimeError("Not redirected to Handshake after login")
+            logger.info("Successfully logged into Handshake")
+        except Exception as e:
+            logger.error(f"Failed to login: {str(e)}")
+            return False
+
+        if self.config.settings.reuse_session:
+            await self.save_session()
+        return True
+
+    async def navigate_to_jobs(self):
+        """Navigate to the filtered job search."""
+        try:
+            await self.open_url(self.config.handshake.filtered_search_url)
+            await self.wait_for_element("css", BUTTON_FILTER_CSS, timeout=7)
+            return "postings" in (await self.current_url()).lower()
+        except Exception as e:
+            logger.error(f"Failed to navigate to jobs page: {str(e)}")
+            return False
+
+    async def search_job(self, job_title):
+        """Load the search results for job_title directly from the filtered search URL."""
+        if self.verbose_logging:
+            logger.info(f"Searching for job: {job_title}")
+        try:
+            await self.open_url(build_search_url(self.config.handshake.filtered_search_url, job_title))
+            return await self.wait_for_element("css", DIV_JOB_CARDS_CONTAINER_CSS, timeout=10)
+        except Exception as e:
+            logger.error(f"Failed to load search results: {str(e)}")
+            return False
+
+    async def get_job_cards(self):
+        """Get the URL and card metadata of all job cards in the search results."""
+        try:
+            await self.wait_for_element("css", DIV_JOB_CARDS_CONTAINER_CSS, timeout=10)
+            return parse_job_cards(await self.tab.evaluate(JOB_CARDS_SCRIPT, *JOB_CARDS_ARGS)) or []
+        except Exception as e:
+            logger.error(f"Failed to get job URLs: {str(e)}")
+            return []
+
+    async def get_job_urls(self):
+        """Get URLs of all job cards in the search results."""
+        return [job_card.url for job_card in await self.get_job_cards()]
+
+    async def log_application(self, status):
+        """Read the posting's details in one script call and append them to the application log."""
+        try:
+            result = await self.tab.evaluate(JOB_DETAILS_SCRIPT, *JOB_DETAILS_ARGS) or {}
+            details = parse_job_details(result, result.get("url") or await self.current_url())
+            await asyncio.get_running_loop().run_in_executor(None, log_job_details, details, status, self.verbose_logging)
+        except Exception as e:
+            logger.error(f"Failed to save application details: {str(e)}")
+
+    async def apply_to_job(self):
+        """Apply to the job open in this tab."""
+        try:
+            # Wait for whichever of the external or the regular apply button renders first
+            state = await self.tab.wait_for(APPLY_STATE_SCRIPT, XPATH_APPLY_EXTERNALLY_BUTTON, XPATH_APPLY_BUTTON, timeout=5)
+            if state == "external":
+                await self.log_application("external application")
+                return False, "🔗 external application"
+            if state != "apply":
+                await self.log_application("already applied")
+                return True, "🏎️  already applied"
+
+            await self.pace()
+            await self.click("xpath", XPATH_APPLY_BUTTON)
+            if not await self.wait_for_element("css", APPLY_MODAL_CONTENT_CSS, timeout=5) and self.verbose_logging:
+                logger.info("Apply modal not detected, filling the form anyway")
+
+            await self._fill_application_form()
+
+            if not await self.wait_for_element("xpath", XPATH_SUBMIT_APPLICATION_BUTTON, timeout=4, clickable=True):
+                raise RuntimeError("Submit Application button not found")
+            await self.pace()
+            limiter = get_rate_limiter()
+            await limiter.acquire_async()
+            submitted_at = time.monotonic()
+            await self.click("xpath", XPATH_SUBMIT_APPLICATION_BUTTON)
+
+            gone_script = "return !document.querySelector(arguments[0]);"
+            modal_closed = await self.tab.wait_for(gone_script, APPLY_MODAL_CONTENT_CSS, timeout=7)
+            if modal_closed:
+                # A modal left open is a form-validation result, not server latency, so only closes are timed
+                await limiter.record_async(time.monotonic() - submitted_at)
+                get_answer_engine().remember(self.form_answers)
+                await self.log_application("applied")
+                return True, "✅ applied"
+            await self.log_application("unanswered application questions")
+            return False, "❌ unanswered questions"
+        except Exception as e:
+            logger.error(f"Failed to apply to job: {str(e)}")
+            return False, "❌ error"
+
+    async def _fill_application_form(self):
+        """Fill out the application form from a single introspection of its fields."""
+        try:
+            await self.wait_for_page_ready(timeout=5)
+            manifest = parse_form_manifest(await self.tab.evaluate(FORM_MANIFEST_SCRIPT, *FORM_MANIFEST_ARGS))
+            self.form_answers = []
+            get_answer_engine().record_supplied(manifest, self.form_answers)
+            actions = plan_form_fill(manifest, answer_for=get_answer_engine().answerer(self.form_answers))
+            if actions:
+                await self.tab.evaluate(FORM_FILL_SCRIPT, *form_fill_args(actions))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to fill application form: {str(e)}")
+            return False
+
+    async def get_result_count(self):
+        """Read how many postings the current search matched from the results header, or None."""
+        try:
+            return parse_result_count(await self.tab.evaluate(RESULT_COUNT_SCRIPT, RESULTS_COUNT_CSS))
+        except Exception as e:
+            logger.warning(f"Could not read the result count: {str(e)}")
+            return None
+
+    async def open_results_page(self, page_url):
+        """Load a results page that is known to exist and return its job cards."""
+        try:
+            await self.open_url(page_url)
+            return await self.get_job_cards()
+        except Exception as e:
+            logger.error(f"Failed to navigate to results page: {str(e)}")
+            return []
+
+    async def navigate_to_next_page(self, current_url):
+        """Navigate to the next page of job results, returning False when it has no job cards."""
+        return bool(await self.open_results_page(next_page_url(current_url)))
+
+async def discover_titles(browser, job_titles, work_list, job_queue, max_pages=None):
+    """Search each title in browser's tab, queueing every newly discovered job from its pages within the page budget."""
+    for index, job_title in enumerate(job_titles):
+        if index and not get_rate_limiter().enabled:
+            await asyncio.sleep(random.uniform(3, 5))
+        logger.info(f"Searching for job title: {job_title}")
+        with get_telemetry().title(job_title):
+            if not await browser.search_job(job_title):
+                logger.error(f"Failed to search for job title: {job_title}. Skipping to next job title.")
+                continue
+
+            job_cards = await browser.get_job_cards()
+            if not job_cards:
+                continue
+            budget = max_pages or browser.config.job_search.page_budget(job_title)
+            paginator = Paginator.from_first_page(await browser.current_url(), len(job_cards), await browser.get_result_count(), budget)
+            crawl_state = get_crawl_state()
+            incremental = crawl_state.active
+            if incremental:
+                crawl_state.advance(paginator.url, job_cards, job_title)
+            page_number = paginator.first_page
+            while job_cards:
+                new_leads = 0
+                for job_card in job_cards:
+                    lead = work_list.add(job_card, job_title)
+                    if lead:
+                        new_leads += 1
+                        job_queue.put_nowait(lead)
+                logger.info(f"Found {len(job_cards)} job URLs on page {page_number}, {new_leads} new")
+                if not paginator.has_next(page_number, len(job_cards)):
+                    break
+                if incremental and crawl_state.reached(paginator.url, job_cards):
+                    logger.info(f"Page {page_number} reaches postings seen in an earlier run, not reading further pages")
+                    crawl_state.record_early_stop(paginator.last_page - page_number)
+                    break
+                page_number += 1
+                job_cards = await browser.open_results_page(paginator.url_for(page_number))
+
+async def apply_from_queue(browser, stats, job_queue, applied_jobs, card_rules):
+    """Apply to queued jobs in browser's tab until a None sentinel arrives."""
+    application_cap = get_application_cap()
+    status_store = get_job_status_store()
+    while True:
+        lead = await job_queue.get()
+        if lead is None:
+            return
+        try:
+            if lead.job_id and not applied_jobs.claim(lead.job_id):
+                stats.skipped += 1
+                continue
+            skip_reason = card_rules.skip_reason(lead)
+            if skip_reason:
+                if skip_reason == "external application":
+                    log_job_lead(lead, skip_reason)
+                    status_store.record(lead.job_id, skip_reason)
+                stats.skipped += 1
+                continue
+
+            if not application_cap.start():
+                stats.skipped += 1
+                continue
+
+            status_store.start(lead.job_id)
+            status = None
+            try:
+                with get_telemetry().title(lead.search_title):
+                    await browser.open_url(lead.url)
+                    await browser.wait_for_page_ready(timeout=10)
+                    application_successful, status = await browser.apply_to_job()
+            finally:
+                application_cap.finish(status)
+            status_store.record(lead.job_id, status)
+            stats.record(status)
+            logger.info(f"Tab {stats.worker_id} job #{stats.processed}: {status}")
+            if not get_rate_limiter().enabled:
+                await asyncio.sleep(random.uniform(2, 3))
+        except Exception as e:
+            logger.error(f"Tab {stats.worker_id} failed on {lead.url}: {str(e)}")
+
+async def run_cdp_bot(job_titles, tabs=1, profile_name=None, debug_port=None, applied_job_ids=None, card_rules=None, max_pages=None):
+    """Search in one tab while `tabs` tabs apply to the discovered jobs, all on one event loop."""
+    card_rules = card_rules or CardRules.from_config()
+    applied_jobs = AppliedJobSet(applied_job_ids)
+    browser = await AsyncHandshakeBrowser.start(profile_name, debug_port)
+    tab_stats = []
+    try:
+        # A Chrome we attached to is already logged in
+        if not debug_port and not await browser.login():
+            logger.error("Login failed. Exiting...")
+            return tab_stats
+
+        job_queue = AsyncLeadQueue()
+        apply_tabs = [await browser.new_tab() for _ in range(max(tabs, 1))]
+        tab_stats = [WorkerStats(tab_id) for tab_id in range(1, len(apply_tabs) + 1)]
+        appliers = [
+            asyncio.create_task(apply_from_queue(tab, stats, job_queue, applied_jobs, card_rules))
+            for tab, stats in zip(apply_tabs, tab_stats)
+        ]
+        logger.info(f"CDP backend: searching in one tab, applying in {len(apply_tabs)}")
+
+        work_list = WorkList()
+        try:
+            await discover_titles(browser, job_titles, work_list, job_queue, max_pages)
+            logger.info(f"Discovered {len(work_list)} unique jobs from {work_list.listings} listings")
+        finally:
+            for _ in appliers:
+                job_queue.put_nowait(None)
+            await asyncio.gather(*appliers, return_exceptions=True)
+            for tab in apply_tabs:
+                await tab.close()
+
+        for stats in tab_stats:
+            logger.info(stats.summary())
+        return tab_stats
+    finally:
+        await browser.close()
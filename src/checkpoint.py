@@ -0,0 +1,162 @@
+"""
+Crash-safe run checkpoint for the Handshake Job Bot.
+
+While the bot runs, .cache/run_checkpoint.json records where it is: the title
+and results page being searched, the jobs discovered so far, the position in
+the apply queue and the job in flight (opened, or with its application being
+submitted). Every update replaces the file atomically, so a crash leaves
+either the previous or the new state. `--resume` continues from it: discovery
+picks up at the interrupted title and page, applying at the interrupted job.
+The job in flight is first checked against the job status store: it counts
+as finished only if an outcome was recorded for it after it was opened, and is
+revisited otherwise (the job page itself then shows whether an interrupted
+submit went through).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict
+
+from constants import RUN_CHECKPOINT_PATH
+from settings import PROJECT_ROOT
+from job_status import get_job_status_store, INCOMPLETE
+
+logger = logging.getLogger('handshake_job_bot')
+
+DISCOVERY = "discovery"
+APPLY = "apply"
+
+class RunCheckpoint:
+    def __init__(self, path=None, state=None):
+        self.path = path or os.path.join(PROJECT_ROOT, RUN_CHECKPOINT_PATH)
+        self.state = state or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None):
+        """Return the checkpoint of an interrupted run, or None if the last run finished."""
+        checkpoint = cls(path)
+        try:
+            with open(checkpoint.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(state, dict) or state.get("stage") not in (DISCOVERY, APPLY):
+            return None
+        checkpoint.state = state
+        return checkpoint
+
+    # Reading
+
+    @property
+    def stage(self):
+        return self.state.get("stage")
+
+    @property
+    def titles(self):
+        return self.state.get("titles", [])
+
+    @property
+    def title_index(self):
+        return self.state.get("title_index", 0)
+
+    @property
+    def page(self):
+        """The results page to continue the interrupted title from."""
+        return self.state.get("page", 1)
+
+    @property
+    def position(self):
+        """Index in the work list of the first job that was not finished."""
+        return self.state.get("position", 0)
+
+    @property
+    def in_flight(self):
+        return self.state.get("in_flight")
+
+    def leads(self):
+        from discovery import JobLead
+        return [JobLead(**lead) for lead in self.state.get("leads", [])]
+
+    def describe(self):
+        if self.stage == DISCOVERY:
+            titles = self.titles
+            title = titles[self.title_index] if self.title_index < len(titles) else "?"
+            return f"searching '{title}' (title {self.title_index + 1} of {len(titles)}), page {self.page}, {len(self.state.get('leads', []))} jobs found"
+        return f"applying, job {self.position + 1} of {len(self.state.get('leads', []))}"
+
+    # Writing
+
+    def _write(self, **changes):
+        with self._lock:
+            self.state.update(changes, updated_at=time.strftime("%Y-%m-%d_%H-%M-%S"))
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = self.path + ".tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.state, f, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write run checkpoint: {str(e)}")
+
+    def start_discovery(self, titles):
+        self.state = {"started_at": time.strftime("%Y-%m-%d_%H-%M-%S")}
+        self._write(stage=DISCOVERY, titles=list(titles), title_index=0, page=1, leads=[])
+
+    def discovery_progress(self, title_index, next_page, work_list):
+        """Record that discovery has read every page of title_index before next_page."""
+        self._write(title_index=title_index, page=next_page, leads=[asdict(lead) for lead in work_list])
+
+    def start_apply(self, job_leads, position=0):
+        self._write(stage=APPLY, leads=[asdict(lead) for lead in job_leads], position=position, in_flight=None)
+
+    def job_started(self, position, lead):
+        self._write(position=position, in_flight={"url": lead.url, "job_id": lead.job_id, "step": "opened",
+                                                  "started_at": round(time.time(), 1)})
+
+    def job_submitting(self):
+        """Mark the in-flight job as possibly submitted: its outcome is unknown until it is logged."""
+        if self.in_flight:
+            self._write(in_flight=dict(self.in_flight, step="submitting"))
+
+    def job_finished(self, position):
+        self._write(position=position + 1, in_flight=None)
+
+    def clear(self):
+        """Remove the checkpoint once the run has finished."""
+        with self._lock:
+            self.state = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def reconcile_in_flight(self):
+        """Settle the job that was in flight when the run stopped; returns the position to continue from."""
+        in_flight = self.in_flight
+        if not in_flight:
+            return self.position
+        job_id = in_flight.get("job_id")
+        status = get_job_status_store().get(job_id) if job_id else None
+        # The status store rounds last_attempt like started_at, so an attempt started after it never compares below
+        if status is not None and status.outcome != INCOMPLETE and status.last_attempt >= in_flight.get("started_at", 0):
+            logger.info(f"Interrupted job {job_id} already has an outcome ({status.outcome}), continuing after it")
+            self._write(position=self.position + 1, in_flight=None)
+        elif in_flight.get("step") == "submitting":
+            logger.info(f"Interrupted job {job_id or in_flight.get('url')} may have been submitted, revisiting it to check")
+        return self.position
+
+_current = None
+
+def get_checkpoint():
+    """Return the current run's checkpoint, or None when checkpointing is off."""
+    return _current
+
+def set_checkpoint(checkpoint):
+    global _current
+    _current = checkpoint
+    return checkpoint
@@ -10,13 +10,48 @@ BUTTON_CLOSE_MODAL_CSS = "button[aria-label='Close modal'][data-hook='close-boot
 # Navigation
 BUTTON_FILTER_CSS = "button[data-hook='button'][aria-label='Filter by']"
 INPUT_JOBS_SEARCH_CSS = "input[aria-label='Jobs or employers']"
+SEARCH_QUERY_PARAM = "query"
 
 # Job cards
 DIV_JOB_CARDS_CONTAINER_CSS = "div.style__cards___hgLkO"
+RESULTS_COUNT_CSS = "span.style__results-count___KL5Ga"
 JOB_CARD_LINK_CSS = "a.style__card___LCqKH"
 
-# Application log selectors
-APPLICATIONS_LOG_PATH = "logs/applications_log.json"
+# Job card metadata, tried in order inside each card link
+CARD_TITLE_SELECTORS = [
+    "[data-hook='jobs-card-title']",
+    "div[class*='title']",
+    "h3"
+]
+CARD_EMPLOYER_SELECTORS = [
+    "[data-hook='jobs-card-employer']",
+    "div[class*='employer']",
+    "span[class*='employer']"
+]
+CARD_LOCATION_SELECTORS = [
+    "[data-hook='jobs-card-location']",
+    "div[class*='location']"
+]
+CARD_POSTED_SELECTORS = [
+    "[data-hook='jobs-card-posted']",
+    "div[class*='posted']",
+    "time"
+]
+CARD_EXTERNAL_APPLY_TEXT = "apply externally"
+
+# Application log paths (relative to the project root)
+APPLICATIONS_LOG_PATH = "logs/applications_log.jsonl"
+APPLICATIONS_INDEX_PATH = "logs/applications_index.txt"
+LEGACY_APPLICATIONS_LOG_PATH = "logs/applications_log.json"
+DRIVER_CACHE_PATH = ".cache/chromedriver.json"
+SESSION_STORE_PATH = ".cache/session.bin"
+ANSWERS_CACHE_PATH = "logs/answers_cache.jsonl"
+RUN_REPORTS_DIR = "logs/run_reports"
+CRAWL_STATE_PATH = ".cache/crawl_state.json"
+RUN_CHECKPOINT_PATH = ".cache/run_checkpoint.json"
+RATE_LIMIT_STATE_PATH = ".cache/rate_limit.json"
+JOB_STATUS_PATH = ".cache/job_status.jsonl"
+ANALYTICS_DB_PATH = ".cache/analytics.sqlite3"
 
 # Job title selectors
 JOB_TITLE_SELECTORS = [
@@ -36,12 +71,19 @@ EMPLOYER_NAME_SELECTORS = [
     "a[href*='/stu/employers/'] div"
 ]
 
+# Job detail icons: the SVG path prefixes that mark the location and job type rows
+LOCATION_SVG_PATH_PREFIX = "M12 21.75"
+EMPLOYMENT_TYPE_SVG_PATH_PREFIX = "M8.50029 16.75"
+LOCATION_KEYWORDS = ["onsite", "remote", "hybrid", "united states"]
+EMPLOYMENT_TYPE_KEYWORDS = ["full-time", "part-time", "internship"]
+
 # Application
 # DIV_APPLICATION_FORM_CSS = "div.style__application-form__1Mz_K"
 # DIV_SUCCESS_CARD_CSS = "div.style__success-card__1aTrY"
 DIV_REQUIRED_FIELD_CSS = "div.style__required__1Xkbq"
 SELECT_DROPDOWN_CSS = "select"
 INPUT_TEXT_CSS = "input[type='text']"
+TEXTAREA_CSS = "textarea"
 INPUT_RADIO_CSS = "input[type='radio']"
 INPUT_CHECKBOX_CSS = "input[type='checkbox']"
 # BUTTON_DISMISS_CSS = "button.style__dismiss___Zotdc"
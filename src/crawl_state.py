@@ -0,0 +1,124 @@
+"""
+Incremental crawl state for the Handshake Job Bot.
+
+Search results are sorted newest first, so on repeat runs everything past the
+newest posting seen last time has already been handled. For each search (its
+title and filters, i.e. the results URL without its page parameters) the
+crawl state keeps a high-water mark: the highest job ID seen and when the
+search was last crawled. In incremental mode, pagination stops after the
+first page that reaches the mark or holds only jobs that are not due for a
+visit, so a run every few minutes costs one page load per title. Marks are
+only saved at the end of a run, after the jobs they cover have been handled.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from constants import CRAWL_STATE_PATH
+from settings import PROJECT_ROOT, get_config
+from log_store import extract_job_id
+from job_status import get_job_status_store
+from pagination import PAGE_PARAM, PER_PAGE_PARAM
+
+logger = logging.getLogger('handshake_job_bot')
+
+def search_key(results_url):
+    """Identify a search by its path and every query parameter except the page ones."""
+    parts = urlsplit(results_url)
+    params = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if key not in (PAGE_PARAM, PER_PAGE_PARAM))
+    return f"{parts.path}?{urlencode(params)}"
+
+def _numeric_ids(job_cards):
+    return [int(job_id) for job_id in (extract_job_id(job_card.url) for job_card in job_cards) if job_id]
+
+class CrawlState:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(PROJECT_ROOT, CRAWL_STATE_PATH)
+        self.enabled = False
+        self.marks = self._load()
+        # New marks from this run, saved once its jobs have been handled
+        self._pending = {}
+        self.pages_saved = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.enabled or get_config().settings.incremental_crawl
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                marks = json.load(f)
+            return marks if isinstance(marks, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def high_water_mark(self, results_url):
+        """The highest job ID seen on this search in earlier runs, or None."""
+        mark = self.marks.get(search_key(results_url))
+        return mark.get("newest_job_id") if mark else None
+
+    def reached(self, results_url, job_cards):
+        """Whether this results page reaches postings an earlier run already crawled or settled."""
+        job_ids = _numeric_ids(job_cards)
+        if not job_ids:
+            return False
+        newest = self.high_water_mark(results_url)
+        if newest is not None and min(job_ids) <= newest:
+            return True
+        # Logged jobs can be due for a retry; only pages of settled jobs count as processed
+        status_store = get_job_status_store()
+        return all(status_store.skip_reason(str(job_id)) is not None for job_id in job_ids)
+
+    def advance(self, results_url, job_cards, title=None):
+        """Remember the newest posting of this crawl, to be saved at the end of the run."""
+        job_ids = _numeric_ids(job_cards)
+        if not job_ids:
+            return
+        key = search_key(results_url)
+        newest = max(job_ids + [self.high_water_mark(results_url) or 0])
+        with self._lock:
+            self._pending[key] = {
+                "title": title,
+                "newest_job_id": newest,
+                "crawled_at": time.strftime("%Y-%m-%d_%H-%M-%S"),
+            }
+
+    def record_early_stop(self, pages_saved):
+        with self._lock:
+            self.pages_saved += pages_saved
+
+    def save(self):
+        """Write this run's marks, replacing the file atomically."""
+        with self._lock:
+            if not self._pending:
+                return
+            self.marks.update(self._pending)
+            self._pending = {}
+            marks = dict(self.marks)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(marks, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save crawl state: {str(e)}")
+
+    def summary(self):
+        return f"Incremental crawl: stopped early at already-seen postings, skipping up to {self.pages_saved} result pages"
+
+_state = None
+_state_lock = threading.Lock()
+
+def get_crawl_state():
+    """Return the shared crawl state, loading it on first use."""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = CrawlState()
+    return _state
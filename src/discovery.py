@@ -0,0 +1,223 @@
+"""
+Job discovery for the Handshake Job Bot.
+
+Before applying to anything, the bot walks the result pages of every job
+title and merges the postings it finds into one ordered, deduplicated work
+list. A posting that shows up under several titles is visited only once, and
+its lead remembers every title that matched it.
+
+Each lead also keeps the metadata shown on its search result card, so card
+rules (external applications, blocklisted employers or locations) can drop a
+posting without loading its detail page.
+"""
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+from log_store import extract_job_id
+from settings import get_config
+from utils import random_wait
+from pagination import Paginator, results_page_url
+from crawl_state import get_crawl_state
+from rate_limit import get_rate_limiter
+from instrumentation import get_telemetry
+
+logger = logging.getLogger('handshake_job_bot')
+
+@dataclass
+class JobLead:
+    url: str
+    job_id: str = None
+    titles: list = field(default_factory=list)
+    job_title: str = None
+    employer: str = None
+    location: str = None
+    posted: str = None
+    external_apply: bool = False
+    score: float = None
+
+    @property
+    def key(self):
+        return self.job_id or self.url
+
+    @property
+    def search_title(self):
+        """The first title whose search listed this job."""
+        return self.titles[0] if self.titles else None
+
+class WorkList:
+    """Ordered job leads keyed by job ID (or URL when no ID can be extracted)."""
+
+    def __init__(self):
+        self._leads = {}
+        self.listings = 0
+
+    @classmethod
+    def from_leads(cls, leads):
+        """Rebuild a work list from leads saved in a run checkpoint."""
+        work_list = cls()
+        for lead in leads:
+            work_list._leads[lead.key] = lead
+        work_list.listings = len(leads)
+        return work_list
+
+    def __len__(self):
+        return len(self._leads)
+
+    def __iter__(self):
+        return iter(self._leads.values())
+
+    def __contains__(self, key):
+        return key in self._leads
+
+    def add(self, job_card, title=None):
+        """Add a job card found under title, returning the new lead or None if it was already listed."""
+        self.listings += 1
+        job_id = extract_job_id(job_card.url)
+        key = job_id or job_card.url
+        lead = self._leads.get(key)
+        if lead is not None:
+            if title and title not in lead.titles:
+                lead.titles.append(title)
+            return None
+
+        lead = JobLead(
+            url=job_card.url,
+            job_id=job_id,
+            titles=[title] if title else [],
+            job_title=job_card.job_title,
+            employer=job_card.employer,
+            location=job_card.location,
+            posted=job_card.posted,
+            external_apply=job_card.external_apply,
+        )
+        self._leads[key] = lead
+        return lead
+
+class CardRules:
+    """Skip rules that only need the data on a search result card."""
+
+    def __init__(self, skip_external=True, blocked_employers=None, blocked_locations=None):
+        self.skip_external = skip_external
+        self.blocked_employers = [employer.lower() for employer in blocked_employers or []]
+        self.blocked_locations = [location.lower() for location in blocked_locations or []]
+        self.skipped = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        filters = get_config().filters
+        return cls(filters.skip_external, filters.blocked_employers, filters.blocked_locations)
+
+    @property
+    def page_loads_saved(self):
+        return sum(self.skipped.values())
+
+    def skip_reason(self, lead):
+        """Return why lead should be skipped without opening it, or None to visit it."""
+        reason = None
+        if self.skip_external and lead.external_apply:
+            reason = "external application"
+        elif lead.employer and any(blocked in lead.employer.lower() for blocked in self.blocked_employers):
+            reason = "blocked employer"
+        elif lead.location and any(blocked in lead.location.lower() for blocked in self.blocked_locations):
+            reason = "blocked location"
+        if reason:
+            with self._lock:
+                self.skipped[reason] += 1
+        return reason
+
+    def summary(self):
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in self.skipped.most_common())
+        return f"Card rules skipped {self.page_loads_saved} postings, saving {self.page_loads_saved} page loads" + (f" ({reasons})" if reasons else "")
+
+def iter_result_pages(browser, max_pages=None, title=None):
+    """Yield (page_number, job_cards) for the current search and its following pages, within the page budget."""
+    job_cards = browser.get_job_cards()
+    if not job_cards:
+        return
+    budget = max_pages or get_config().job_search.page_budget(title)
+    paginator = Paginator.from_first_page(browser.driver.current_url, len(job_cards), browser.get_result_count(), budget)
+    if paginator.total is not None:
+        logger.info(f"{paginator.total} results on {paginator.page_count} pages, reading up to page {paginator.last_page}")
+    crawl_state = get_crawl_state()
+    incremental = crawl_state.active
+    if incremental:
+        crawl_state.advance(paginator.url, job_cards, title)
+
+    page_number = paginator.first_page
+    while True:
+        has_next = paginator.has_next(page_number, len(job_cards))
+        if has_next and incremental and crawl_state.reached(paginator.url, job_cards):
+            logger.info(f"Page {page_number} reaches postings seen in an earlier run, not reading further pages")
+            crawl_state.record_early_stop(paginator.last_page - page_number)
+            has_next = False
+        # Let the next results page load in a background tab while this one is processed
+        if has_next:
+            browser.prefetch([paginator.url_for(page_number + 1)])
+
+        yield page_number, job_cards
+
+        if not has_next:
+            break
+        page_number += 1
+        job_cards = browser.open_results_page(paginator.url_for(page_number))
+        if not job_cards:
+            break
+
+def discover_current_results(browser, work_list=None, title=None, max_pages=None, on_new_lead=None, on_page=None):
+    """Add the job cards from the current results page and its following pages to the work list."""
+    work_list = work_list if work_list is not None else WorkList()
+    for page_number, job_cards in iter_result_pages(browser, max_pages, title):
+        new_leads = 0
+        for job_card in job_cards:
+            lead = work_list.add(job_card, title)
+            if lead:
+                new_leads += 1
+                if on_new_lead:
+                    on_new_lead(lead)
+        logger.info(f"Found {len(job_cards)} job URLs on page {page_number}, {new_leads} new")
+        if on_page:
+            on_page(page_number)
+    return work_list
+
+def discover_jobs(browser, job_titles, max_pages=None, on_new_lead=None, checkpoint=None):
+    """Search every job title and merge all result pages into one deduplicated work list.
+
+    With a checkpoint, progress is recorded after every results page, and a
+    discovery the checkpoint says was interrupted continues at its title and page.
+    """
+    work_list = WorkList.from_leads(checkpoint.leads()) if checkpoint else WorkList()
+    start_index, start_page = (checkpoint.title_index, checkpoint.page) if checkpoint else (0, 1)
+    for index, job_title in enumerate(job_titles):
+        if index < start_index:
+            continue
+        if index > start_index and not get_rate_limiter().enabled:
+            # Wait before searching the next job title (the rate limiter paces searches when enabled)
+            random_wait(3, 5)
+
+        logger.info(f"Searching for job title: {job_title}")
+        with get_telemetry().title(job_title):
+            if not browser.search_job(job_title):
+                logger.error(f"Failed to search for job title: {job_title}. Skipping to next job title.")
+                continue
+
+            pages = max_pages or get_config().job_search.page_budget(job_title)
+            first_page = start_page if index == start_index else 1
+            if first_page > 1:
+                # Resuming: continue at the page the interrupted run had reached
+                pages -= first_page - 1
+                if pages > 0:
+                    browser.open_results_page(results_page_url(browser.driver.current_url, first_page))
+            on_page = None
+            if checkpoint:
+                on_page = lambda page_number, index=index: checkpoint.discovery_progress(index, page_number + 1, work_list)
+            if pages > 0:
+                discover_current_results(browser, work_list, job_title, pages, on_new_lead, on_page)
+        if checkpoint:
+            checkpoint.discovery_progress(index + 1, 1, work_list)
+
+    duplicates = work_list.listings - len(work_list)
+    logger.info(f"Discovered {len(work_list)} unique jobs from {work_list.listings} listings ({duplicates} duplicates across titles)")
+    return work_list
@@ -0,0 +1,115 @@
+"""
+WebDriver round-trip profiler for the Handshake Job Bot.
+
+Every find_element, get_attribute, .text or execute_script call is one HTTP
+request to chromedriver. With profiling on, each browser's command executor
+is wrapped so every request is counted and timed by command type and by the
+line of bot code that caused it (the innermost frame in browser.py, utils.py
+or the other bot modules; waits are charged to whoever called them). The run
+summary then prints the top call sites, which is where round trips are worth
+eliminating.
+"""
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from settings import get_config
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Helpers whose commands are charged to their caller instead
+PASS_THROUGH_MODULES = ("waits.py", "instrumentation.py", "driver_profiler.py")
+TOP_N = 20
+
+class CommandStats:
+    __slots__ = ("calls", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+def call_site():
+    """Return "module.py:line (function)" for the bot code that issued the current command."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if os.path.dirname(os.path.abspath(path)) == SOURCE_DIR and os.path.basename(path) not in PASS_THROUGH_MODULES:
+            return f"{os.path.basename(path)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "(outside the bot)"
+
+class DriverProfiler:
+    """Count and time WebDriver commands by command and by call site."""
+
+    def __init__(self):
+        self.enabled = False
+        self.by_command = defaultdict(CommandStats)
+        self.by_site = defaultdict(CommandStats)
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.enabled or get_config().settings.driver_profiling
+
+    def attach(self, driver):
+        """Wrap driver's command executor when profiling is on; returns the driver."""
+        executor = getattr(driver, "command_executor", None)
+        if not self.active or executor is None or getattr(executor, "_hjb_profiled", False):
+            return driver
+        execute = executor.execute
+
+        def profiled_execute(command, params):
+            site = call_site()
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self.record(command, site, time.perf_counter() - start)
+
+        executor.execute = profiled_execute
+        executor._hjb_profiled = True
+        return driver
+
+    def record(self, command, site, seconds):
+        with self._lock:
+            for stats in (self.by_command[command], self.by_site[(site, command)]):
+                stats.calls += 1
+                stats.seconds += seconds
+
+    @property
+    def total_calls(self):
+        return sum(stats.calls for stats in self.by_command.values())
+
+    @property
+    def total_seconds(self):
+        return sum(stats.seconds for stats in self.by_command.values())
+
+    def summary(self, top_n=TOP_N):
+        """Tables of the busiest command types and the top_n hotspots by round-trip time."""
+        with self._lock:
+            by_command = sorted(self.by_command.items(), key=lambda item: item[1].seconds, reverse=True)
+            by_site = sorted(self.by_site.items(), key=lambda item: item[1].seconds, reverse=True)[:top_n]
+        total_calls, total_seconds = self.total_calls, self.total_seconds
+        if not total_calls:
+            return "WebDriver profile: no commands recorded"
+        elapsed = time.perf_counter() - self.start
+        lines = [
+            f"WebDriver profile: {total_calls} commands took {total_seconds:.1f}s "
+            f"({total_seconds / elapsed:.0%} of {elapsed:.1f}s), {total_seconds / total_calls * 1000:.1f}ms per round trip",
+            f"{'command':<32}{'calls':>8}{'total s':>10}{'ms / call':>11}",
+        ]
+        for command, stats in by_command:
+            lines.append(f"{command:<32}{stats.calls:>8}{stats.seconds:>10.2f}{stats.seconds / stats.calls * 1000:>11.1f}")
+        lines.append(f"Top {len(by_site)} call sites:")
+        lines.append(f"{'#':>3}  {'call site':<52}{'command':<24}{'calls':>8}{'total s':>10}{'share':>8}")
+        for rank, ((site, command), stats) in enumerate(by_site, 1):
+            lines.append(f"{rank:>3}  {site:<52}{command:<24}{stats.calls:>8}{stats.seconds:>10.2f}{stats.seconds / total_seconds:>8.0%}")
+        return "\n".join(lines)
+
+_profiler = DriverProfiler()
+
+def get_driver_profiler():
+    """Return the process-wide driver profiler."""
+    return _profiler
@@ -0,0 +1,133 @@
+"""
+ChromeDriver provisioning for the Handshake Job Bot.
+
+ChromeDriverManager().install() probes versions (and may hit the network)
+every time it runs. The resolved driver path is cached together with the
+Chrome version it was resolved for, reused while that Chrome version is still
+installed, and an explicit path or the chromedriver on PATH is used when the
+network should not be touched.
+
+The module also times startup, from process start to the first page load.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from constants import DRIVER_CACHE_PATH
+from settings import PROJECT_ROOT, get_config
+
+logger = logging.getLogger('handshake_job_bot')
+
+_lock = threading.Lock()
+_resolved = None
+
+def detect_chrome_version():
+    """Return the installed Chrome version without any network access, or None."""
+    try:
+        from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        return None
+
+def _cache_path():
+    return os.path.join(PROJECT_ROOT, DRIVER_CACHE_PATH)
+
+def load_cached_driver(chrome_version):
+    """Return the cached driver path if it still exists and matches the installed Chrome."""
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    path = cached.get("path")
+    if not path or not os.path.exists(path):
+        return None
+    if chrome_version and cached.get("chrome_version") != chrome_version:
+        return None
+    return path
+
+def save_cached_driver(path, chrome_version):
+    cache_path = _cache_path()
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = cache_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"path": path, "chrome_version": chrome_version, "resolved_at": time.strftime("%Y-%m-%d_%H-%M-%S")}, f)
+    os.replace(temp_path, cache_path)
+
+def _resolve_chromedriver():
+    settings = get_config().settings
+
+    # 1. An explicitly configured driver always wins
+    if settings.chromedriver_path:
+        if os.path.exists(settings.chromedriver_path):
+            return settings.chromedriver_path, "config"
+        logger.warning(f"Configured chromedriver_path does not exist: {settings.chromedriver_path}")
+
+    # 2. The driver resolved on a previous run, if Chrome has not been updated since
+    chrome_version = detect_chrome_version()
+    cached_path = load_cached_driver(chrome_version)
+    if cached_path:
+        return cached_path, "cache"
+
+    # 3. Download or locate a matching driver (may use the network)
+    if not settings.driver_offline:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            save_cached_driver(path, chrome_version)
+            return path, "webdriver-manager"
+        except Exception as e:
+            logger.warning(f"ChromeDriverManager failed, falling back to PATH: {str(e)}")
+
+    # 4. Whatever chromedriver is on PATH
+    path = shutil.which("chromedriver")
+    if path:
+        return path, "PATH"
+    raise RuntimeError("No chromedriver found: set settings.chromedriver_path or put chromedriver on PATH")
+
+def resolve_chromedriver():
+    """Return the chromedriver path, resolving it at most once per process."""
+    global _resolved
+    with _lock:
+        if _resolved is None:
+            start = time.monotonic()
+            path, source = _resolve_chromedriver()
+            _resolved = path
+            get_startup_timer().record("driver_resolve", time.monotonic() - start)
+            logger.info(f"Using chromedriver from {source}: {path}")
+        return _resolved
+
+class StartupTimer:
+    """Time from process start to the first page, split into the steps that make it up."""
+
+    def __init__(self):
+        self.process_start = time.monotonic()
+        self.steps = {}
+        self.first_page = None
+        self._lock = threading.Lock()
+
+    def mark_process_start(self, start):
+        self.process_start = start
+
+    def record(self, step, seconds):
+        with self._lock:
+            self.steps[step] = self.steps.get(step, 0.0) + seconds
+
+    def mark_first_page(self):
+        """Log startup time the first time any browser finishes loading a page."""
+        with self._lock:
+            if self.first_page is not None:
+                return
+            self.first_page = time.monotonic() - self.process_start
+        steps = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in self.steps.items())
+        logger.info(f"Startup: {self.first_page:.2f}s from process start to first page" + (f" ({steps})" if steps else ""))
+
+_startup_timer = StartupTimer()
+
+def get_startup_timer():
+    """Return the process-wide startup timer."""
+    return _startup_timer
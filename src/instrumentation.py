@@ -0,0 +1,292 @@
+"""
+Per-phase timing instrumentation for the Handshake Job Bot.
+
+Every HandshakeBrowser method and utils helper runs inside a span that
+records its wall time, the WebDriver commands it issued, how much of it was
+spent in explicit waits and sleeps, and its outcome. Spans nest, so a phase's
+numbers include the phases it called. Spans are tracked in a context
+variable, so worker threads and asyncio tabs each get their own stack.
+
+At the end of a run, write_run_report() writes the spans as a JSON and/or CSV
+report with percentiles and a per-title breakdown, and optionally as
+Prometheus text.
+"""
+import contextvars
+import csv
+import functools
+import inspect
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from constants import RUN_REPORTS_DIR
+from settings import PROJECT_ROOT, get_config
+
+logger = logging.getLogger('handshake_job_bot')
+
+PERCENTILES = (50, 90, 99)
+
+@dataclass
+class Span:
+    phase: str
+    title: str = None
+    start: float = field(default_factory=time.perf_counter)
+    commands: int = 0
+    waited: float = 0.0
+
+@dataclass
+class PhaseRecord:
+    phase: str
+    title: str
+    seconds: float
+    commands: int
+    waited: float
+    outcome: str
+
+    @property
+    def active(self):
+        return max(0.0, self.seconds - self.waited)
+
+_spans = contextvars.ContextVar("hjb_spans", default=())
+_title = contextvars.ContextVar("hjb_title", default=None)
+
+def outcome_of(result):
+    """Summarize a phase's return value: the status of (success, status) tuples, otherwise ok/failed."""
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], str):
+        return result[1]
+    if result is False:
+        return "failed"
+    return "ok"
+
+class Telemetry:
+    def __init__(self):
+        self.records = []
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return get_config().settings.run_report
+
+    # Span bookkeeping
+
+    def open_span(self, phase):
+        span = Span(phase, _title.get())
+        token = _spans.set(_spans.get() + (span,))
+        return span, token
+
+    def close_span(self, span, token, outcome):
+        _spans.reset(token)
+        record = PhaseRecord(span.phase, span.title, time.perf_counter() - span.start, span.commands, span.waited, outcome)
+        with self._lock:
+            self.records.append(record)
+
+    @contextmanager
+    def span(self, phase):
+        span, token = self.open_span(phase)
+        outcome = "ok"
+        try:
+            yield span
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            self.close_span(span, token, outcome)
+
+    def add_commands(self, count=1):
+        for span in _spans.get():
+            span.commands += count
+
+    def add_wait(self, seconds):
+        for span in _spans.get():
+            span.waited += seconds
+
+    @contextmanager
+    def title(self, job_title):
+        """Attribute the phases run inside this block to job_title."""
+        token = _title.set(job_title)
+        try:
+            yield
+        finally:
+            _title.reset(token)
+
+    # Reporting
+
+    def phase_stats(self, records):
+        by_phase = defaultdict(list)
+        for record in records:
+            by_phase[record.phase].append(record)
+        return {phase: _stats(phase_records) for phase, phase_records in sorted(by_phase.items())}
+
+    def report(self):
+        with self._lock:
+            records = list(self.records)
+        by_title = defaultdict(list)
+        for record in records:
+            if record.title:
+                by_title[record.title].append(record)
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_s": round(time.perf_counter() - self.start, 3),
+            "spans": len(records),
+            "phases": self.phase_stats(records),
+            "titles": {title: self.phase_stats(title_records) for title, title_records in sorted(by_title.items())},
+        }
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def _stats(records):
+    durations = sorted(record.seconds for record in records)
+    stats = {
+        "count": len(records),
+        "total_s": round(sum(durations), 3),
+        "mean_ms": round(sum(durations) / len(durations) * 1000, 1),
+        "max_ms": round(durations[-1] * 1000, 1),
+        "webdriver_commands": sum(record.commands for record in records),
+        "waited_s": round(sum(record.waited for record in records), 3),
+        "active_s": round(sum(record.active for record in records), 3),
+        "outcomes": dict(Counter(record.outcome for record in records)),
+    }
+    for percent in PERCENTILES:
+        stats[f"p{percent}_ms"] = round(_percentile(durations, percent) * 1000, 1)
+    return stats
+
+_telemetry = Telemetry()
+
+def get_telemetry():
+    """Return the process-wide telemetry."""
+    return _telemetry
+
+def instrumented(phase=None):
+    """Decorator that runs a function (or coroutine function) inside a telemetry span."""
+    def decorate(func):
+        name = phase or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _telemetry.enabled:
+                    return await func(*args, **kwargs)
+                span, token = _telemetry.open_span(name)
+                outcome = "error"
+                try:
+                    result = await func(*args, **kwargs)
+                    outcome = outcome_of(result)
+                    return result
+                finally:
+                    _telemetry.close_span(span, token, outcome)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _telemetry.enabled:
+                return func(*args, **kwargs)
+            span, token = _telemetry.open_span(name)
+            outcome = "error"
+            try:
+                result = func(*args, **kwargs)
+                outcome = outcome_of(result)
+                return result
+            finally:
+                _telemetry.close_span(span, token, outcome)
+        return wrapper
+    return decorate
+
+def instrument_methods(cls):
+    """Class decorator that instruments every method defined on the class, named Class.method."""
+    for name, member in list(vars(cls).items()):
+        if name.startswith("__") or not inspect.isfunction(member):
+            continue
+        setattr(cls, name, instrumented(f"{cls.__name__}.{name}")(member))
+    return cls
+
+def instrument_driver(driver):
+    """Count every WebDriver command the driver sends towards the open spans."""
+    if getattr(driver, "_hjb_instrumented", False):
+        return driver
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        _telemetry.add_commands()
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    driver._hjb_instrumented = True
+    return driver
+
+# Report writers
+
+def _csv_rows(report):
+    columns = ["count", "total_s", "mean_ms"] + [f"p{percent}_ms" for percent in PERCENTILES] + ["max_ms", "webdriver_commands", "waited_s", "active_s"]
+    yield ["title", "phase"] + columns + ["outcomes"]
+    sections = [("", report["phases"])] + list(report["titles"].items())
+    for title, phases in sections:
+        for phase, stats in phases.items():
+            outcomes = "; ".join(f"{outcome}={count}" for outcome, count in stats["outcomes"].items())
+            yield [title, phase] + [stats[column] for column in columns] + [outcomes]
+
+def _prometheus_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+def prometheus_text(report):
+    """Render the report's overall phase stats in the Prometheus text exposition format."""
+    lines = [
+        "# HELP hjb_phase_seconds Wall time of bot phases.",
+        "# TYPE hjb_phase_seconds summary",
+    ]
+    for phase, stats in report["phases"].items():
+        label = f'phase="{_prometheus_label(phase)}"'
+        for percent in PERCENTILES:
+            lines.append(f'hjb_phase_seconds{{{label},quantile="{percent / 100}"}} {stats[f"p{percent}_ms"] / 1000}')
+        lines.append(f"hjb_phase_seconds_sum{{{label}}} {stats['total_s']}")
+        lines.append(f"hjb_phase_seconds_count{{{label}}} {stats['count']}")
+    for metric, key, help_text in (
+        ("hjb_phase_webdriver_commands_total", "webdriver_commands", "WebDriver commands issued inside bot phases."),
+        ("hjb_phase_wait_seconds_total", "waited_s", "Time bot phases spent in explicit waits and sleeps."),
+        ("hjb_phase_active_seconds_total", "active_s", "Time bot phases spent outside explicit waits and sleeps."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        for phase, stats in report["phases"].items():
+            lines.append(f'{metric}{{phase="{_prometheus_label(phase)}"}} {stats[key]}')
+    lines += ["# HELP hjb_phase_outcomes_total Bot phase results by outcome.", "# TYPE hjb_phase_outcomes_total counter"]
+    for phase, stats in report["phases"].items():
+        for outcome, count in stats["outcomes"].items():
+            lines.append(f'hjb_phase_outcomes_total{{phase="{_prometheus_label(phase)}",outcome="{_prometheus_label(outcome)}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+def write_run_report(formats=None, directory=None):
+    """Write the run's telemetry in the configured formats, returning the paths written."""
+    settings = get_config().settings
+    formats = formats or settings.report_formats
+    directory = directory or os.path.join(PROJECT_ROOT, RUN_REPORTS_DIR)
+    report = _telemetry.report()
+    if not report["spans"]:
+        return []
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"run_{_telemetry.started_at.strftime('%Y-%m-%d_%H-%M-%S')}")
+
+    paths = []
+    if "json" in formats:
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        paths.append(base + ".json")
+    if "csv" in formats:
+        with open(base + ".csv", "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(_csv_rows(report))
+        paths.append(base + ".csv")
+    if "prometheus" in formats:
+        with open(base + ".prom", "w", encoding="utf-8") as f:
+            f.write(prometheus_text(report))
+        paths.append(base + ".prom")
+    return paths
@@ -0,0 +1,176 @@
+"""
+Job detail extraction for the Handshake Job Bot.
+
+Title, employer, location and employment type are collected by a single
+execute_script call, so reading a posting costs one WebDriver round trip
+instead of several per div on the page. Search result cards are read the
+same way, all cards on a page in one call.
+"""
+from dataclasses import dataclass, asdict
+
+from constants import (
+    DIV_JOB_CARDS_CONTAINER_CSS,
+    JOB_CARD_LINK_CSS,
+    CARD_TITLE_SELECTORS,
+    CARD_EMPLOYER_SELECTORS,
+    CARD_LOCATION_SELECTORS,
+    CARD_POSTED_SELECTORS,
+    CARD_EXTERNAL_APPLY_TEXT,
+    JOB_TITLE_SELECTORS,
+    EMPLOYER_NAME_SELECTORS,
+    LOCATION_SVG_PATH_PREFIX,
+    EMPLOYMENT_TYPE_SVG_PATH_PREFIX,
+    LOCATION_KEYWORDS,
+    EMPLOYMENT_TYPE_KEYWORDS,
+)
+
+# Mirrors the old per-div WebDriver loop: for every div whose first SVG's first
+# path starts with one of the icon prefixes, the first inner div whose text
+# contains a keyword wins, and later matching divs override earlier ones.
+JOB_DETAILS_SCRIPT = """
+const [titleSelectors, employerSelectors, locationPrefix, typePrefix, locationKeywords, typeKeywords] = arguments;
+
+function firstText(selectors) {
+    for (const selector of selectors) {
+        let element = null;
+        try { element = document.querySelector(selector); } catch (e) { continue; }
+        if (element && element.innerText) { return element.innerText.trim(); }
+    }
+    return null;
+}
+
+function matchingInnerText(div, keywords) {
+    for (const inner of div.getElementsByTagName('div')) {
+        const text = inner.innerText || '';
+        const lower = text.toLowerCase();
+        if (keywords.some(keyword => lower.includes(keyword))) { return text.trim(); }
+    }
+    return null;
+}
+
+let location = null;
+let employmentType = null;
+for (const div of document.getElementsByTagName('div')) {
+    const svg = div.getElementsByTagName('svg')[0];
+    if (!svg) { continue; }
+    const path = svg.getElementsByTagName('path')[0];
+    const d = path ? path.getAttribute('d') : null;
+    if (!d) { continue; }
+    if (d.startsWith(locationPrefix)) {
+        location = matchingInnerText(div, locationKeywords) || location;
+    } else if (d.startsWith(typePrefix)) {
+        employmentType = matchingInnerText(div, typeKeywords) || employmentType;
+    }
+}
+
+return {
+    url: window.location.href,
+    job_title: firstText(titleSelectors),
+    employer: firstText(employerSelectors),
+    location: location,
+    employment_type: employmentType
+};
+"""
+
+@dataclass
+class JobDetails:
+    url: str
+    job_title: str = None
+    employer: str = None
+    location: str = None
+    employment_type: str = None
+
+    def to_log_fields(self):
+        """Return the non-empty detail fields in the shape used by the application log."""
+        return {key: value for key, value in asdict(self).items() if value and key != "url"}
+
+# Arguments for JOB_DETAILS_SCRIPT, shared by every browser backend
+JOB_DETAILS_ARGS = (
+    JOB_TITLE_SELECTORS,
+    EMPLOYER_NAME_SELECTORS,
+    LOCATION_SVG_PATH_PREFIX,
+    EMPLOYMENT_TYPE_SVG_PATH_PREFIX,
+    LOCATION_KEYWORDS,
+    EMPLOYMENT_TYPE_KEYWORDS,
+)
+
+def parse_job_details(result, url):
+    """Build JobDetails for url from JOB_DETAILS_SCRIPT's result."""
+    return JobDetails(
+        url=url,
+        job_title=result.get("job_title"),
+        employer=result.get("employer"),
+        location=result.get("location"),
+        employment_type=result.get("employment_type"),
+    )
+
+def extract_job_details(driver):
+    """Collect the job title, employer, location and employment type in one script call."""
+    result = driver.execute_script(JOB_DETAILS_SCRIPT, *JOB_DETAILS_ARGS) or {}
+    return parse_job_details(result, result.get("url") or driver.current_url)
+
+# Reads every job card on a results page: link, title, employer, location and
+# whether the card is marked "Apply externally"
+JOB_CARDS_SCRIPT = """
+const [containerSelector, cardSelector, titleSelectors, employerSelectors, locationSelectors, postedSelectors, externalText] = arguments;
+
+function firstText(card, selectors) {
+    for (const selector of selectors) {
+        let element = null;
+        try { element = card.querySelector(selector); } catch (e) { continue; }
+        if (element && element.innerText) { return element.innerText.trim(); }
+    }
+    return null;
+}
+
+const container = document.querySelector(containerSelector);
+if (!container) { return null; }
+return Array.from(container.querySelectorAll(cardSelector)).map(card => ({
+    url: card.href || card.getAttribute('href'),
+    job_title: firstText(card, titleSelectors),
+    employer: firstText(card, employerSelectors),
+    location: firstText(card, locationSelectors),
+    posted: firstText(card, postedSelectors),
+    external_apply: (card.innerText || '').toLowerCase().includes(externalText)
+}));
+"""
+
+@dataclass
+class JobCard:
+    url: str
+    job_title: str = None
+    employer: str = None
+    location: str = None
+    posted: str = None
+    external_apply: bool = False
+
+# Arguments for JOB_CARDS_SCRIPT, shared by every browser backend
+JOB_CARDS_ARGS = (
+    DIV_JOB_CARDS_CONTAINER_CSS,
+    JOB_CARD_LINK_CSS,
+    CARD_TITLE_SELECTORS,
+    CARD_EMPLOYER_SELECTORS,
+    CARD_LOCATION_SELECTORS,
+    CARD_POSTED_SELECTORS,
+    CARD_EXTERNAL_APPLY_TEXT,
+)
+
+def parse_job_cards(results):
+    """Build JobCards from JOB_CARDS_SCRIPT's result, or None if there was no results container."""
+    if results is None:
+        return None
+    return [
+        JobCard(
+            url=result.get("url"),
+            job_title=result.get("job_title"),
+            employer=result.get("employer"),
+            location=result.get("location"),
+            posted=result.get("posted"),
+            external_apply=bool(result.get("external_apply")),
+        )
+        for result in results if result.get("url")
+    ]
+
+def extract_job_cards(driver):
+    """Read every job card on the current results page in one script call, or None if there is no results container."""
+    return parse_job_cards(driver.execute_script(JOB_CARDS_SCRIPT, *JOB_CARDS_ARGS))
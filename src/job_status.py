@@ -0,0 +1,199 @@
+"""
+Per-job status store for the Handshake Job Bot.
+
+For every job it has visited, the bot keeps the outcome of the last attempt,
+how many attempts there have been and when the last one was. Each outcome has
+a retry time in the `revisit` block of config.json: applied and external jobs
+are never visited again, while errors, unanswered questions and visits that
+ended without any outcome (a crash or a page that never loaded) are retried
+once their time is up, until max_attempts is reached. The statuses live in
+memory and are appended to .cache/job_status.jsonl, latest line wins, so the
+check before each page load is one dict lookup. The first run seeds the store
+from the application log.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from constants import JOB_STATUS_PATH
+from settings import PROJECT_ROOT, get_config
+from log_store import extract_job_id, get_log_store
+
+logger = logging.getLogger('handshake_job_bot')
+
+# Outcomes, named like their retry times in RevisitSettings
+APPLIED = "applied"
+ALREADY_APPLIED = "already_applied"
+EXTERNAL_APPLICATION = "external_application"
+UNANSWERED_QUESTIONS = "unanswered_questions"
+ERROR = "error"
+INCOMPLETE = "incomplete"
+# Rewrite the file at startup once superseded lines outnumber live ones by this much
+COMPACT_RATIO = 2
+
+def outcome_of_status(status):
+    """Map an apply_to_job or application log status to an outcome."""
+    text = (status or "").lower()
+    if "already applied" in text:
+        return ALREADY_APPLIED
+    if "applied" in text:
+        return APPLIED
+    if "external" in text:
+        return EXTERNAL_APPLICATION
+    if "unanswered" in text:
+        return UNANSWERED_QUESTIONS
+    return ERROR
+
+def _log_time(timestamp):
+    try:
+        return datetime.strptime(timestamp, "%Y-%m-%d_%H-%M-%S").timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+@dataclass
+class JobStatus:
+    outcome: str
+    attempts: int = 0
+    last_attempt: float = 0.0
+
+class JobStatusStore:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(PROJECT_ROOT, JOB_STATUS_PATH)
+        self._statuses = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            self._load()
+        else:
+            self._seed_from_log()
+
+    def __contains__(self, job_id):
+        return job_id in self._statuses
+
+    def __len__(self):
+        return len(self._statuses)
+
+    def get(self, job_id):
+        return self._statuses.get(job_id)
+
+    def _load(self):
+        lines = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self._statuses[record["job_id"]] = JobStatus(record["outcome"], record["attempts"], record["last_attempt"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+                lines += 1
+        if lines > COMPACT_RATIO * len(self._statuses):
+            self._rewrite()
+
+    def _seed_from_log(self):
+        """Start from the outcomes already in the application log."""
+        for entry in get_log_store().iter_entries():
+            job_id = extract_job_id(entry.get("url")) if isinstance(entry, dict) else None
+            if not job_id:
+                continue
+            previous = self._statuses.get(job_id)
+            self._statuses[job_id] = JobStatus(outcome_of_status(entry.get("status")),
+                                               (previous.attempts if previous else 0) + 1,
+                                               _log_time(entry.get("timestamp")))
+        self._rewrite()
+        if self._statuses:
+            logger.info(f"Seeded the job status store with {len(self._statuses)} jobs from the application log")
+
+    def _rewrite(self):
+        """Replace the file with one line per job."""
+        try:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for job_id, status in self._statuses.items():
+                    f.write(self._encode(job_id, status))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write the job status store: {str(e)}")
+
+    def _encode(self, job_id, status):
+        return json.dumps({"job_id": job_id, "outcome": status.outcome, "attempts": status.attempts,
+                           "last_attempt": round(status.last_attempt, 1)}) + "\n"
+
+    def _append(self, job_id, status):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(self._encode(job_id, status))
+        except OSError as e:
+            logger.warning(f"Could not save the status of job {job_id}: {str(e)}")
+
+    # Revisit policy
+
+    @staticmethod
+    def _retry_after(revisit, outcome):
+        """Seconds before a job with this outcome may be visited again, or None for never."""
+        hours = getattr(revisit, outcome, 0)
+        return None if hours < 0 else hours * 3600
+
+    def _skip_reason(self, status, revisit, now):
+        outcome = status.outcome.replace("_", " ")
+        retry_after = self._retry_after(revisit, status.outcome)
+        if retry_after is None:
+            return f"already processed ({outcome})"
+        if revisit.max_attempts and status.attempts >= revisit.max_attempts:
+            return f"gave up after {status.attempts} attempts ({outcome})"
+        wait = status.last_attempt + retry_after - now
+        if wait > 0:
+            return f"{outcome} last time, retrying in {wait / 3600:.1f}h"
+        return None
+
+    def skip_reason(self, job_id, now=None):
+        """Why job_id should not be visited now, or None when it is new or due for a retry."""
+        status = self._statuses.get(job_id) if job_id else None
+        if status is None:
+            return None
+        return self._skip_reason(status, get_config().revisit, now or time.time())
+
+    def settled_job_ids(self, now=None):
+        """Job IDs that are not due for a visit, for the worker pools' shared set."""
+        revisit, now = get_config().revisit, now or time.time()
+        with self._lock:
+            statuses = list(self._statuses.items())
+        return {job_id for job_id, status in statuses if self._skip_reason(status, revisit, now)}
+
+    # Recording
+
+    def start(self, job_id):
+        """Record a new attempt before its page is loaded; it stays incomplete until record() is called."""
+        if not job_id:
+            return
+        with self._lock:
+            previous = self._statuses.get(job_id)
+            status = self._statuses[job_id] = JobStatus(INCOMPLETE, (previous.attempts if previous else 0) + 1, time.time())
+            self._append(job_id, status)
+
+    def record(self, job_id, status_text):
+        """Record the outcome of the current attempt at job_id."""
+        if not job_id:
+            return
+        with self._lock:
+            previous = self._statuses.get(job_id)
+            if previous is not None and previous.outcome == INCOMPLETE:
+                attempts, last_attempt = previous.attempts, previous.last_attempt
+            else:
+                attempts, last_attempt = (previous.attempts if previous else 0) + 1, time.time()
+            status = self._statuses[job_id] = JobStatus(outcome_of_status(status_text), attempts, last_attempt)
+            self._append(job_id, status)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_job_status_store():
+    """Return the shared job status store, loading it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStatusStore()
+    return _store
@@ -0,0 +1,206 @@
+"""
+Append-only application log for the Handshake Job Bot.
+
+Every processed job is written as a single JSON line, and a small index file
+keeps the job IDs seen so far so "already processed" checks never have to
+parse the whole log.
+"""
+import json
+import logging
+import os
+import re
+import threading
+
+from constants import APPLICATIONS_LOG_PATH, APPLICATIONS_INDEX_PATH, LEGACY_APPLICATIONS_LOG_PATH
+from settings import PROJECT_ROOT
+
+logger = logging.getLogger('handshake_job_bot')
+
+# Index lines look like "<job_id> <log offset>", "-" is used when the entry has no job ID
+NO_JOB_ID = "-"
+
+def extract_job_id(url):
+    """Extract the job ID from a Handshake job URL"""
+    match = re.search(r'/jobs/(\d+)', url or "")
+    if match:
+        return match.group(1)
+    return None
+
+class ApplicationLogStore:
+    def __init__(self, log_path=None, index_path=None, legacy_path=None):
+        self.log_path = log_path or os.path.join(PROJECT_ROOT, APPLICATIONS_LOG_PATH)
+        self.index_path = index_path or os.path.join(PROJECT_ROOT, APPLICATIONS_INDEX_PATH)
+        self.legacy_path = legacy_path or os.path.join(PROJECT_ROOT, LEGACY_APPLICATIONS_LOG_PATH)
+        self.job_ids = set()
+        self._indexed_offset = 0
+        # Workers share one store, so appends must not interleave
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+
+        self._import_legacy_log()
+        self._repair_partial_tail()
+        self._load_index()
+
+    def __contains__(self, job_id):
+        return job_id in self.job_ids
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def _import_legacy_log(self):
+        """Import the old indent=4 JSON array log once, then move it out of the way."""
+        if not os.path.exists(self.legacy_path) or os.path.exists(self.log_path):
+            return
+
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            # Handle empty or invalid JSON file
+            entries = []
+
+        # Build the new log beside the old one and swap it in whole, so a crash never leaves a partial import
+        temp_path = self.log_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            for entry in entries:
+                f.write(self._encode(entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.log_path)
+
+        os.replace(self.legacy_path, self.legacy_path + ".imported")
+        logger.info(f"Imported {len(entries)} entries from {self.legacy_path}")
+
+    def _repair_partial_tail(self):
+        """Drop a half-written last record left behind by a crash mid-write."""
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Walk back to the last complete line
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    position += newline + 1
+                    break
+            f.truncate(position)
+            logger.warning(f"Discarded an incomplete record at the end of {self.log_path}")
+
+    def _load_index(self):
+        """Load the job ID index and catch it up with any log records it is missing."""
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 2 or not parts[1].isdigit():
+                        continue
+                    if parts[0] != NO_JOB_ID:
+                        self.job_ids.add(parts[0])
+                    self._indexed_offset = int(parts[1])
+
+        log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if log_size < self._indexed_offset:
+            # The log was replaced or truncated, rebuild the index from scratch
+            self.job_ids = set()
+            self._indexed_offset = 0
+            open(self.index_path, "w").close()
+
+        if log_size > self._indexed_offset:
+            self._index_from(self._indexed_offset)
+
+    def _index_from(self, offset):
+        """Index every log record starting at the given byte offset."""
+        index_lines = []
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for raw_line in f:
+                offset += len(raw_line)
+                try:
+                    entry = json.loads(raw_line)
+                except json.JSONDecodeError:
+                    entry = {}
+                job_id = extract_job_id(entry.get("url")) if isinstance(entry, dict) else None
+                if job_id:
+                    self.job_ids.add(job_id)
+                index_lines.append(f"{job_id or NO_JOB_ID} {offset}\n")
+
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.writelines(index_lines)
+        self._indexed_offset = offset
+
+    def _encode(self, entry):
+        return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def append(self, entry):
+        """Append one entry to the log and record its job ID in the index."""
+        job_id = extract_job_id(entry.get("url"))
+        line = self._encode(entry)
+
+        with self._lock:
+            with open(self.log_path, "ab") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                offset = f.tell()
+
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(f"{job_id or NO_JOB_ID} {offset}\n")
+
+            if job_id:
+                self.job_ids.add(job_id)
+            self._indexed_offset = offset
+        return job_id
+
+    def iter_entries(self):
+        """Stream log entries one at a time without loading the whole log."""
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def iter_records(self, offset=0):
+        """Stream (entry, end offset) pairs from a byte offset, so readers can catch up incrementally."""
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for raw_line in f:
+                # A record still being written has no newline yet
+                if not raw_line.endswith(b"\n"):
+                    return
+                offset += len(raw_line)
+                try:
+                    entry = json.loads(raw_line)
+                except json.JSONDecodeError:
+                    entry = None
+                yield (entry if isinstance(entry, dict) else None), offset
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_log_store():
+    """Return the shared application log store, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ApplicationLogStore()
+    return _store
@@ -1,117 +1,173 @@
+import time
+
+# Recorded before the other imports so startup time covers them too
+PROCESS_START = time.monotonic()
+
 import sys
 import os
 import random
-import json
-import re
 import argparse
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from browser import HandshakeBrowser
-from utils import setup_logging, load_config, random_wait
-from constants import APPLICATIONS_LOG_PATH  # Import the specific constant
-
-def extract_job_id(url):
-    """Extract the job ID from a Handshake job URL"""
-    match = re.search(r'/jobs/(\d+)', url)
-    if match:
-        return match.group(1)
-    return None
+from utils import setup_logging, random_wait, log_job_lead
+from settings import get_config
+from discovery import discover_jobs, discover_current_results, CardRules
+from workers import run_worker_pool
+from waits import wait_for_page_ready, get_wait_tracker
+from driver_provision import get_startup_timer
+from answers import get_answer_engine
+from instrumentation import get_telemetry, write_run_report
+from driver_profiler import get_driver_profiler
+from crawl_state import get_crawl_state
+from rate_limit import get_rate_limiter
+from checkpoint import RunCheckpoint, APPLY, get_checkpoint, set_checkpoint
+from scoring import rank_leads, get_application_cap
+from job_status import get_job_status_store
+from analytics import analyze, QUERIES, INTERVALS
 
 def load_applied_jobs():
-    """Load previously applied job IDs from applications_log.json"""
-    applied_job_ids = set()
-    log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", APPLICATIONS_LOG_PATH)
-    
-    if os.path.exists(log_path):
-        try:
-            with open(log_path, 'r') as f:
-                log_data = json.load(f)
-                for entry in log_data:
-                    if 'url' in entry:
-                        job_id = extract_job_id(entry['url'])
-                        if job_id:
-                            applied_job_ids.add(job_id)
-        except json.JSONDecodeError:
-            # Handle empty or invalid JSON file
-            pass
-    
-    return applied_job_ids
+    """Load the IDs of previously processed jobs that are not due for another visit"""
+    return get_job_status_store().settled_job_ids()
 
-def process_job_results(browser, max_pages=3):
-    """Process job results for the current page and subsequent pages"""
+def apply_to_job_leads(browser, job_leads, card_rules=None, checkpoint=None, start=0, revisit_job_id=None):
+    """Visit and apply to each discovered job from position start, skipping ones that were already processed"""
     # Set up logging
     logger = setup_logging()
-    config = load_config()
-    verbose_logging = config.get('settings', {}).get('verbose_logging', True)
+    verbose_logging = get_config().settings.verbose_logging
+    card_rules = card_rules or CardRules.from_config()
     
-    # Load previously applied jobs
-    applied_job_ids = load_applied_jobs()
-    logger.info(f"Loaded {len(applied_job_ids)} previously applied jobs")
+    # Load the outcome of every earlier visit
+    status_store = get_job_status_store()
+    logger.info(f"Loaded {len(status_store)} previously processed jobs")
     
-    total_jobs_processed = 0
-    page_number = 1
+    # Best postings first; a resumed run keeps the order it was checkpointed in
+    job_leads = rank_leads(job_leads) if not start else list(job_leads)
+    if checkpoint:
+        checkpoint.start_apply(job_leads, start)
+    total_jobs_processed = start
+    application_cap = get_application_cap()
     
-    while page_number <= max_pages:
-        if verbose_logging:
-            logger.info(f"Processing page {page_number}")
-        page_url = browser.driver.current_url
+    # Decide up front which leads need a page load, so the next ones can be prefetched in background tabs
+    planned = []
+    for lead in job_leads[start:]:
+        # The interrupted job was marked incomplete when it was opened; that must not hold off its revisit
+        processed = None if revisit_job_id and lead.job_id == revisit_job_id else status_store.skip_reason(lead.job_id)
+        planned.append((lead, processed, None if processed else card_rules.skip_reason(lead)))
+    visit_urls = [lead.url for lead, processed, skip_reason in planned if not processed and not skip_reason]
+    visits = 0
+    
+    for position, (lead, processed, skip_reason) in enumerate(planned, start):
+        if application_cap.reached:
+            logger.info(f"Reached the cap of {application_cap.limit} applications for this run, stopping")
+            break
+        total_jobs_processed += 1
+        job_id = lead.job_id
         
-        # Get all job URLs from the current page
-        job_urls = browser.get_job_urls()
+        # Skip jobs already processed, or retried too recently
+        if processed:
+            if verbose_logging:
+                logger.info(f"Skipping job ID {job_id}: {processed}")
+            else:
+                logger.info(f"Job #{total_jobs_processed}: ⏭️  {processed}")
+            continue
         
-        if not job_urls:
-            logger.error("No job URLs found. Stopping.")
-            break
-            
-        logger.info(f"Found {len(job_urls)} job URLs on page {page_number}")
+        # Skip postings the search result card already rules out, without loading them
+        if skip_reason:
+            if skip_reason == "external application":
+                log_job_lead(lead, skip_reason, verbose_logging)
+                status_store.record(job_id, skip_reason)
+            logger.info(f"Job #{total_jobs_processed}: ⏭️  {skip_reason} (from job card)")
+            continue
         
-        # Process each job URL
-        for job_url in job_urls:
-            total_jobs_processed += 1
-            
-            # Extract job ID and skip if already applied
-            job_id = extract_job_id(job_url)
-            if job_id and job_id in applied_job_ids:
-                if verbose_logging:
-                    logger.info(f"Already processed job ID: {job_id}. Skipping.")
-                else:
-                    logger.info(f"Job #{total_jobs_processed}: ⏭️  already processed")
-                continue
-            
+        if verbose_logging and lead.titles:
+            logger.info(f"Job {lead.key} matched titles: {', '.join(lead.titles)}")
+        if verbose_logging and lead.score is not None:
+            logger.info(f"Job {lead.key} relevance score: {lead.score:g}")
+        
+        if checkpoint:
+            checkpoint.job_started(position, lead)
+        status_store.start(job_id)
+        
+        with get_telemetry().title(lead.search_title):
             # Navigate to the job URL
-            browser.driver.get(job_url)
-            random_wait(1, 2)
+            browser.open_url(lead.url)
+            visits += 1
+            browser.prefetch(visit_urls[visits:])
+            wait_for_page_ready(browser.driver, timeout=10, baseline=(1, 2))
             
             # Apply to the job
             application_successful, status = browser.apply_to_job()
-            
-            if not verbose_logging:
-                logger.info(f"Job #{total_jobs_processed}: {status}")
-            
-            if application_successful and job_id:
-                applied_job_ids.add(job_id)
-            
-            # Wait before processing the next job URL
-            random_wait(2, 3)
+        application_cap.record(status)
+        status_store.record(job_id, status)
         
-        # Try to navigate to the next page
-        if browser.navigate_to_next_page(page_url):
-            page_number += 1
-        else:
-            if verbose_logging:
-                logger.info("No more pages available")
-            break
+        if not verbose_logging:
+            logger.info(f"Job #{total_jobs_processed}: {status}")
+        
+        if checkpoint:
+            checkpoint.job_finished(position)
+        
+        # The rate limiter paces page loads; without it, wait before processing the next job URL
+        if not get_rate_limiter().enabled:
+            random_wait(2, 3)
     
     return total_jobs_processed
 
-def run_bot(use_existing_driver=False, debug_port=9222):
+def process_job_results(browser, max_pages=None, card_rules=None):
+    """Process job results for the current page and subsequent pages"""
+    job_leads = discover_current_results(browser, max_pages=max_pages)
+    return apply_to_job_leads(browser, job_leads, card_rules)
+
+def run_cdp_backend(use_existing_driver=False, debug_port=9222, workers=1, profile=None):
+    """Run the bot on the asyncio DevTools backend: one tab searches while `workers` tabs apply"""
+    import asyncio
+    from cdp_browser import run_cdp_bot
+    
+    logger = setup_logging()
+    card_rules = CardRules.from_config()
+    tab_stats = asyncio.run(run_cdp_bot(
+        get_config().job_search.titles,
+        tabs=workers,
+        profile_name=profile,
+        debug_port=debug_port if use_existing_driver else None,
+        applied_job_ids=load_applied_jobs(),
+        card_rules=card_rules,
+    ))
+    total_jobs_processed = sum(stats.processed for stats in tab_stats)
+    logger.info(f"Processed {total_jobs_processed} jobs")
+    logger.info(card_rules.summary())
+    logger.info(get_answer_engine().summary())
+    if get_rate_limiter().enabled:
+        logger.info(get_rate_limiter().summary())
+    if get_application_cap().limit:
+        logger.info(get_application_cap().summary())
+    finish_incremental_crawl(logger)
+
+def finish_incremental_crawl(logger):
+    """Save this run's high-water marks now that the jobs they cover have been handled."""
+    crawl_state = get_crawl_state()
+    if crawl_state.active and get_application_cap().reached:
+        # The marks cover postings the cap left unvisited; keep the old ones so the next run reaches them
+        logger.info("Application cap reached, keeping the previous crawl marks")
+    elif crawl_state.active:
+        crawl_state.save()
+        logger.info(crawl_state.summary())
+
+def run_bot(use_existing_driver=False, debug_port=9222, workers=1, profile=None, resume=False):
     # Set up logging
     logger = setup_logging()
     logger.info("Starting Handshake Job Bot")
+    get_startup_timer().mark_process_start(PROCESS_START)
+    browser = None
     
     try:
+        if get_config().settings.browser_backend == "cdp":
+            logger.info("Using the asyncio DevTools backend")
+            run_cdp_backend(use_existing_driver, debug_port, workers, profile)
+            return
+        
         # Initialize browser with existing driver if specified
         if use_existing_driver:
             from selenium import webdriver
@@ -122,7 +178,7 @@ def run_bot(use_existing_driver=False, debug_port=9222):
                 options = Options()
                 options.debugger_address = f"127.0.0.1:{debug_port}"
                 driver = webdriver.Chrome(options=options)
-                browser = HandshakeBrowser(existing_driver=driver)
+                browser = HandshakeBrowser(existing_driver=driver, profile_name=profile)
                 logger.info(f"Connected to existing Chrome session on port {debug_port}")
             except WebDriverException as e:
                 logger.error(f"Failed to connect to Chrome on port {debug_port}")
@@ -135,10 +191,11 @@ def run_bot(use_existing_driver=False, debug_port=9222):
                 print(f"4. Run this script again with --use-existing --port={debug_port}\n")
                 return
         else:
-            browser = HandshakeBrowser()
+            browser = HandshakeBrowser(profile_name=profile)
+            logger.info(f"Using browser profile: {browser.profile_name}")
             
-        config = load_config()
-        verbose_logging = config.get('settings', {}).get('verbose_logging', True)
+        config = get_config()
+        verbose_logging = config.settings.verbose_logging
         logger.info(f"Verbose logging: {verbose_logging}")
         
         # Login and navigate to jobs only if not using existing driver
@@ -162,46 +219,135 @@ def run_bot(use_existing_driver=False, debug_port=9222):
                 return
         
         # Step 3: Apply to jobs
-        job_titles = config['job_search']['titles']
+        job_titles = config.job_search.titles
+        card_rules = CardRules.from_config()
+        total_jobs_processed = 0
         
-        if use_existing_driver:
+        if resume and (workers > 1 or use_existing_driver):
+            logger.warning("--resume only applies to the single-browser run, starting from the beginning")
+        
+        if workers > 1:
+            # Worker-pool mode: this browser collects job URLs, the workers apply to them
+            worker_stats = run_worker_pool(browser, job_titles, workers, applied_job_ids=load_applied_jobs(), card_rules=card_rules)
+            total_jobs_processed = sum(stats.processed for stats in worker_stats)
+        elif use_existing_driver:
             # For existing driver, just process the current page
-            process_job_results(browser)
+            total_jobs_processed = process_job_results(browser, card_rules=card_rules)
         else:
-            # For normal flow, search for each job title
-            for job_title in job_titles:
-                logger.info(f"Searching for job title: {job_title}")
-                
-                # Search for the job title
-                search_successful = browser.search_job(job_title)
-                
-                if not search_successful:
-                    logger.error(f"Failed to search for job title: {job_title}. Skipping to next job title.")
-                    continue
-                
-                # Process job results
-                process_job_results(browser)
-                
-                # Wait before processing the next job title
-                random_wait(3, 5)
+            # Checkpoint the run so an interrupted one can be continued with --resume
+            resumed = RunCheckpoint.load() if resume else None
+            if resume and not resumed:
+                logger.info("No interrupted run to resume, starting a new one")
+            checkpoint = set_checkpoint(resumed or RunCheckpoint())
+            start = 0
+            revisit_job_id = None
+            
+            # Discovery: collect every title's results into one deduplicated work list
+            discovery_start = time.perf_counter()
+            if resumed:
+                logger.info(f"Resuming interrupted run: {resumed.describe()}")
+                job_titles = resumed.titles
+            else:
+                checkpoint.start_discovery(job_titles)
+            if resumed and resumed.stage == APPLY:
+                work_list = resumed.leads()
+                start = resumed.reconcile_in_flight()
+                revisit_job_id = (resumed.in_flight or {}).get("job_id")
+            else:
+                work_list = discover_jobs(browser, job_titles, checkpoint=checkpoint)
+            discovery_time = time.perf_counter() - discovery_start
+            
+            # Apply: visit each unique job once
+            apply_start = time.perf_counter()
+            total_jobs_processed = apply_to_job_leads(browser, work_list, card_rules, checkpoint, start, revisit_job_id)
+            apply_time = time.perf_counter() - apply_start
+            checkpoint.clear()
+            set_checkpoint(None)
+            
+            logger.info(f"Discovery took {discovery_time:.1f}s for {len(work_list)} unique jobs across {len(job_titles)} titles")
+            logger.info(f"Apply phase took {apply_time:.1f}s for {total_jobs_processed} jobs")
+        
+        # Run summary
+        logger.info(f"Processed {total_jobs_processed} jobs")
+        logger.info(card_rules.summary())
+        logger.info(get_wait_tracker().summary(total_jobs_processed))
+        logger.info(get_answer_engine().summary())
+        if config.settings.prefetch_depth:
+            logger.info(browser.prefetcher.summary())
+        if get_rate_limiter().enabled:
+            logger.info(get_rate_limiter().summary())
+        if get_application_cap().limit:
+            logger.info(get_application_cap().summary())
+        finish_incremental_crawl(logger)
         
         # Close the browser when done (only if we created it)
         if not use_existing_driver:
             browser.close()
             logger.info("Browser closed. Bot finished.")
         else:
+            browser.prefetcher.discard()
             logger.info("Bot finished. Browser left open.")
         
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
+        if get_checkpoint():
+            logger.info("Progress was checkpointed, run again with --resume to continue where it stopped")
+        # Don't leave a browser we started running in an unknown state
+        if browser is not None and not use_existing_driver:
+            try:
+                browser.close()
+            except Exception:
+                pass
+    finally:
+        save_run_report(logger)
+        if get_driver_profiler().active:
+            logger.info(get_driver_profiler().summary())
+
+def save_run_report(logger):
+    """Write the per-phase timing report for this run, if enabled."""
+    if not get_config().settings.run_report:
+        return
+    try:
+        for path in write_run_report():
+            logger.info(f"Run report written to {path}")
+    except Exception as e:
+        logger.warning(f"Could not write run report: {str(e)}")
 
 # Main execution
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Handshake Job Bot')
     parser.add_argument('--use-existing', action='store_true', help='Use existing Chrome session')
     parser.add_argument('--port', type=int, default=9222, help='Remote debugging port for Chrome')
+    parser.add_argument('--workers', type=int, default=1, help='Number of parallel browsers applying to jobs')
+    parser.add_argument('--profile', help='Browser profile from config.json (e.g. "performance"), overrides settings.browser_profile')
+    parser.add_argument('--profile-driver', action='store_true', help='Count and time every WebDriver command and print the top call sites at the end')
+    parser.add_argument('--incremental', action='store_true', help='Stop paginating each search at postings seen in earlier runs')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run from its checkpoint')
+    
+    subcommands = parser.add_subparsers(dest='command')
+    analyze_parser = subcommands.add_parser('analyze', help='Query the application log instead of running the bot')
+    analyze_parser.add_argument('query', nargs='?', choices=QUERIES, default='summary', help='Report to print (default: summary)')
+    analyze_parser.add_argument('--since', help='Only records from this long ago (7d, 12h, 2w) or date (2025-05-01) on')
+    analyze_parser.add_argument('--until', help='Only records before this time or date')
+    analyze_parser.add_argument('--employer', help='Only employers starting with this (case-insensitive)')
+    analyze_parser.add_argument('--title', help='Only job titles starting with this (case-insensitive)')
+    analyze_parser.add_argument('--status', help='Only records with this status, e.g. "applied"')
+    analyze_parser.add_argument('--interval', choices=list(INTERVALS), default='day', help='Bucket size for timeseries')
+    analyze_parser.add_argument('--limit', type=int, default=10, help='Rows in the summary\'s top employers and titles')
+    analyze_parser.add_argument('--rebuild', action='store_true', help='Reload the whole log instead of only new records')
     
     args = parser.parse_args()
+    if args.command == 'analyze':
+        try:
+            print(analyze(args.query, rebuild=args.rebuild, interval=args.interval, limit=args.limit, since=args.since,
+                          until=args.until, employer=args.employer, title=args.title, status=args.status))
+        except ValueError as e:
+            parser.error(str(e))
+        sys.exit(0)
+    if args.profile_driver:
+        get_driver_profiler().enabled = True
+    if args.incremental:
+        get_crawl_state().enabled = True
     
     if args.use_existing:
         # Instructions for connecting to existing Chrome
@@ -209,7 +355,7 @@ if __name__ == "__main__":
         print("Log into Handshake and set your filters")
         input("Press Enter when ready...")
         
-        run_bot(use_existing_driver=True, debug_port=args.port)
+        run_bot(use_existing_driver=True, debug_port=args.port, workers=args.workers, profile=args.profile, resume=args.resume)
     else:
         # Original flow
-        run_bot(use_existing_driver=False)
\ No newline at end of file
+        run_bot(use_existing_driver=False, workers=args.workers, profile=args.profile, resume=args.resume)
\ No newline at end of file
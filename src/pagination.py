@@ -0,0 +1,95 @@
+"""
+Result-page pagination for the Handshake Job Bot.
+
+The first results page of a search says how many postings matched ("1,234
+results") and, through its per_page parameter or its number of cards, how
+many fit on a page. From that the Paginator knows the last page up front, so
+discovery never loads a page past the end just to find it empty. When the
+count cannot be read, a page with fewer cards than a full page is the last
+one. Either way no more than the title's page budget is read.
+"""
+import math
+import re
+from dataclasses import dataclass
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+PAGE_PARAM = "page"
+PER_PAGE_PARAM = "per_page"
+
+# Reads the "N results" header above the job cards
+RESULT_COUNT_SCRIPT = """
+const element = document.querySelector(arguments[0]);
+return element ? element.textContent : null;
+"""
+
+def query_param(url, name):
+    """Return the last value of a query parameter in url, or None."""
+    values = [value for key, value in parse_qsl(urlsplit(url).query, keep_blank_values=True) if key == name]
+    return values[-1] if values else None
+
+def results_page_url(url, page_number):
+    """Return url with its page parameter set to page_number, keeping every other parameter."""
+    parts = urlsplit(url)
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != PAGE_PARAM]
+    return urlunsplit(parts._replace(query=urlencode([(PAGE_PARAM, str(page_number))] + params)))
+
+def current_page_number(url):
+    try:
+        return max(int(query_param(url, PAGE_PARAM) or 1), 1)
+    except ValueError:
+        return 1
+
+def parse_result_count(text):
+    """Return the number of matching postings from the results header text, or None."""
+    if not text:
+        return None
+    match = re.search(r"of\s+(\d[\d,]*)", text) or re.search(r"(\d[\d,]*)\s+(?:results?|jobs?)", text, re.IGNORECASE)
+    if not match:
+        return None
+    return int(match.group(1).replace(",", ""))
+
+@dataclass(frozen=True)
+class Paginator:
+    """The result pages of one search, as far as its page budget allows."""
+    url: str
+    per_page: int
+    budget: int
+    total: int = None
+    first_page: int = 1
+
+    @classmethod
+    def from_first_page(cls, url, cards_on_page, total=None, budget=3):
+        """Work out the page size from url's per_page parameter, or from a full first page."""
+        try:
+            per_page = int(query_param(url, PER_PAGE_PARAM) or 0)
+        except ValueError:
+            per_page = 0
+        if per_page <= 0:
+            per_page = max(cards_on_page, 1)
+        return cls(url, per_page, max(budget, 1), total, current_page_number(url))
+
+    @property
+    def page_count(self):
+        """Number of result pages for the search, or None when the result count is unknown."""
+        if self.total is None:
+            return None
+        return max(math.ceil(self.total / self.per_page), 1)
+
+    @property
+    def last_page(self):
+        """The last page to read: the search's last page or the end of the budget, whichever comes first."""
+        budget_end = self.first_page + self.budget - 1
+        if self.page_count is None:
+            return budget_end
+        return min(self.page_count, budget_end)
+
+    def has_next(self, page_number, cards_on_page):
+        """Whether another page follows page_number, given how many cards that page had."""
+        if page_number >= self.last_page:
+            return False
+        if self.total is None:
+            return cards_on_page >= self.per_page
+        return True
+
+    def url_for(self, page_number):
+        return results_page_url(self.url, page_number)
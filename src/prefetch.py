@@ -0,0 +1,101 @@
+"""
+Background-tab prefetching for the Handshake Job Bot.
+
+While the bot works in the current tab, the next postings (and the next
+results page) are opened in background tabs of the same browser session.
+When the bot navigates to a prefetched URL it switches to that tab and
+closes the old one, so the page load overlapped with the previous job.
+"""
+import logging
+import time
+from collections import OrderedDict
+
+from browser_profiles import apply_request_blocking
+from rate_limit import get_rate_limiter
+
+logger = logging.getLogger('handshake_job_bot')
+
+class TabPrefetcher:
+    def __init__(self, browser, depth=0):
+        self.browser = browser
+        self.depth = depth
+        # url -> (window handle, time the load was started), oldest first
+        self.tabs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def driver(self):
+        return self.browser.driver
+
+    def prefetch(self, url):
+        """Start loading url in a background tab, returning True if a tab is (already) loading it."""
+        if url in self.tabs:
+            return True
+        if self.depth <= 0 or len(self.tabs) >= self.depth:
+            return False
+        # Prefetches are optional, so only use a request the rate limit has to spare
+        if not get_rate_limiter().try_acquire():
+            return False
+
+        current = self.driver.current_window_handle
+        try:
+            self.driver.switch_to.new_window('tab')
+            handle = self.driver.current_window_handle
+            # Request blocking is per tab, so the new tab needs the profile's blocklist too
+            apply_request_blocking(self.driver, self.browser.profile)
+            # Page.navigate returns once the navigation has started, without waiting for the load
+            self.driver.execute_cdp_cmd("Page.navigate", {"url": url})
+            self.tabs[url] = (handle, time.monotonic())
+            return True
+        except Exception as e:
+            logger.warning(f"Could not prefetch {url}, loading pages directly from now on: {str(e)}")
+            self.depth = 0
+            return False
+        finally:
+            self.driver.switch_to.window(current)
+
+    def prefetch_all(self, urls):
+        """Keep the next pipeline-depth urls loading in background tabs, closing tabs for any others."""
+        wanted = list(urls)[:self.depth]
+        self.discard(keep=wanted)
+        for url in wanted:
+            if not self.prefetch(url):
+                break
+
+    def activate(self, url):
+        """Switch to the tab prefetching url and close the current one, returning False if url was not prefetched."""
+        if url not in self.tabs:
+            if self.depth > 0:
+                self.misses += 1
+            return False
+
+        handle, started = self.tabs.pop(url)
+        try:
+            self.driver.close()
+            self.driver.switch_to.window(handle)
+        except Exception as e:
+            logger.warning(f"Could not switch to prefetched tab for {url}: {str(e)}")
+            return False
+        self.hits += 1
+        if self.browser.verbose_logging:
+            logger.info(f"Switched to prefetched tab (loading for {time.monotonic() - started:.1f}s)")
+        return True
+
+    def discard(self, keep=()):
+        """Close the prefetched tabs that are no longer wanted (all of them by default)."""
+        stale = [url for url in self.tabs if url not in keep]
+        if not stale:
+            return
+        current = self.driver.current_window_handle
+        for url in stale:
+            handle, _ = self.tabs.pop(url)
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        self.driver.switch_to.window(current)
+
+    def summary(self):
+        return f"Prefetch (depth {self.depth}): {self.hits} pages served from background tabs, {self.misses} loaded directly"
@@ -0,0 +1,211 @@
+"""
+Shared request scheduler for the Handshake Job Bot.
+
+Every page load and application submit asks the scheduler for a token first.
+Tokens refill at the current rate (requests per minute) up to a small burst,
+and the rate adapts to how Handshake responds: fast responses raise it step
+by step up to the configured maximum, slow ones lower it, and error pages
+(HTTP 429 or 5xx) or failed loads halve it and pause every browser with an
+exponential backoff. The bucket lives in a small state file guarded by an OS
+file lock, so worker threads and separate bot processes share one budget.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from constants import RATE_LIMIT_STATE_PATH
+from settings import PROJECT_ROOT, get_config
+from instrumentation import get_telemetry
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger('handshake_job_bot')
+
+# The HTTP status of the page's main document; 0 when Chrome does not report it
+RESPONSE_STATUS_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+return navigation && navigation.responseStatus ? navigation.responseStatus : 0;
+"""
+# Fast responses raise the rate by this many requests per minute
+RATE_STEP = 1
+SLOW_RESPONSE_FACTOR = 0.75
+ERROR_FACTOR = 0.5
+
+def is_error_status(status):
+    """Whether an HTTP status means the site is throttling or failing."""
+    return status == 429 or (status or 0) >= 500
+
+@contextmanager
+def _file_lock(path):
+    """Hold an exclusive OS lock on path, shared by every thread and process."""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class RateLimiter:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(PROJECT_ROOT, RATE_LIMIT_STATE_PATH)
+        self.lock_path = self.path + ".lock"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        # This process's share of the traffic, for the run summary
+        self.requests = 0
+        self.waited = 0.0
+        self.slow = 0
+        self.errors = 0
+
+    @property
+    def settings(self):
+        return get_config().rate_limit
+
+    @property
+    def enabled(self):
+        return self.settings.enabled
+
+    # Shared state
+
+    def _load(self, settings, now):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            state = None
+        # Start over when the file is new or unreadable, or the configured rate changed
+        if not isinstance(state, dict) or state.get("configured") != settings.requests_per_minute:
+            state = {"configured": settings.requests_per_minute, "rate": settings.requests_per_minute,
+                     "tokens": settings.burst, "updated": now, "failures": 0, "backoff_until": 0}
+        rate = min(max(state["rate"], settings.min_requests_per_minute), settings.max_requests_per_minute)
+        elapsed = max(now - state["updated"], 0)
+        state.update(rate=rate, tokens=min(settings.burst, state["tokens"] + elapsed * rate / 60), updated=now)
+        return state
+
+    def _save(self, state):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    @contextmanager
+    def _state(self):
+        settings = self.settings
+        with self._lock, _file_lock(self.lock_path):
+            state = self._load(settings, time.time())
+            yield state, settings
+            self._save(state)
+
+    # Tokens
+
+    def _take(self):
+        """Take a token if one is available, otherwise return how long to wait for the next one."""
+        with self._state() as (state, settings):
+            now = state["updated"]
+            if now < state["backoff_until"]:
+                return state["backoff_until"] - now
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                self.requests += 1
+                return 0
+            return (1 - state["tokens"]) * 60 / state["rate"]
+
+    def _waited(self, seconds):
+        with self._lock:
+            self.waited += seconds
+        get_telemetry().add_wait(seconds)
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        if not self.settings.enabled:
+            return
+        start = time.monotonic()
+        while True:
+            wait = self._take()
+            if not wait:
+                break
+            time.sleep(wait)
+        self._waited(time.monotonic() - start)
+
+    async def acquire_async(self):
+        """acquire() for the asyncio backend, sleeping without blocking the event loop."""
+        if not self.settings.enabled:
+            return
+        # The state update blocks on the shared file lock, so it runs off the event loop
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        while True:
+            wait = await loop.run_in_executor(None, self._take)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        self._waited(time.monotonic() - start)
+
+    def try_acquire(self):
+        """Take a token only if one is available right now, for optional requests like prefetches."""
+        if not self.settings.enabled:
+            return True
+        return not self._take()
+
+    # Feedback
+
+    def record(self, latency, error=False):
+        """Adapt the shared rate to how long a request took and whether it failed."""
+        if not self.settings.enabled:
+            return
+        with self._state() as (state, settings):
+            if error:
+                self.errors += 1
+                state["failures"] += 1
+                backoff = min(settings.backoff_seconds * 2 ** (state["failures"] - 1), settings.max_backoff_seconds)
+                backoff *= random.uniform(1, 1.25)
+                state["backoff_until"] = state["updated"] + backoff
+                state["tokens"] = 0
+                state["rate"] = max(state["rate"] * ERROR_FACTOR, settings.min_requests_per_minute)
+                logger.warning(f"Handshake returned an error, backing off {backoff:.0f}s and slowing to {state['rate']:.1f} requests/min")
+            elif latency > settings.slow_response_seconds:
+                self.slow += 1
+                state["rate"] = max(state["rate"] * SLOW_RESPONSE_FACTOR, settings.min_requests_per_minute)
+            else:
+                state["failures"] = 0
+                state["rate"] = min(state["rate"] + RATE_STEP, settings.max_requests_per_minute)
+
+    async def record_async(self, latency, error=False):
+        """record() for the asyncio backend, updating the shared state off the event loop."""
+        if not self.settings.enabled:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.record, latency, error)
+
+    def current_rate(self):
+        with self._state() as (state, settings):
+            return state["rate"]
+
+    def summary(self):
+        return (f"Rate limit: {self.requests} requests, {self.waited:.1f}s waiting for the shared budget, "
+                f"{self.slow} slow and {self.errors} error responses, now {self.current_rate():.1f} requests/min")
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Return the process-wide rate limiter."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+    return _limiter
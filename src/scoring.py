@@ -0,0 +1,214 @@
+"""
+Job relevance scoring for the Handshake Job Bot.
+
+Between discovery and applying, every lead gets a relevance score from the
+data on its search result card: configured weights for phrases in the job
+title, employer and location, plus a bonus for recent postings that fades
+with age. The weights are compiled once into one regex and lookup table per
+field, and scores for repeated employers and locations are cached, so ranking
+a whole work list costs a few regex scans per lead. Leads are then handed out
+best first from a priority queue, and a per-run cap stops applying once
+enough applications have been submitted.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import queue
+import re
+import threading
+
+from settings import get_config
+
+logger = logging.getLogger('handshake_job_bot')
+
+# Unit prefixes of "posted" texts like "3d ago" or "2 weeks ago", in days; "mo" before "m"
+AGE_UNITS = (("mo", 30), ("m", 1 / 1440), ("h", 1 / 24), ("d", 1), ("w", 7), ("y", 365))
+AGE_PATTERN = re.compile(r"\b(\d+|an?)\s*([a-z]+)\.?\s+ago\b")
+
+def posting_age_days(posted):
+    """Days since a posting went up, from its card's "posted" text, or None if it cannot be read."""
+    if not posted:
+        return None
+    text = posted.lower()
+    if "just now" in text or "today" in text:
+        return 0.0
+    if "yesterday" in text:
+        return 1.0
+    match = AGE_PATTERN.search(text)
+    if not match:
+        return None
+    count = 1 if match.group(1) in ("a", "an") else int(match.group(1))
+    for prefix, days in AGE_UNITS:
+        if match.group(2).startswith(prefix):
+            return count * days
+    return None
+
+def is_submitted(status):
+    """Whether an apply_to_job status means an application was sent in this run."""
+    return status.startswith("✅")
+
+class WeightTable:
+    """Weights for the phrases of one card field, compiled into a single regex."""
+
+    def __init__(self, weights=None):
+        self.weights = {phrase.lower(): float(weight) for phrase, weight in (weights or {}).items() if phrase}
+        self.pattern = None
+        if self.weights:
+            # Longest phrases first, so "machine learning engineer" wins over "engineer"
+            phrases = sorted(self.weights, key=len, reverse=True)
+            self.pattern = re.compile(rf"(?<!\w)(?:{'|'.join(map(re.escape, phrases))})(?!\w)", re.IGNORECASE)
+        self._cache = {}
+
+    def score(self, text):
+        """Sum of the weights of every distinct phrase in text."""
+        if not text or self.pattern is None:
+            return 0.0
+        score = self._cache.get(text)
+        if score is None:
+            found = {match.group(0).lower() for match in self.pattern.finditer(text)}
+            score = self._cache[text] = sum(self.weights.get(phrase, 0.0) for phrase in found)
+        return score
+
+class RelevanceScorer:
+    def __init__(self, keywords=None, employers=None, locations=None, recency_weight=1, max_age_days=30):
+        self.keywords = WeightTable(keywords)
+        self.employers = WeightTable(employers)
+        self.locations = WeightTable(locations)
+        self.recency_weight = recency_weight
+        self.max_age_days = max_age_days
+
+    @classmethod
+    def from_settings(cls, scoring):
+        return cls(scoring.keywords, scoring.employers, scoring.locations, scoring.recency_weight, scoring.max_age_days)
+
+    def score(self, lead):
+        """Relevance of lead from its card data; higher is better."""
+        score = (self.keywords.score(lead.job_title or lead.search_title)
+                 + self.employers.score(lead.employer)
+                 + self.locations.score(lead.location))
+        age = posting_age_days(lead.posted)
+        if age is not None:
+            score += self.recency_weight * max(0.0, 1 - age / self.max_age_days)
+        return round(score, 3)
+
+    def score_all(self, leads):
+        """Store each lead's score on it, returning the leads."""
+        for lead in leads:
+            lead.score = self.score(lead)
+        return leads
+
+    def rank(self, leads):
+        """Return leads best first, keeping discovery order between equal scores."""
+        heap = [(-lead.score, order, lead) for order, lead in enumerate(self.score_all(list(leads)))]
+        heapq.heapify(heap)
+        return [heapq.heappop(heap)[2] for _ in range(len(heap))]
+
+_scorer = None
+_scorer_settings = None
+_scorer_lock = threading.Lock()
+
+def get_scorer():
+    """Return the scorer for the current config, or None when scoring is off."""
+    global _scorer, _scorer_settings
+    scoring = get_config().scoring
+    if not scoring.enabled:
+        return None
+    with _scorer_lock:
+        # Rebuilt only when config.json changed
+        if _scorer is None or _scorer_settings is not scoring:
+            _scorer = RelevanceScorer.from_settings(scoring)
+            _scorer_settings = scoring
+        return _scorer
+
+def rank_leads(leads):
+    """Order leads best first when scoring is on, otherwise keep discovery order."""
+    scorer = get_scorer()
+    leads = list(leads)
+    if scorer is None or not leads:
+        return leads
+    leads = scorer.rank(leads)
+    logger.info(f"Ranked {len(leads)} jobs by relevance, scores {leads[-1].score:g} to {leads[0].score:g}")
+    return leads
+
+class _BestFirst:
+    """Queue storage that hands out the best-scoring lead first, in discovery order
+    between ties, and None (the end-of-work sentinel) only once no leads are left."""
+
+    def _init(self, maxsize):
+        self._queue = []
+        self._order = itertools.count()
+        self._scorer = get_scorer()
+
+    def _qsize(self):
+        return len(self._queue)
+
+    def _priority(self, lead):
+        if lead is None:
+            return math.inf
+        if self._scorer is None:
+            return 0
+        if lead.score is None:
+            lead.score = self._scorer.score(lead)
+        return -lead.score
+
+    def _put(self, lead):
+        heapq.heappush(self._queue, (self._priority(lead), next(self._order), lead))
+
+    def _get(self):
+        return heapq.heappop(self._queue)[2]
+
+class LeadQueue(_BestFirst, queue.Queue):
+    """Thread-safe priority queue of leads, for the worker pool."""
+
+class AsyncLeadQueue(_BestFirst, asyncio.Queue):
+    """Priority queue of leads for the asyncio backend."""
+
+class ApplicationCap:
+    """Per-run limit on submitted applications, shared by every browser."""
+
+    def __init__(self, limit=None):
+        self.limit = get_config().scoring.max_applications_per_run if limit is None else limit
+        self.submitted = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reached(self):
+        with self._lock:
+            return bool(self.limit) and self.submitted >= self.limit
+
+    def start(self):
+        """Claim a slot for one more application, or return False once the cap is used up."""
+        with self._lock:
+            if self.limit and self.submitted + self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def finish(self, status=None):
+        """Release the slot claimed by start(), counting it if the application went in."""
+        with self._lock:
+            self.in_flight -= 1
+        self.record(status)
+
+    def record(self, status):
+        """Count an application made without claiming a slot, by a single browser."""
+        if status and is_submitted(status):
+            with self._lock:
+                self.submitted += 1
+
+    def summary(self):
+        return f"Application cap: {self.submitted} of {self.limit} applications submitted this run"
+
+_cap = None
+_cap_lock = threading.Lock()
+
+def get_application_cap():
+    """Return this run's application cap."""
+    global _cap
+    with _cap_lock:
+        if _cap is None:
+            _cap = ApplicationCap()
+    return _cap
@@ -0,0 +1,112 @@
+"""
+Encrypted session storage for the Handshake Job Bot.
+
+After a successful login the browser's cookies are pickled, encrypted with a
+key derived from HANDSHAKE_SESSION_KEY (or HANDSHAKE_PASSWORD when no
+separate key is set) and written to .cache/session.bin. Later runs and
+workers restore the cookies instead of repeating the full NetID login.
+"""
+import base64
+import logging
+import os
+import pickle
+import threading
+import time
+
+from constants import SESSION_STORE_PATH
+from settings import PROJECT_ROOT
+
+logger = logging.getLogger('handshake_job_bot')
+
+SALT_SIZE = 16
+KDF_ITERATIONS = 390000
+
+# Fields Network.setCookies accepts from a Network.getAllCookies cookie
+COOKIE_PARAM_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+
+def _derive_key(passphrase, salt):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS)
+    return base64.urlsafe_b64encode(kdf.derive(passphrase.encode("utf-8")))
+
+def cookie_params(cookies):
+    """Convert cookies from Network.getAllCookies into Network.setCookies parameters."""
+    params = []
+    for cookie in cookies:
+        param = {key: cookie[key] for key in COOKIE_PARAM_FIELDS if key in cookie}
+        # Session cookies report expires=-1, which setCookies would treat as already expired
+        if cookie.get("session") or param.get("expires", 0) < 0:
+            param.pop("expires", None)
+        params.append(param)
+    return params
+
+class SessionStore:
+    def __init__(self, path=None, passphrase=None):
+        self.path = path or os.path.join(PROJECT_ROOT, SESSION_STORE_PATH)
+        self.passphrase = passphrase or os.environ.get('HANDSHAKE_SESSION_KEY') or os.environ.get('HANDSHAKE_PASSWORD')
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.passphrase)
+
+    def save(self, cookies):
+        """Encrypt and store cookies, replacing any previous session atomically."""
+        if not self.enabled:
+            logger.info("No HANDSHAKE_SESSION_KEY or HANDSHAKE_PASSWORD set, not saving the session")
+            return False
+
+        from cryptography.fernet import Fernet
+
+        salt = os.urandom(SALT_SIZE)
+        payload = pickle.dumps({"saved_at": time.time(), "cookies": cookies})
+        token = Fernet(_derive_key(self.passphrase, salt)).encrypt(payload)
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(salt + token)
+            try:
+                os.chmod(temp_path, 0o600)
+            except OSError:
+                pass
+            os.replace(temp_path, self.path)
+        return True
+
+    def load(self):
+        """Return the stored cookies, or None if there is no readable session."""
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+
+        from cryptography.fernet import Fernet, InvalidToken
+
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            salt, token = data[:SALT_SIZE], data[SALT_SIZE:]
+            session = pickle.loads(Fernet(_derive_key(self.passphrase, salt)).decrypt(token))
+        except (OSError, InvalidToken, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Could not read the saved session, ignoring it: {type(e).__name__}")
+            return None
+        return session.get("cookies")
+
+    def clear(self):
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_session_store():
+    """Return the shared session store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+    return _store
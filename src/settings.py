@@ -0,0 +1,290 @@
+"""
+Configuration for the Handshake Job Bot.
+
+config/config.json is parsed and validated once, exposed as typed settings
+objects, and only re-read when the file's modification time changes. The path
+is resolved from the project root, so the bot can be started from any
+working directory.
+"""
+import json
+import os
+import re
+import threading
+from dataclasses import MISSING, dataclass, field
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "config", "config.json")
+
+# "url" loads the results page directly, "typed" types the title into the search box
+SEARCH_MODES = ("url", "typed")
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+# "selenium" drives Chrome through WebDriver, "cdp" through the asyncio DevTools backend
+BROWSER_BACKENDS = ("selenium", "cdp")
+RUN_REPORT_FORMATS = ("json", "csv", "prometheus")
+DEFAULT_REPORT_FORMATS = ("json", "csv")
+
+class ConfigError(ValueError):
+    """Raised when config.json is missing, unreadable or does not match the schema."""
+
+@dataclass(frozen=True)
+class HandshakeSettings:
+    login_url: str
+    filtered_search_url: str
+
+@dataclass(frozen=True)
+class JobSearchSettings:
+    titles: list = field(default_factory=list)
+    # Result pages read per title, overridable per title in page_budgets
+    max_pages: int = 3
+    page_budgets: dict = field(default_factory=dict)
+
+    def page_budget(self, title=None):
+        """Number of result pages to read for title."""
+        return self.page_budgets.get(title, self.max_pages)
+
+@dataclass(frozen=True)
+class BotSettings:
+    min_wait_time: float = 1
+    max_wait_time: float = 3
+    verbose_logging: bool = True
+    pacing_jitter: float = 0.25
+    typing_jitter: float = 0.03
+    network_idle_ms: int = 500
+    search_mode: str = "url"
+    typed_search_fallback: bool = False
+    browser_profile: str = "default"
+    chromedriver_path: str = ""
+    driver_offline: bool = False
+    reuse_session: bool = True
+    # Postings (or results pages) loaded ahead in background tabs, 0 disables prefetching
+    prefetch_depth: int = 0
+    browser_backend: str = "selenium"
+    # Per-phase timings written to logs/run_reports at the end of each run
+    run_report: bool = True
+    report_formats: list = field(default_factory=lambda: list(DEFAULT_REPORT_FORMATS))
+    # Count and time every WebDriver command by type and call site (also --profile-driver)
+    driver_profiling: bool = False
+    # Stop paginating a search at postings seen in earlier runs (also --incremental)
+    incremental_crawl: bool = False
+
+@dataclass(frozen=True)
+class FilterSettings:
+    skip_external: bool = True
+    blocked_employers: list = field(default_factory=list)
+    blocked_locations: list = field(default_factory=list)
+
+@dataclass(frozen=True)
+class AnswerSettings:
+    # Each rule is {"pattern": regex matched against the normalized question, "answer": text}
+    rules: list = field(default_factory=list)
+    cache_answers: bool = True
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    enabled: bool = True
+    # Page loads and application submits per minute, shared by every browser and bot process
+    requests_per_minute: float = 20
+    burst: int = 3
+    # The rate adapts between these bounds: fast responses raise it, slow ones and errors lower it
+    min_requests_per_minute: float = 4
+    max_requests_per_minute: float = 40
+    slow_response_seconds: float = 6
+    # First pause after an error page, doubling with every further error
+    backoff_seconds: float = 5
+    max_backoff_seconds: float = 300
+
+@dataclass(frozen=True)
+class ScoringSettings:
+    enabled: bool = True
+    # Phrase -> weight, added when the phrase appears as whole words in the job title,
+    # employer or location on the search result card; negative weights push postings down
+    keywords: dict = field(default_factory=dict)
+    employers: dict = field(default_factory=dict)
+    locations: dict = field(default_factory=dict)
+    # Bonus for a posting from today, fading to nothing at max_age_days
+    recency_weight: float = 1
+    max_age_days: float = 30
+    # Applications submitted per run, 0 for no cap
+    max_applications_per_run: int = 0
+
+@dataclass(frozen=True)
+class RevisitSettings:
+    # Hours before a job is visited again after each outcome, -1 to never revisit it
+    applied: float = -1
+    already_applied: float = -1
+    external_application: float = -1
+    unanswered_questions: float = 168
+    error: float = 6
+    # Visits that ended without an outcome, e.g. a crash or a page that never loaded
+    incomplete: float = 24
+    # Give up on a job after this many attempts, 0 to keep retrying
+    max_attempts: int = 3
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    headless: bool = False
+    block_images: bool = False
+    blocked_url_patterns: list = field(default_factory=list)
+    page_load_strategy: str = "normal"
+    user_data_dir: str = ""
+
+@dataclass(frozen=True)
+class Config:
+    handshake: HandshakeSettings
+    job_search: JobSearchSettings
+    settings: BotSettings
+    filters: FilterSettings
+    answers: AnswerSettings
+    rate_limit: RateLimitSettings
+    scoring: ScoringSettings
+    revisit: RevisitSettings
+    browser_profiles: dict
+    raw: dict
+
+    def get_browser_profile(self, name=None):
+        """Return the named browser profile, or the one selected in settings."""
+        name = name or self.settings.browser_profile
+        if name not in self.browser_profiles:
+            raise ConfigError(f"Unknown browser profile '{name}', expected one of {', '.join(self.browser_profiles)}")
+        return self.browser_profiles[name]
+
+def _section(data, name):
+    section = data.get(name, {})
+    if not isinstance(section, dict):
+        raise ConfigError(f"'{name}' must be an object")
+    return section
+
+def _typed(section_name, section, settings_class):
+    """Build a settings object, checking every known key against its declared type."""
+    values = {}
+    for name, settings_field in settings_class.__dataclass_fields__.items():
+        if name not in section:
+            continue
+        value = section[name]
+        default = settings_field.default
+        if isinstance(default, bool):
+            valid = isinstance(value, bool)
+        elif settings_field.type is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        elif settings_field.type is int:
+            # Counts and sizes are used as such (slices, range), so 2.5 must not get through
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        elif settings_field.default_factory is not MISSING:
+            valid = isinstance(value, type(settings_field.default_factory()))
+        else:
+            valid = isinstance(value, str)
+        if not valid:
+            raise ConfigError(f"'{section_name}.{name}' has an invalid value: {value!r}")
+        values[name] = value
+    try:
+        return settings_class(**values)
+    except TypeError as e:
+        raise ConfigError(f"'{section_name}' is missing required keys: {str(e)}")
+
+def parse_config(data):
+    """Validate raw config.json data and return a typed Config."""
+    if not isinstance(data, dict):
+        raise ConfigError("config.json must contain a JSON object")
+
+    handshake = _typed("handshake", _section(data, "handshake"), HandshakeSettings)
+    job_search = _typed("job_search", _section(data, "job_search"), JobSearchSettings)
+    settings = _typed("settings", _section(data, "settings"), BotSettings)
+    filters = _typed("filters", _section(data, "filters"), FilterSettings)
+    answers = _typed("answers", _section(data, "answers"), AnswerSettings)
+    rate_limit = _typed("rate_limit", _section(data, "rate_limit"), RateLimitSettings)
+    scoring = _typed("scoring", _section(data, "scoring"), ScoringSettings)
+    revisit = _typed("revisit", _section(data, "revisit"), RevisitSettings)
+
+    browser_profiles = {"default": BrowserProfile()}
+    for name, profile in _section(data, "browser_profiles").items():
+        if not isinstance(profile, dict):
+            raise ConfigError(f"'browser_profiles.{name}' must be an object")
+        browser_profiles[name] = _typed(f"browser_profiles.{name}", profile, BrowserProfile)
+        if browser_profiles[name].page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ConfigError(f"'browser_profiles.{name}.page_load_strategy' must be one of {', '.join(PAGE_LOAD_STRATEGIES)}")
+    if settings.browser_profile not in browser_profiles:
+        raise ConfigError(f"'settings.browser_profile' refers to unknown profile '{settings.browser_profile}'")
+
+    if not all(isinstance(title, str) and title for title in job_search.titles):
+        raise ConfigError("'job_search.titles' must be a list of non-empty strings")
+    if job_search.max_pages < 1:
+        raise ConfigError("'job_search.max_pages' must be at least 1")
+    for title, budget in job_search.page_budgets.items():
+        if isinstance(budget, bool) or not isinstance(budget, int) or budget < 1:
+            raise ConfigError(f"'job_search.page_budgets.{title}' must be a whole number of pages, at least 1")
+    for name in ("blocked_employers", "blocked_locations"):
+        if not all(isinstance(value, str) for value in getattr(filters, name)):
+            raise ConfigError(f"'filters.{name}' must be a list of strings")
+    for index, rule in enumerate(answers.rules):
+        if not (isinstance(rule, dict) and isinstance(rule.get("pattern"), str) and isinstance(rule.get("answer"), str)):
+            raise ConfigError(f"'answers.rules[{index}]' must be an object with string 'pattern' and 'answer'")
+        try:
+            re.compile(rule["pattern"])
+        except re.error as e:
+            raise ConfigError(f"'answers.rules[{index}].pattern' is not a valid regex: {str(e)}")
+    if settings.search_mode not in SEARCH_MODES:
+        raise ConfigError(f"'settings.search_mode' must be one of {', '.join(SEARCH_MODES)}")
+    if settings.browser_backend not in BROWSER_BACKENDS:
+        raise ConfigError(f"'settings.browser_backend' must be one of {', '.join(BROWSER_BACKENDS)}")
+    if not all(report_format in RUN_REPORT_FORMATS for report_format in settings.report_formats):
+        raise ConfigError(f"'settings.report_formats' must only contain {', '.join(RUN_REPORT_FORMATS)}")
+    if settings.prefetch_depth < 0:
+        raise ConfigError("'settings.prefetch_depth' must not be negative")
+    if not 0 < rate_limit.min_requests_per_minute <= rate_limit.requests_per_minute <= rate_limit.max_requests_per_minute:
+        raise ConfigError("'rate_limit' must satisfy 0 < min_requests_per_minute <= requests_per_minute <= max_requests_per_minute")
+    if rate_limit.burst < 1 or rate_limit.slow_response_seconds <= 0 or rate_limit.backoff_seconds < 0:
+        raise ConfigError("'rate_limit.burst' must be at least 1, 'slow_response_seconds' positive and 'backoff_seconds' not negative")
+    for name in ("keywords", "employers", "locations"):
+        for phrase, weight in getattr(scoring, name).items():
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise ConfigError(f"'scoring.{name}.{phrase}' must be a number")
+    if scoring.max_age_days <= 0 or scoring.max_applications_per_run < 0:
+        raise ConfigError("'scoring.max_age_days' must be positive and 'max_applications_per_run' not negative")
+    for name in RevisitSettings.__dataclass_fields__:
+        if name != "max_attempts" and getattr(revisit, name) < 0 and getattr(revisit, name) != -1:
+            raise ConfigError(f"'revisit.{name}' must be a number of hours, or -1 to never revisit")
+    if revisit.max_attempts < 0:
+        raise ConfigError("'revisit.max_attempts' must not be negative")
+    if settings.min_wait_time > settings.max_wait_time:
+        raise ConfigError("'settings.min_wait_time' must not be greater than 'settings.max_wait_time'")
+
+    return Config(handshake=handshake, job_search=job_search, settings=settings, filters=filters,
+                  answers=answers, rate_limit=rate_limit, scoring=scoring, revisit=revisit, browser_profiles=browser_profiles, raw=data)
+
+class ConfigLoader:
+    """Load config.json once and reload it only when the file changes."""
+
+    def __init__(self, path=CONFIG_PATH):
+        self.path = path
+        self._config = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            if self._config is not None:
+                return self._config
+            raise ConfigError(f"Cannot read {self.path}: {str(e)}")
+
+        with self._lock:
+            if self._config is None or mtime != self._mtime:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    config = parse_config(data)
+                except (OSError, json.JSONDecodeError, ConfigError) as e:
+                    if self._config is None:
+                        raise ConfigError(f"Invalid config {self.path}: {str(e)}")
+                    # Keep running on the last good config while the file is being edited
+                    config = self._config
+                self._config = config
+                self._mtime = mtime
+            return self._config
+
+_loader = ConfigLoader()
+
+def get_config():
+    """Return the current typed configuration."""
+    return _loader.get()
@@ -0,0 +1,131 @@
+"""
+Condition-driven waits for the Handshake Job Bot.
+
+Instead of sleeping for a fixed random interval, these helpers block until the
+page is actually ready (an element is present, the network is idle, a modal
+has closed) and add only a small configurable jitter for pacing. Every wait
+records the fixed sleep it replaced so the run summary can report the saving.
+"""
+import random
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from settings import get_config
+from instrumentation import get_telemetry
+
+POLL_FREQUENCY = 0.1
+
+# True once the document has loaded and no resource finished within the idle window
+NETWORK_IDLE_SCRIPT = """
+const idleMs = arguments[0];
+if (document.readyState !== 'complete') { return false; }
+let lastActivity = 0;
+for (const entry of performance.getEntriesByType('resource')) {
+    lastActivity = Math.max(lastActivity, entry.responseEnd || entry.startTime);
+}
+return performance.now() - lastActivity >= idleMs;
+"""
+
+class WaitTracker:
+    """Accumulate how long adaptive waits took compared to the fixed sleeps they replaced."""
+
+    def __init__(self):
+        self.waited = 0.0
+        self.baseline = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, waited, baseline):
+        with self._lock:
+            self.waited += waited
+            self.baseline += baseline
+            self.count += 1
+
+    @property
+    def saved(self):
+        return max(0.0, self.baseline - self.waited)
+
+    def summary(self, jobs_processed=0):
+        line = (f"Adaptive waits: {self.count} waits took {self.waited:.1f}s "
+                f"instead of ~{self.baseline:.1f}s of fixed sleeps, saving {self.saved:.1f}s")
+        if jobs_processed:
+            line += f" ({self.saved / jobs_processed:.1f}s per job)"
+        return line
+
+_tracker = WaitTracker()
+
+def get_wait_tracker():
+    """Return the process-wide wait tracker."""
+    return _tracker
+
+def _baseline_seconds(baseline):
+    """Expected duration of the random_wait(min, max) call a wait replaces."""
+    if baseline is None:
+        settings = get_config().settings
+        baseline = (settings.min_wait_time, settings.max_wait_time)
+    return (baseline[0] + baseline[1]) / 2
+
+def _record(start, baseline):
+    elapsed = time.monotonic() - start
+    _tracker.record(elapsed, _baseline_seconds(baseline))
+    get_telemetry().add_wait(elapsed)
+
+def pace(max_jitter=None, baseline=None):
+    """Sleep for a small random jitter instead of a fixed random_wait."""
+    start = time.monotonic()
+    if max_jitter is None:
+        max_jitter = get_config().settings.pacing_jitter
+    if max_jitter > 0:
+        time.sleep(random.uniform(0, max_jitter))
+    _record(start, baseline)
+
+def wait_for_element(driver, locator, timeout=10, clickable=False, baseline=None):
+    """Wait until the element is present (or clickable) and return it, raising TimeoutException otherwise."""
+    start = time.monotonic()
+    condition = EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition)
+    finally:
+        _record(start, baseline)
+
+def wait_for_element_gone(driver, locator, timeout=10, baseline=None):
+    """Wait until the element is no longer on the page, returning False if it is still there."""
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until_not(
+            EC.presence_of_element_located(locator)
+        )
+        return True
+    except TimeoutException:
+        return False
+    finally:
+        _record(start, baseline)
+
+def wait_for_url_contains(driver, fragment, timeout=10, baseline=None):
+    """Wait until the current URL contains fragment, returning False on timeout."""
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(EC.url_contains(fragment))
+        return True
+    except TimeoutException:
+        return False
+    finally:
+        _record(start, baseline)
+
+def wait_for_page_ready(driver, timeout=10, baseline=None):
+    """Wait until the document has loaded and the network has gone quiet, returning False on timeout."""
+    start = time.monotonic()
+    idle_ms = get_config().settings.network_idle_ms
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            lambda d: d.execute_script(NETWORK_IDLE_SCRIPT, idle_ms)
+        )
+        return True
+    except TimeoutException:
+        return False
+    finally:
+        _record(start, baseline)
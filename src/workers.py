@@ -0,0 +1,169 @@
+"""
+Worker-pool mode for the Handshake Job Bot.
+
+One collector browser searches each job title and feeds every newly discovered
+job into a queue, so postings listed under several titles are queued once.
+Several worker browsers, each with its own driver, pull URLs from the queue
+and apply to them, deduplicating through a shared job ID set. The queue hands
+out the most relevant job first and the workers share the run's application
+cap.
+"""
+import logging
+import threading
+from collections import Counter
+from functools import partial
+
+from browser import HandshakeBrowser
+from discovery import discover_jobs, CardRules
+from utils import random_wait, log_job_lead
+from waits import wait_for_page_ready
+from instrumentation import get_telemetry
+from rate_limit import get_rate_limiter
+from job_status import get_job_status_store
+from scoring import LeadQueue, get_application_cap
+
+logger = logging.getLogger('handshake_job_bot')
+
+class AppliedJobSet:
+    """Thread-safe set of job IDs that workers claim before applying."""
+
+    def __init__(self, job_ids=None):
+        self._job_ids = set(job_ids or [])
+        self._lock = threading.Lock()
+
+    def __contains__(self, job_id):
+        with self._lock:
+            return job_id in self._job_ids
+
+    def __len__(self):
+        with self._lock:
+            return len(self._job_ids)
+
+    def claim(self, job_id):
+        """Mark job_id as taken, returning False if another worker already has it."""
+        with self._lock:
+            if job_id in self._job_ids:
+                return False
+            self._job_ids.add(job_id)
+            return True
+
+class WorkerStats:
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.processed = 0
+        self.skipped = 0
+        self.statuses = Counter()
+
+    def record(self, status):
+        self.processed += 1
+        self.statuses[status] += 1
+
+    def summary(self):
+        statuses = ", ".join(f"{status}: {count}" for status, count in self.statuses.most_common())
+        return (f"Worker {self.worker_id}: {self.processed} processed, {self.skipped} skipped"
+                + (f" ({statuses})" if statuses else ""))
+
+def worker_browser(worker_id, profile_name=None):
+    """Default worker factory: a new HandshakeBrowser with its own user-data directory."""
+    return HandshakeBrowser(profile_name=profile_name, instance_name=f"worker-{worker_id}")
+
+def run_worker(stats, job_queue, applied_jobs, browser_factory, card_rules):
+    """Log in a worker browser and apply to queued jobs until the collector is done."""
+    browser = None
+    application_cap = get_application_cap()
+    status_store = get_job_status_store()
+    try:
+        browser = browser_factory(stats.worker_id)
+        if not browser.login():
+            logger.error(f"Worker {stats.worker_id}: login failed, stopping worker")
+            return
+
+        while True:
+            lead = job_queue.get()
+            try:
+                if lead is None:
+                    break
+
+                if lead.job_id and not applied_jobs.claim(lead.job_id):
+                    stats.skipped += 1
+                    continue
+
+                # Skip postings the search result card already rules out, without loading them
+                skip_reason = card_rules.skip_reason(lead)
+                if skip_reason:
+                    if skip_reason == "external application":
+                        log_job_lead(lead, skip_reason)
+                        status_store.record(lead.job_id, skip_reason)
+                    stats.skipped += 1
+                    continue
+
+                if not application_cap.start():
+                    stats.skipped += 1
+                    continue
+
+                status_store.start(lead.job_id)
+                status = None
+                try:
+                    with get_telemetry().title(lead.search_title):
+                        browser.open_url(lead.url)
+                        wait_for_page_ready(browser.driver, timeout=10, baseline=(1, 2))
+
+                        application_successful, status = browser.apply_to_job()
+                except Exception as e:
+                    # A page that fails to load costs this job, not the worker
+                    logger.error(f"Worker {stats.worker_id} failed on {lead.url}: {str(e)}")
+                    status = "❌ error"
+                finally:
+                    application_cap.finish(status)
+                status_store.record(lead.job_id, status)
+                stats.record(status)
+                logger.info(f"Worker {stats.worker_id} job #{stats.processed}: {status}")
+
+                # Workers share the rate limiter's budget; without it, each paces itself
+                if not get_rate_limiter().enabled:
+                    random_wait(2, 3)
+            finally:
+                job_queue.task_done()
+    except Exception as e:
+        logger.error(f"Worker {stats.worker_id} stopped: {str(e)}")
+    finally:
+        if browser:
+            browser.close()
+
+def run_worker_pool(collector, job_titles, num_workers, applied_job_ids=None, browser_factory=None, max_pages=None, card_rules=None):
+    """Collect job URLs with the collector browser while num_workers browsers apply to them."""
+    browser_factory = browser_factory or partial(worker_browser, profile_name=collector.profile_name)
+    card_rules = card_rules or CardRules.from_config()
+    job_queue = LeadQueue()
+    applied_jobs = AppliedJobSet(applied_job_ids)
+    worker_stats = [WorkerStats(worker_id) for worker_id in range(1, num_workers + 1)]
+
+    threads = []
+    for stats in worker_stats:
+        thread = threading.Thread(
+            target=run_worker,
+            args=(stats, job_queue, applied_jobs, browser_factory, card_rules),
+            name=f"worker-{stats.worker_id}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    logger.info(f"Started {num_workers} workers, loaded {len(applied_jobs)} previously processed jobs")
+
+    try:
+        work_list = discover_jobs(collector, job_titles, max_pages, on_new_lead=job_queue.put)
+        logger.info(f"Collector finished: {len(work_list)} jobs queued")
+    finally:
+        # One sentinel per worker tells each of them the queue is finished
+        for _ in threads:
+            job_queue.put(None)
+
+    for thread in threads:
+        thread.join()
+
+    for stats in worker_stats:
+        logger.info(stats.summary())
+    total_processed = sum(stats.processed for stats in worker_stats)
+    logger.info(f"All workers finished: {total_processed} jobs processed")
+    return worker_stats